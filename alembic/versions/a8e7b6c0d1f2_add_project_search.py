@@ -0,0 +1,48 @@
+"""Add project_search documents with a GIN full-text index
+
+Revision ID: a8e7b6c0d1f2
+Revises: e6c4f5a8b9d0
+Create Date: 2026-10-18 15:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8e7b6c0d1f2'
+down_revision: Union[str, Sequence[str], None] = 'e6c4f5a8b9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# must stay identical to app.models.search_vector()
+SEARCH_VECTOR = (
+    "(setweight(to_tsvector('english'::regconfig, title), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, tags), 'B')) || "
+    "setweight(to_tsvector('english'::regconfig, body), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'project_search',
+        sa.Column('pro_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.Text(), server_default='', nullable=False),
+        sa.Column('tags', sa.Text(), server_default='', nullable=False),
+        sa.Column('body', sa.Text(), server_default='', nullable=False),
+        sa.ForeignKeyConstraint(['pro_id'], ['projects.pro_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('pro_id'),
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_index('ix_project_search_vector', 'project_search', [sa.text(SEARCH_VECTOR)], postgresql_using='gin')
+    # documents for existing projects are written at startup (search.ensure_documents)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_project_search_vector', table_name='project_search')
+    op.drop_table('project_search')
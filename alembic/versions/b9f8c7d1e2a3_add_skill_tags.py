@@ -0,0 +1,79 @@
+"""Add normalized skill tags linked to projects
+
+Revision ID: b9f8c7d1e2a3
+Revises: a8e7b6c0d1f2
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9f8c7d1e2a3'
+down_revision: Union[str, Sequence[str], None] = 'a8e7b6c0d1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# frozen copy of app.skill_tags.KINDS / slugify, so later edits there don't change this migration
+KINDS = {"language": "language", "frameworks": "framework", "tools": "tool", "database": "database"}
+
+
+def _slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9+#.]+", "-", name.lower()).strip("-")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    skill_tags = op.create_table(
+        'skill_tags',
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('slug', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('tag_id'),
+        sa.UniqueConstraint('kind', 'slug', name='uq_skill_tags_kind_slug'),
+    )
+    op.create_index(op.f('ix_skill_tags_slug'), 'skill_tags', ['slug'], unique=False)
+    links = op.create_table(
+        'project_skill_tags',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.pro_id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['skill_tags.tag_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'tag_id'),
+    )
+    op.create_index('ix_project_skill_tags_tag_project', 'project_skill_tags', ['tag_id', 'project_id'], unique=False)
+
+    # ---- backfill from the comma-separated req_skills columns ----
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT p.pro_id, s.language, s.frameworks, s.tools, s.database "
+        "FROM projects p JOIN req_skills s ON s.req_skill_id = p.req_skill_id"
+    )).mappings().all()
+
+    tags, wanted = {}, set()
+    for row in rows:
+        for column, kind in KINDS.items():
+            for name in (row[column] or "").split(","):
+                name = name.strip()
+                slug = _slugify(name)
+                if slug:
+                    tags.setdefault((kind, slug), name)
+                    wanted.add((row["pro_id"], kind, slug))
+    if not tags:
+        return
+    op.bulk_insert(skill_tags, [{"kind": k, "slug": s, "name": n} for (k, s), n in tags.items()])
+    ids = {(k, s): tag_id for tag_id, k, s in bind.execute(sa.text("SELECT tag_id, kind, slug FROM skill_tags"))}
+    op.bulk_insert(links, [{"project_id": pro_id, "tag_id": ids[(k, s)]} for pro_id, k, s in wanted])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_skill_tags_tag_project', table_name='project_skill_tags')
+    op.drop_table('project_skill_tags')
+    op.drop_index(op.f('ix_skill_tags_slug'), table_name='skill_tags')
+    op.drop_table('skill_tags')
@@ -0,0 +1,61 @@
+"""Unique my_roll.roll_title and req_skills stack
+
+Revision ID: d5b3e4f7a8c9
+Revises: c4a2d3e6f7b8
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b3e4f7a8c9'
+down_revision: Union[str, Sequence[str], None] = 'c4a2d3e6f7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Collapse duplicate roles onto the oldest row before enforcing uniqueness
+    op.execute("""
+        UPDATE projects p SET my_roll_id = keep.roll_id
+        FROM my_roll r
+        JOIN (SELECT roll_title, MIN(roll_id) AS roll_id FROM my_roll GROUP BY roll_title) keep
+          ON keep.roll_title = r.roll_title
+        WHERE p.my_roll_id = r.roll_id AND r.roll_id <> keep.roll_id
+    """)
+    op.execute("""
+        DELETE FROM my_roll r
+        WHERE r.roll_id NOT IN (SELECT MIN(roll_id) FROM my_roll GROUP BY roll_title)
+    """)
+    # Projects with the same stack share one skill row: point them all at the
+    # oldest row of their stack, then drop the rows nobody references
+    op.execute("""
+        UPDATE projects p SET req_skill_id = keep.req_skill_id
+        FROM req_skills s
+        JOIN (
+            SELECT language, frameworks, tools, database, MIN(req_skill_id) AS req_skill_id
+            FROM req_skills GROUP BY language, frameworks, tools, database
+        ) keep
+          ON keep.language IS NOT DISTINCT FROM s.language
+         AND keep.frameworks IS NOT DISTINCT FROM s.frameworks
+         AND keep.tools IS NOT DISTINCT FROM s.tools
+         AND keep.database IS NOT DISTINCT FROM s.database
+        WHERE p.req_skill_id = s.req_skill_id AND s.req_skill_id <> keep.req_skill_id
+    """)
+    op.execute("""
+        DELETE FROM req_skills s
+        WHERE NOT EXISTS (SELECT 1 FROM projects p WHERE p.req_skill_id = s.req_skill_id)
+    """)
+    op.create_unique_constraint(op.f('my_roll_roll_title_key'), 'my_roll', ['roll_title'])
+    op.create_unique_constraint('uq_req_skills_stack', 'req_skills', ['language', 'frameworks', 'tools', 'database'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_req_skills_stack', 'req_skills', type_='unique')
+    op.drop_constraint(op.f('my_roll_roll_title_key'), 'my_roll', type_='unique')
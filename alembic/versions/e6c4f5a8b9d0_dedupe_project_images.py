@@ -0,0 +1,60 @@
+"""Dedupe project_images by path, order links by position
+
+Revision ID: e6c4f5a8b9d0
+Revises: d5b3e4f7a8c9
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6c4f5a8b9d0'
+down_revision: Union[str, Sequence[str], None] = 'd5b3e4f7a8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('project_image_association', sa.Column('position', sa.Integer(), server_default='0', nullable=False))
+    # keep the previous display order (insertion order == image_id order)
+    op.execute("""
+        UPDATE project_image_association a SET position = o.position
+        FROM (
+            SELECT project_id, image_id,
+                   ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY image_id) - 1 AS position
+            FROM project_image_association
+        ) o
+        WHERE a.project_id = o.project_id AND a.image_id = o.image_id
+    """)
+    # a project linking two copies of one path keeps only the first link
+    op.execute("""
+        DELETE FROM project_image_association a
+        USING project_images i, project_image_association b, project_images j
+        WHERE a.image_id = i.image_id AND b.image_id = j.image_id
+          AND a.project_id = b.project_id AND i.image_path = j.image_path
+          AND a.image_id > b.image_id
+    """)
+    # point every link at the oldest row for its path, then drop the copies
+    op.execute("""
+        UPDATE project_image_association a SET image_id = k.keep_id
+        FROM project_images i
+        JOIN (SELECT image_path, MIN(image_id) AS keep_id FROM project_images GROUP BY image_path) k
+          ON k.image_path = i.image_path
+        WHERE a.image_id = i.image_id AND i.image_id <> k.keep_id
+    """)
+    op.execute("""
+        DELETE FROM project_images
+        WHERE image_id NOT IN (SELECT MIN(image_id) FROM project_images GROUP BY image_path)
+    """)
+    op.create_index(op.f('ix_project_images_image_path'), 'project_images', ['image_path'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_project_images_image_path'), table_name='project_images')
+    op.drop_column('project_image_association', 'position')
@@ -0,0 +1,12 @@
+# app/assets/__init__.py
+"""
+Offline asset pipelines and the runtime helpers that read their output.
+
+Build steps (run at deploy time, see ``render.yaml``) write into
+``app/static/build/``, which is not committed.
+"""
+
+import os
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+BUILD_DIR = os.path.join(STATIC_DIR, "build")
@@ -0,0 +1,48 @@
+# app/assets/bundle.py
+"""
+The bundles written by :mod:`app.assets.bundle_build`.
+
+    {% set bundle_css = bundle_url('css') %}
+
+Empty without a bundle (build step not run, or a CDN file was
+unreachable at build time): the templates then keep their CDN tags.
+"""
+
+import functools
+import json
+import os
+from typing import Optional
+
+from jinja2 import pass_context
+
+from app.assets import BUILD_DIR
+
+MANIFEST_PATH = os.path.join(BUILD_DIR, "bundle.json")
+
+
+@functools.lru_cache(maxsize=1)
+def manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def reload():
+    manifest.cache_clear()
+
+
+def path(kind: str) -> Optional[str]:
+    """Static path of the ``"css"`` / ``"js"`` bundle, or None."""
+    return manifest().get(kind)
+
+
+@pass_context
+def bundle_url(context, kind: str) -> str:
+    bundled = path(kind)
+    return str(context["request"].url_for("static", path=bundled)) if bundled else ""
+
+
+def register(env):
+    env.globals.update(bundle_url=bundle_url)
@@ -0,0 +1,282 @@
+# app/assets/bundle_build.py
+"""
+One self-hosted CSS bundle and one JS bundle for every page.
+
+The stylesheets of ``all_css.html`` and the scripts of ``all_js.html``,
+local and CDN alike (Bootstrap, jQuery, Popper, Font Awesome,
+ekko-lightbox, devicon, Google Fonts), are concatenated in page order,
+minified and written under content-hashed names:
+
+    build/dist/bundle/app.<hash>.css       (+ .gz / .br)
+    build/dist/bundle/app.<hash>.js
+    build/dist/bundle/files/<hash>.woff2   fonts/images the CDN CSS points at
+
+so a page makes no third-party DNS lookups or TLS handshakes.
+``all_css.html`` / ``all_js.html`` switch to the bundles once
+``build/bundle.json`` exists (:mod:`app.assets.bundle`). If a CDN file
+can't be downloaded no bundle is written and pages keep the CDN tags.
+
+Files under ``static/vendor/`` that no template, stylesheet or script
+refers to are listed in ``build/unused-vendor.json``, and in
+``build/deploy-exclude.txt`` (``tar -X`` / ``rsync --exclude-from``).
+
+Run after :mod:`app.assets.static_build`, before :mod:`app.assets.critical_build`:
+
+    python -m app.assets.bundle_build
+    python -m app.assets.bundle_build --report-only   # vendor report, no downloads
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
+import time
+from collections import defaultdict
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+
+from app.assets import BUILD_DIR, STATIC_DIR, remote, static_build, static_manifest
+from app.assets.bundle import MANIFEST_PATH
+from app.assets.critical_build import SCRIPTS_TEMPLATE, STYLESHEETS_TEMPLATE, TEMPLATES_DIR, Asset, assets
+
+logger = logging.getLogger("Bundle")
+
+BUNDLE_DIR = os.path.join(static_build.DIST_DIR, "bundle")
+FILES_DIR = os.path.join(BUNDLE_DIR, "files")
+VENDOR_DIR = os.path.join(STATIC_DIR, "vendor")
+UNUSED_REPORT_PATH = os.path.join(BUILD_DIR, "unused-vendor.json")
+DEPLOY_EXCLUDE_PATH = os.path.join(BUILD_DIR, "deploy-exclude.txt")
+PROJECT_DIR = os.path.dirname(os.path.dirname(STATIC_DIR))
+
+# logical static path of the bundle directory (url()s are made relative to it)
+BUNDLE_PATH = posixpath.relpath(BUNDLE_DIR.replace(os.sep, "/"), STATIC_DIR.replace(os.sep, "/"))
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CHARSET = re.compile(r"@charset\s+[^;]+;", re.I)
+_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_SOURCE_MAP = re.compile(r"^\s*(//|/\*)# sourceMappingURL=.*$", re.M)
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.S)
+
+
+class BundleError(Exception):
+    """A source of the bundle could not be read; nothing is written."""
+
+
+# ---------------------------
+#       SOURCES
+# ---------------------------
+
+def minified_candidates(href: str) -> list[str]:
+    """``x.min.js`` before ``x.js`` for CDN files without an integrity hash."""
+    stem, ext = posixpath.splitext(urlsplit(href).path)
+    if ext not in (".css", ".js") or stem.endswith(".min"):
+        return [href]
+    return [href.replace(f"{stem}{ext}", f"{stem}.min{ext}", 1), href]
+
+
+def read(asset: Asset) -> bytes:
+    if not asset.is_local:
+        # the .min sibling only when no SRI hash pins the exact file
+        candidates = [asset.href] if asset.integrity else minified_candidates(asset.href)
+        for href in candidates:
+            data = remote.fetch(href, asset.integrity)
+            if data is not None:
+                return data
+        raise BundleError(f"{asset.href} could not be downloaded")
+    with open(os.path.join(STATIC_DIR, asset.href), "rb") as fh:
+        return fh.read()
+
+
+def write_hashed(directory: str, stem: str, ext: str, data: bytes) -> str:
+    """Write ``data`` as ``<stem>.<hash><ext>`` (plus .gz/.br); returns the static path."""
+    digest = hashlib.sha256(data).hexdigest()[:static_build.HASH_LENGTH]
+    name = f"{stem}.{digest}{ext}" if stem else f"{digest}{ext}"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as fh:
+            fh.write(data)
+        if ext in static_build.COMPRESSIBLE:
+            for encoding, encoded in static_build.compress(data).items():
+                with open(path + static_build.SUFFIXES[encoding], "wb") as fh:
+                    fh.write(encoded)
+    return os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")
+
+
+# ---------------------------
+#       CSS
+# ---------------------------
+
+def minify_css(css: str) -> str:
+    css = _CHARSET.sub("", _CSS_COMMENT.sub("", css))
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def relocate_urls(css: str, asset: Asset) -> str:
+    """Point ``url()``s at files next to the bundle: CDN files are downloaded into ``files/``."""
+    def relocated(match):
+        ref = match.group(2).strip()
+        if ref.startswith(("data:", "#")):
+            return match.group(0)
+        path, _, fragment = ref.partition("#")
+        if remote.is_remote(asset.href) or remote.is_remote(path):
+            url = urljoin(remote.absolute(asset.href), path)
+            data = remote.fetch(url)
+            if data is None:
+                raise BundleError(f"{url} (from {asset.href}) could not be downloaded")
+            ext = posixpath.splitext(urlsplit(url).path)[1]
+            target = write_hashed(FILES_DIR, "", ext, data)
+        elif path.startswith("/"):
+            return match.group(0)
+        else:
+            # local files keep their query string; the fingerprinted copy if there is one
+            path, _, query = path.partition("?")
+            logical = posixpath.normpath(posixpath.join(posixpath.dirname(asset.href), path))
+            target = static_manifest.resolve(logical) + (f"?{query}" if query else "")
+        relative = posixpath.relpath(target, BUNDLE_PATH)
+        return f"url({relative}{'#' + fragment if fragment else ''})"
+    return _URL.sub(relocated, css)
+
+
+def bundle_css(sheets: list[Asset]) -> bytes:
+    parts = [
+        minify_css(relocate_urls(_CSS_COMMENT.sub("", read(asset).decode("utf-8")), asset))
+        for asset in sheets
+    ]
+    return "\n".join(parts).encode()
+
+
+# ---------------------------
+#       JS
+# ---------------------------
+
+def bundle_js(scripts: list[Asset]) -> bytes:
+    # the files ship minified (or as their .min build); source maps aren't bundled.
+    # ";" keeps a file without a trailing semicolon from running into the next
+    parts = [_SOURCE_MAP.sub("", read(asset).decode("utf-8")).strip() for asset in scripts]
+    return "\n;\n".join(parts).encode()
+
+
+# ---------------------------
+#       UNUSED VENDOR FILES
+# ---------------------------
+
+def _referenced_text() -> str:
+    """Every template (comments dropped) and every local stylesheet/script they load."""
+    texts = []
+    for root, _dirs, files in os.walk(TEMPLATES_DIR):
+        for name in files:
+            with open(os.path.join(root, name), encoding="utf-8", errors="replace") as fh:
+                texts.append(_HTML_COMMENT.sub("", fh.read()))
+    for asset in assets(STYLESHEETS_TEMPLATE) + assets(SCRIPTS_TEMPLATE):
+        if asset.is_local:
+            with open(os.path.join(STATIC_DIR, asset.href), encoding="utf-8", errors="replace") as fh:
+                texts.append(fh.read())
+    return "\n".join(texts)
+
+
+def unused_vendor() -> dict:
+    """``{"total_bytes", "packages": {name: {"bytes", "files", "unused_files"}}, "unused": [...]}``."""
+    text = _referenced_text()
+    packages = defaultdict(lambda: {"bytes": 0, "files": 0, "unused_files": 0})
+    unused = []
+    for root, _dirs, files in os.walk(VENDOR_DIR):
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")
+            package = packages[rel_path.split("/")[1]]
+            package["files"] += 1
+            if rel_path in text:
+                continue
+            size = os.path.getsize(path)
+            package["bytes"] += size
+            package["unused_files"] += 1
+            unused.append(rel_path)
+    return {
+        "total_bytes": sum(p["bytes"] for p in packages.values()),
+        "packages": dict(sorted(packages.items())),
+        "unused": sorted(unused),
+    }
+
+
+def write_vendor_report(report: dict):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(UNUSED_REPORT_PATH, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+    # whole package directories when none of their files are used
+    excludes = []
+    for name, package in report["packages"].items():
+        prefix = f"vendor/{name}/"
+        if package["unused_files"] == package["files"]:
+            excludes.append(prefix)
+        else:
+            excludes += [path for path in report["unused"] if path.startswith(prefix)]
+    static_rel = os.path.relpath(STATIC_DIR, PROJECT_DIR).replace(os.sep, "/")
+    with open(DEPLOY_EXCLUDE_PATH, "w", encoding="utf-8") as fh:
+        fh.writelines(f"{static_rel}/{path}\n" for path in excludes)
+
+    largest = ", ".join(
+        f"{name} {package['bytes'] / 1024:.0f} KiB"
+        for name, package in sorted(report["packages"].items(), key=lambda item: -item[1]["bytes"])[:4]
+    )
+    logger.info(
+        f"🧹 {report['total_bytes'] / 1024 / 1024:.1f} MiB in {len(report['unused'])} unused vendor files "
+        f"({largest}) → {os.path.relpath(DEPLOY_EXCLUDE_PATH, PROJECT_DIR)}"
+    )
+
+
+# ---------------------------
+#       BUILD
+# ---------------------------
+
+def build_bundles() -> Optional[dict]:
+    static_manifest.reload()
+    sheets = [asset for asset in assets(STYLESHEETS_TEMPLATE) if asset.kind == "style"]
+    scripts = [asset for asset in assets(SCRIPTS_TEMPLATE) if asset.kind == "script"]
+    try:
+        css, js = bundle_css(sheets), bundle_js(scripts)
+    except (BundleError, remote.IntegrityError) as exc:
+        logger.error(f"❌ bundle not built, pages keep the CDN tags: {exc}")
+        return None
+
+    manifest = {
+        "css": write_hashed(BUNDLE_DIR, "app", ".css", css),
+        "js": write_hashed(BUNDLE_DIR, "app", ".js", js),
+        "bytes": {"css": len(css), "js": len(js)},
+        "sources": {"css": [a.href for a in sheets], "js": [a.href for a in scripts]},
+    }
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+    logger.info(
+        f"📦 {len(sheets)} stylesheets → {manifest['css']} ({len(css) / 1024:.1f} KiB), "
+        f"{len(scripts)} scripts → {manifest['js']} ({len(js) / 1024:.1f} KiB)"
+    )
+    return manifest
+
+
+def build(report_only: bool = False) -> Optional[dict]:
+    started = time.perf_counter()
+    manifest = None if report_only else build_bundles()
+    write_vendor_report(unused_vendor())
+    logger.info(f"✅ done in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bundle the page CSS/JS and report unused vendor files.")
+    parser.add_argument("--report-only", action="store_true", help="only write the unused-vendor report")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    build(report_only=args.report_only)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# app/assets/critical.py
+"""
+First paint from :mod:`app.assets.critical_build` output.
+
+- ``critical_css()`` (Jinja global) returns the above-the-fold CSS of the
+  page being rendered; ``all_css.html`` inlines it and then loads the
+  full stylesheets with ``media="print"`` so they don't block rendering.
+- :class:`PreloadLinkMiddleware` adds a ``Link: <...>; rel=preload``
+  header to HTML pages so browsers fetch the stylesheets and scripts
+  while the HTML is still arriving (streamed pages send it first) —
+  the two bundles when :mod:`app.assets.bundle_build` has run.
+
+Without a manifest (build step not run) both emit nothing and the
+stylesheets load as plain blocking ``<link>`` tags.
+"""
+
+import functools
+import json
+
+from jinja2 import pass_context
+from markupsafe import Markup
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.assets import bundle, remote, static_manifest
+from app.assets.critical_build import MANIFEST_PATH, STATIC_PREFIX
+
+
+@functools.lru_cache(maxsize=1)
+def manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def reload():
+    manifest.cache_clear()
+    link_header.cache_clear()
+
+
+def preload_assets() -> list[dict]:
+    if bundle.path("css") and bundle.path("js"):
+        return [{"href": bundle.path("css"), "kind": "style"}, {"href": bundle.path("js"), "kind": "script"}]
+    return manifest().get("preload", [])
+
+
+@pass_context
+def critical_css(context) -> Markup:
+    """Critical CSS of the top-level template (``page_template``); empty if there is none."""
+    css = manifest().get("pages", {}).get(context.get("page_template"), "")
+    # nothing in a <style> element may close it
+    return Markup(css.replace("</", "<\\/"))
+
+
+@functools.lru_cache(maxsize=8)
+def link_header(root_path: str = "") -> str:
+    links = []
+    for asset in preload_assets():
+        href = asset["href"]
+        if not remote.is_remote(href):
+            href = f"{root_path}{STATIC_PREFIX}{static_manifest.resolve(href)}"
+        link = f"<{href}>; rel=preload; as={asset['kind']}"
+        if asset.get("crossorigin"):
+            link += f"; crossorigin={asset['crossorigin']}"
+        links.append(link)
+    return ", ".join(links)
+
+
+def register(env):
+    env.globals.update(critical_css=critical_css)
+
+
+class PreloadLinkMiddleware:
+    """Adds the preload ``Link`` header to 200 HTML responses."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_link(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                value = link_header(scope.get("root_path", ""))
+                if value and headers.get("content-type", "").startswith("text/html"):
+                    headers.append("link", value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_link)
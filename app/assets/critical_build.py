@@ -0,0 +1,382 @@
+# app/assets/critical_build.py
+"""
+Critical (above-the-fold) CSS per page template.
+
+For every page template (one with a ``<body>``) the markup above the fold
+— the navbar and the first ``FOLD_SECTIONS`` content ``<section>`` — is
+read from the template source with its includes inlined. The rules of
+the stylesheets in ``all_css.html`` whose selectors can match that markup
+are written to ``build/critical/manifest.json``, together with the
+stylesheets and scripts to announce in ``Link: rel=preload`` headers.
+
+:mod:`app.assets.critical` inlines the CSS in ``<head>`` and loads the
+full stylesheets without blocking rendering. With a bundle
+(:mod:`app.assets.bundle_build`) the rules come from the bundled CSS;
+otherwise CDN stylesheets are fetched (:mod:`app.assets.remote`). If
+one can't be (offline build) no page gets critical CSS: inlining only
+part of the above-the-fold rules and loading the sheets async would
+flash unstyled content, so the stylesheets stay blocking instead.
+
+Run after :mod:`app.assets.static_build` and :mod:`app.assets.bundle_build`
+(``url()`` references are rewritten to the fingerprinted files):
+
+    python -m app.assets.critical_build
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import posixpath
+import re
+import time
+from html.parser import HTMLParser
+from typing import Iterator, NamedTuple, Optional
+from urllib.parse import urljoin
+
+from app.assets import BUILD_DIR, STATIC_DIR, bundle, remote, static_manifest
+
+logger = logging.getLogger("CriticalCSS")
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(STATIC_DIR), "templates")
+CRITICAL_DIR = os.path.join(BUILD_DIR, "critical")
+MANIFEST_PATH = os.path.join(CRITICAL_DIR, "manifest.json")
+
+# content sections below the navbar that count as above the fold
+FOLD_SECTIONS = int(os.getenv("CRITICAL_FOLD_SECTIONS", "1"))
+# gzipped size above which a warning is logged (~ the first round trip of a new connection)
+BUDGET_BYTES = 14 * 1024
+STATIC_PREFIX = "/static/"
+
+STYLESHEETS_TEMPLATE = "all_css.html"
+SCRIPTS_TEMPLATE = "all_js.html"
+# at-rules whose block holds rules to filter; other blocks (@keyframes, @page) are dropped
+NESTED_AT_RULES = ("@media", "@supports")
+
+
+class CriticalCSSError(Exception):
+    """A stylesheet could not be read; no page gets critical CSS."""
+
+
+class Asset(NamedTuple):
+    """A stylesheet or script from ``all_css.html`` / ``all_js.html``."""
+    href: str  # logical static path ("css/main.css") or absolute URL
+    kind: str  # "style" | "script"
+    crossorigin: Optional[str] = None
+    integrity: Optional[str] = None
+
+    @property
+    def is_local(self) -> bool:
+        return not remote.is_remote(self.href)
+
+
+# ---------------------------
+#       TEMPLATE SOURCE
+# ---------------------------
+
+_INCLUDE = re.compile(r"""{%-?\s*include\s+['"]([^'"]+)['"][^%]*-?%}""")
+_STATIC_URL = re.compile(r"""{{\s*static_url\(\s*['"]([^'"]+)['"]\s*\)\s*}}""")
+# {{ stylesheet(static_url('css/main.css'), critical) }} / {{ stylesheet("https://...", critical, integrity=...) }}
+_STYLESHEET_CALL = re.compile(
+    r"""stylesheet\(\s*(?:static_url\(\s*['"]([^'"]+)['"]\s*\)|['"]([^'"]+)['"])([^)]*)\)"""
+)
+_INTEGRITY = re.compile(r"""integrity\s*=\s*['"]([^'"]+)['"]""")
+_JINJA = re.compile(r"{#.*?#}|{%.*?%}|{{.*?}}", re.S)
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.S)
+
+
+def _read(name: str) -> str:
+    with open(os.path.join(TEMPLATES_DIR, name), encoding="utf-8") as fh:
+        return fh.read()
+
+
+def expand(name: str, _seen: tuple = ()) -> str:
+    """Template source with ``{% include %}`` tags replaced by the included source."""
+    if name in _seen:
+        return ""
+    return _INCLUDE.sub(lambda m: expand(m.group(1), _seen + (name,)), _read(name))
+
+
+def page_templates() -> list[str]:
+    return sorted(
+        name for name in os.listdir(TEMPLATES_DIR)
+        if name.endswith(".html") and "<body" in _HTML_COMMENT.sub("", _read(name))
+    )
+
+
+def above_the_fold(source: str) -> str:
+    """The ``<body>`` markup up to the end of the first ``FOLD_SECTIONS`` sections."""
+    markup = _JINJA.sub("", _HTML_COMMENT.sub("", source))
+    start = markup.find("<body")
+    markup = markup[start:] if start >= 0 else markup
+    end = 0
+    for _ in range(FOLD_SECTIONS):
+        close = markup.find("</section>", end)
+        if close < 0:
+            return markup
+        end = close + len("</section>")
+    return markup[:end]
+
+
+class Used(HTMLParser):
+    """Tag names, classes, ids and attribute names present in some markup."""
+
+    def __init__(self, markup: str):
+        super().__init__()
+        self.tags = {"html", "body"}
+        self.classes, self.ids, self.attrs = set(), set(), set()
+        self.feed(markup)
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag)
+        for name, value in attrs:
+            self.attrs.add(name)
+            if name == "class" and value:
+                self.classes.update(value.split())
+            elif name == "id" and value:
+                self.ids.add(value)
+
+
+class _AssetParser(HTMLParser):
+
+    def __init__(self, markup: str):
+        super().__init__()
+        self.assets: list[Asset] = []
+        self.feed(markup)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "link" and attrs.get("rel") == "stylesheet":
+            self._add(attrs.get("href"), "style", attrs)
+        elif tag == "script":
+            self._add(attrs.get("src"), "script", attrs)
+
+    def _add(self, href: Optional[str], kind: str, attrs: dict):
+        # "{{ bundle_js }}": the bundle itself, not a source of it
+        if href and "{{" not in href:
+            self.assets.append(Asset(href, kind, attrs.get("crossorigin"), attrs.get("integrity")))
+
+
+def assets(template: str) -> list[Asset]:
+    """Stylesheets / scripts referenced by ``template``; ``static_url()`` paths stay logical."""
+    source = _HTML_COMMENT.sub("", _read(template))
+    # the stylesheet() macro of all_css.html; integrity implies crossorigin="anonymous"
+    found = []
+    for local, url, rest in _STYLESHEET_CALL.findall(source):
+        integrity = _INTEGRITY.search(rest)
+        found.append(Asset(
+            local or url, "style", "anonymous" if integrity else None, integrity.group(1) if integrity else None,
+        ))
+    return found + _AssetParser(_STATIC_URL.sub(lambda m: m.group(1), source)).assets
+
+
+# ---------------------------
+#       CSS
+# ---------------------------
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_PSEUDO = re.compile(r"::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?")
+_ATTRIBUTE = re.compile(r"\[\s*([\w-]+)[^\]]*\]")
+_COMBINATOR = re.compile(r"\s*[>+~]\s*|\s+")
+_SIMPLE = re.compile(r"([.#]?)((?:[\w-]|\\.)+|\*)")
+_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_FONT_FAMILY = re.compile(r"font-family\s*:\s*([^;]+)", re.I)
+_WHITESPACE = re.compile(r"\s+")
+_AROUND_SEMICOLON = re.compile(r"\s*;\s*")
+
+
+def blocks(css: str) -> Iterator[tuple[str, Optional[str]]]:
+    """Top-level ``(prelude, block)`` pairs; ``block`` is None for statements (``@import``)."""
+    depth, quote, start, prelude_end = 0, None, 0, 0
+    for i, char in enumerate(css):
+        if quote:
+            if char == quote and css[i - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "{":
+            if depth == 0:
+                prelude_end = i
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                yield css[start:prelude_end].strip(), css[prelude_end + 1:i]
+                start = i + 1
+        elif char == ";" and depth == 0:
+            yield css[start:i].strip(), None
+            start = i + 1
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(prelude[start:i].strip())
+            start = i + 1
+    parts.append(prelude[start:].strip())
+    return [part for part in parts if part]
+
+
+def _declarations(block: str) -> str:
+    return _AROUND_SEMICOLON.sub(";", _WHITESPACE.sub(" ", block.strip()))
+
+
+def matches(selector: str, used: Used) -> bool:
+    """Could ``selector`` match the markup? Pseudo-classes and states are ignored."""
+    if any(name.lower() not in used.attrs for name in _ATTRIBUTE.findall(selector)):
+        return False
+    bare = _ATTRIBUTE.sub("", _PSEUDO.sub("", selector))
+    for compound in _COMBINATOR.split(bare.strip()):
+        for prefix, name in _SIMPLE.findall(compound):
+            name = name.replace("\\", "")
+            if prefix == ".":
+                found = name in used.classes
+            elif prefix == "#":
+                found = name in used.ids
+            else:
+                found = name == "*" or name.lower() in used.tags
+            if not found:
+                return False
+    return True
+
+
+def rewrite_urls(css: str, base: str) -> str:
+    """Make ``url()`` references absolute: the CSS no longer sits next to what it points at."""
+    def absolute(match):
+        ref = match.group(2).strip()
+        if ref.startswith(("data:", "#", "/", "http://", "https://")):
+            return match.group(0)
+        if base.startswith(("http://", "https://", "//")):
+            return f"url({urljoin(base, ref)})"
+        # keep ?v=... / #iefix (font-awesome) after the resolved path
+        path = re.split(r"[?#]", ref, maxsplit=1)[0]
+        suffix = ref[len(path):]
+        logical = posixpath.normpath(posixpath.join(posixpath.dirname(base), path))
+        return f"url({STATIC_PREFIX}{static_manifest.resolve(logical)}{suffix})"
+    return _URL.sub(absolute, css)
+
+
+def select(css: str, used: Used, font_faces: list[str]) -> str:
+    """Rules of ``css`` that apply to ``used``; ``@font-face`` blocks go to ``font_faces``."""
+    kept = []
+    for prelude, block in blocks(css):
+        if block is None:
+            continue  # @charset / @import: the full stylesheet still loads
+        if prelude.startswith("@"):
+            at_rule = re.match(r"@[\w-]+", prelude).group(0).lower()
+            if at_rule == "@font-face":
+                font_faces.append(f"@font-face{{{_declarations(block)}}}")
+            elif at_rule in NESTED_AT_RULES:
+                inner = select(block, used, font_faces)
+                if inner:
+                    kept.append(f"{prelude}{{{inner}}}")
+            continue
+        selectors = [s for s in _split_selectors(prelude) if matches(s, used)]
+        if selectors:
+            kept.append(f"{','.join(selectors)}{{{_declarations(block)}}}")
+    return "".join(kept)
+
+
+def used_fonts(font_faces: list[str], css: str) -> list[str]:
+    """The ``@font-face`` rules whose family the selected CSS refers to."""
+    families = {
+        family.strip().strip("'\"").lower()
+        for value in _FONT_FAMILY.findall(css)
+        for family in value.split(",")
+    }
+    kept = []
+    for rule in font_faces:
+        declared = _FONT_FAMILY.search(rule)
+        if declared and declared.group(1).strip().strip("'\"").lower() in families:
+            kept.append(rule)
+    return kept
+
+
+# ---------------------------
+#       STYLESHEETS
+# ---------------------------
+
+def stylesheets() -> list[tuple[Asset, str]]:
+    """``(asset, css with absolute url()s)`` for every stylesheet, in page order."""
+    bundled = bundle.path("css")
+    sources = [Asset(bundled, "style")] if bundled else assets(STYLESHEETS_TEMPLATE)
+    sheets = []
+    for asset in sources:
+        if asset.kind != "style":
+            continue
+        if asset.is_local:
+            with open(os.path.join(STATIC_DIR, asset.href), encoding="utf-8") as fh:
+                css = fh.read()
+        else:
+            data = remote.fetch(asset.href, asset.integrity)
+            if data is None:
+                raise CriticalCSSError(f"{asset.href} could not be downloaded")
+            css = data.decode("utf-8", errors="replace")
+        sheets.append((asset, rewrite_urls(_CSS_COMMENT.sub("", css), asset.href)))
+    return sheets
+
+
+# ---------------------------
+#       BUILD
+# ---------------------------
+
+def critical_css(template: str, sheets: list[tuple[Asset, str]]) -> str:
+    used = Used(above_the_fold(expand(template)))
+    font_faces: list[str] = []
+    css = "".join(select(sheet, used, font_faces) for _asset, sheet in sheets)
+    return "".join(used_fonts(font_faces, css)) + css
+
+
+def build() -> dict:
+    started = time.perf_counter()
+    static_manifest.reload()
+    bundle.reload()
+    try:
+        sheets = stylesheets()
+    except (CriticalCSSError, remote.IntegrityError) as exc:
+        logger.error(f"❌ no critical CSS written, pages keep blocking stylesheets: {exc}")
+        sheets, templates = [], []
+    else:
+        templates = page_templates()
+    full_bytes = sum(len(css.encode()) for _asset, css in sheets)
+
+    pages = {}
+    for template in templates:
+        pages[template] = css = critical_css(template, sheets)
+        size, gzipped = len(css.encode()), len(gzip.compress(css.encode()))
+        logger.info(
+            f"🎨 {template}: {size / 1024:.1f} KiB critical of {full_bytes / 1024:.1f} KiB "
+            f"({gzipped / 1024:.1f} KiB gzipped)"
+        )
+        if gzipped > BUDGET_BYTES:
+            logger.warning(f"⚠️ {template}: critical CSS is over the {BUDGET_BYTES // 1024} KiB budget")
+
+    preload = [
+        asset._asdict()
+        for asset in assets(STYLESHEETS_TEMPLATE) + assets(SCRIPTS_TEMPLATE)
+    ]
+    manifest = {"pages": pages, "preload": preload}
+    os.makedirs(CRITICAL_DIR, exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+    logger.info(f"✅ critical CSS for {len(pages)} pages in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+def main(argv=None):
+    argparse.ArgumentParser(description="Extract above-the-fold CSS per page template.").parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    build()
+
+
+if __name__ == "__main__":
+    main()
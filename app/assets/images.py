@@ -0,0 +1,157 @@
+# app/assets/images.py
+"""
+Responsive image pipeline.
+
+Every raster image under ``static/images`` is resized to several widths
+and re-encoded as WebP (and AVIF when Pillow supports it). Variants and a
+manifest land in ``static/build/images``. Sources whose content hash is
+unchanged since the last run are skipped; the rest are encoded in a
+process pool.
+
+    python -m app.assets.images [--force] [--workers N]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+
+from app.assets import BUILD_DIR, STATIC_DIR
+
+logger = logging.getLogger("ImagePipeline")
+
+SOURCE_DIR = os.path.join(STATIC_DIR, "images")
+OUTPUT_DIR = os.path.join(BUILD_DIR, "images")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+
+RASTER_EXTENSIONS = (".png", ".jpg", ".jpeg")
+WIDTHS = (480, 960, 1440, 1920)
+QUALITY = {"avif": 50, "webp": 78}
+
+
+def available_formats() -> tuple:
+    from PIL import features
+
+    return tuple(fmt for fmt in ("avif", "webp") if features.check(fmt))
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_sources() -> list[str]:
+    """Static-relative paths of every raster image (e.g. ``images/banner/banner-1.png``)."""
+    sources = []
+    for root, _dirs, files in os.walk(SOURCE_DIR):
+        for name in files:
+            if name.lower().endswith(RASTER_EXTENSIONS):
+                sources.append(os.path.relpath(os.path.join(root, name), STATIC_DIR).replace(os.sep, "/"))
+    return sorted(sources)
+
+
+def target_widths(source_width: int) -> list[int]:
+    widths = [w for w in WIDTHS if w < source_width]
+    return widths + [source_width] if source_width <= WIDTHS[-1] else widths
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return {"images": {}}
+
+
+def _outputs_exist(entry: dict) -> bool:
+    return all(
+        os.path.exists(os.path.join(STATIC_DIR, variant["path"]))
+        for variants in entry["variants"].values()
+        for variant in variants
+    )
+
+
+def build_one(rel_path: str, digest: str, formats: tuple) -> tuple[str, dict]:
+    """Encode every width/format of one source. Runs in a worker process."""
+    from PIL import Image
+
+    stem = os.path.splitext(rel_path)[0].split("/", 1)[1]  # drop leading "images/"
+    with Image.open(os.path.join(STATIC_DIR, rel_path)) as img:
+        img.load()
+        has_alpha = img.mode in ("RGBA", "LA") or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        width, height = img.size
+
+        variants = {fmt: [] for fmt in formats}
+        for w in target_widths(width):
+            resized = img if w == width else img.resize((w, round(height * w / width)), Image.LANCZOS)
+            for fmt in formats:
+                out_rel = f"build/images/{stem}-{w}w.{fmt}"
+                out_path = os.path.join(STATIC_DIR, out_rel)
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                resized.save(out_path, fmt.upper(), quality=QUALITY[fmt])
+                variants[fmt].append({"w": w, "path": out_rel})
+
+    return rel_path, {"hash": digest, "width": width, "height": height, "variants": variants}
+
+
+def build(force: bool = False, workers: int = None) -> dict:
+    """Bring ``static/build/images`` up to date. Returns the manifest."""
+    started = time.perf_counter()
+    formats = available_formats()
+    manifest = load_manifest()
+    previous = manifest.get("images", {})
+    if manifest.get("formats") != list(formats):
+        previous = {}
+
+    entries, jobs = {}, []
+    for rel_path in find_sources():
+        digest = file_hash(os.path.join(STATIC_DIR, rel_path))
+        entry = previous.get(rel_path)
+        if not force and entry and entry["hash"] == digest and _outputs_exist(entry):
+            entries[rel_path] = entry
+        else:
+            jobs.append((rel_path, digest))
+
+    if jobs:
+        # build-time only; the app imports this module just for MANIFEST_PATH
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(build_one, rel_path, digest, formats) for rel_path, digest in jobs]
+            for future in futures:
+                rel_path, entry = future.result()
+                entries[rel_path] = entry
+                logger.info(f"🖼 {rel_path} → {sum(len(v) for v in entry['variants'].values())} variants")
+
+    manifest = {"formats": list(formats), "widths": list(WIDTHS), "images": dict(sorted(entries.items()))}
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+    logger.info(
+        f"✅ {len(jobs)} encoded, {len(entries) - len(jobs)} unchanged "
+        f"in {time.perf_counter() - started:.1f}s (formats: {', '.join(formats)})"
+    )
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build responsive image variants.")
+    parser.add_argument("--force", action="store_true", help="re-encode every image")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    build(force=args.force, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
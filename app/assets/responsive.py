@@ -0,0 +1,70 @@
+# app/assets/responsive.py
+"""
+Jinja helpers for the variants written by :mod:`app.assets.images`.
+
+    <picture>
+        {{ picture_sources('images/banner/banner-1.png', sizes='100vw') }}
+        <img src="{{ static_url('images/banner/banner-1.png') }}" alt="...">
+    </picture>
+
+Without a manifest (pipeline not run) the helpers emit nothing and the
+plain ``<img>`` is used.
+"""
+
+import functools
+import json
+
+from jinja2 import pass_context
+from markupsafe import Markup, escape
+
+from app.assets import static_manifest
+from app.assets.images import MANIFEST_PATH
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+
+@functools.lru_cache(maxsize=1)
+def manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh).get("images", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def reload():
+    manifest.cache_clear()
+
+
+@pass_context
+def srcset(context, path: str, fmt: str = "webp") -> str:
+    """``srcset`` value for ``path`` in ``fmt``; empty if there are no variants."""
+    entry = manifest().get(path)
+    if not entry or fmt not in entry["variants"]:
+        return ""
+    request = context["request"]
+    return ", ".join(
+        f"{request.url_for('static', path=static_manifest.resolve(variant['path']))} {variant['w']}w"
+        for variant in entry["variants"][fmt]
+    )
+
+
+@pass_context
+def picture_sources(context, path: str, sizes: str = "100vw") -> Markup:
+    """``<source>`` tags (AVIF first, then WebP) to place inside a ``<picture>``."""
+    entry = manifest().get(path)
+    if not entry:
+        return Markup("")
+    tags = []
+    for fmt in ("avif", "webp"):
+        value = srcset(context, path, fmt)
+        if value:
+            tags.append(
+                f'<source type="{MIME_TYPES[fmt]}" srcset="{escape(value)}" sizes="{escape(sizes)}">'
+            )
+    return Markup("\n".join(tags))
+
+
+def register(env):
+    """Expose the helpers as Jinja globals."""
+    env.globals.update(srcset=srcset, picture_sources=picture_sources)
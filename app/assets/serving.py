@@ -0,0 +1,75 @@
+# app/assets/serving.py
+"""
+``StaticFiles`` that serves the precompressed siblings written by
+:mod:`app.assets.static_build` and marks fingerprinted files immutable.
+Other files under ``build/dist/`` (its ``manifest.json``) are rewritten
+by every build and get ``no-cache``.
+"""
+
+import mimetypes
+import os
+import posixpath
+import re
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from app.assets.static_build import HASH_LENGTH
+
+# (Accept-Encoding token, file suffix), best first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+FINGERPRINTED_PREFIX = "build/dist/"
+IMMUTABLE = "public, max-age=31536000, immutable"
+# "app.<hash>.css", "logo.<hash>.svg", bundle files "<hash>.woff2"
+_HASHED_NAME = re.compile(rf"(?:^|\.)[0-9a-f]{{{HASH_LENGTH}}}\.\w+$")
+
+
+def is_fingerprinted(rel_path: str) -> bool:
+    return rel_path.startswith(FINGERPRINTED_PREFIX) and bool(_HASHED_NAME.search(posixpath.basename(rel_path)))
+
+
+def accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def negotiate(full_path: str, accept_encoding: str) -> tuple:
+    """Return ``(encoding, path)`` of the best precompressed sibling, or ``(None, full_path)``."""
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, suffix in ENCODINGS:
+        if (encoding in accepted or "*" in accepted) and os.path.isfile(full_path + suffix):
+            return encoding, full_path + suffix
+    return None, full_path
+
+
+class PrecompressedStaticFiles(StaticFiles):
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        encoding, served_path = negotiate(full_path, request_headers.get("accept-encoding", ""))
+
+        media_type = mimetypes.guess_type(full_path)[0] or "text/plain"
+        if encoding:
+            stat_result = os.stat(served_path)
+        response = FileResponse(served_path, status_code=status_code, stat_result=stat_result, media_type=media_type)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+
+        rel_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+        if is_fingerprinted(rel_path):
+            response.headers["Cache-Control"] = IMMUTABLE
+        elif rel_path.startswith(FINGERPRINTED_PREFIX):
+            response.headers["Cache-Control"] = "no-cache"
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,115 @@
+# app/assets/static_build.py
+"""
+Fingerprinted, precompressed static assets.
+
+Copies ``css/``, ``js/``, ``images/`` and the responsive variants in
+``build/images/`` to ``build/dist/`` under content-hashed names
+(``css/main.css`` → ``build/dist/css/main.3f2a9c1e0b.css``), writes
+``.gz`` and ``.br`` siblings for compressible files and a manifest that
+``static_url()`` resolves through. Old hashed files are kept so pages
+rendered before a deploy keep working.
+
+Run after :mod:`app.assets.images`:
+
+    python -m app.assets.static_build
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+from app.assets import BUILD_DIR, STATIC_DIR
+
+logger = logging.getLogger("StaticBuild")
+
+DIST_DIR = os.path.join(BUILD_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+
+SOURCE_DIRS = ("css", "js", "images", "build/images")
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt", ".html", ".map")
+HASH_LENGTH = 10
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+
+
+def _sources():
+    for top in SOURCE_DIRS:
+        for root, _dirs, files in os.walk(os.path.join(STATIC_DIR, top)):
+            for name in sorted(files):
+                if name == "manifest.json":
+                    continue
+                yield os.path.relpath(os.path.join(root, name), STATIC_DIR).replace(os.sep, "/")
+
+
+def hashed_name(rel_path: str, digest: str) -> str:
+    stem, ext = os.path.splitext(rel_path)
+    return f"build/dist/{stem.removeprefix('build/')}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def compress(data: bytes) -> dict[str, bytes]:
+    """``{"gzip": ..., "br": ...}`` for the encodings that make ``data`` smaller."""
+    encoded = {}
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        encoded["gzip"] = gz
+    try:
+        import brotli
+    except ImportError:
+        return encoded
+    br = brotli.compress(data, quality=11)
+    if len(br) < len(data):
+        encoded["br"] = br
+    return encoded
+
+
+def _write_compressed(path: str, data: bytes) -> list[str]:
+    """Write ``path.gz`` / ``path.br`` when they are smaller than the original."""
+    written = []
+    for encoding, encoded in compress(data).items():
+        with open(path + SUFFIXES[encoding], "wb") as fh:
+            fh.write(encoded)
+        written.append(encoding)
+    return written
+
+
+def build() -> dict:
+    started = time.perf_counter()
+    files, created = {}, 0
+    for rel_path in _sources():
+        with open(os.path.join(STATIC_DIR, rel_path), "rb") as fh:
+            data = fh.read()
+        target = hashed_name(rel_path, hashlib.sha256(data).hexdigest())
+        files[rel_path] = target
+
+        out_path = os.path.join(STATIC_DIR, target)
+        if os.path.exists(out_path):
+            continue
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        shutil.copyfile(os.path.join(STATIC_DIR, rel_path), out_path)
+        if rel_path.lower().endswith(COMPRESSIBLE):
+            _write_compressed(out_path, data)
+        created += 1
+
+    manifest = {"files": files}
+    os.makedirs(DIST_DIR, exist_ok=True)
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+    logger.info(f"✅ {len(files)} assets ({created} new) in {time.perf_counter() - started:.1f}s")
+    return manifest
+
+
+def main(argv=None):
+    argparse.ArgumentParser(description="Fingerprint and precompress static assets.").parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    build()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# app/assets/static_manifest.py
+"""
+Resolve logical static paths to their fingerprinted copies.
+
+    <link href="{{ static_url('css/main.css') }}" rel="stylesheet">
+
+Paths missing from the manifest (or no build at all) resolve to
+themselves, so a fresh checkout still serves the original files.
+"""
+
+import functools
+import json
+
+from jinja2 import pass_context
+
+from app.assets.static_build import MANIFEST_PATH
+
+
+@functools.lru_cache(maxsize=1)
+def manifest() -> dict:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh).get("files", {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def reload():
+    manifest.cache_clear()
+
+
+def resolve(path: str) -> str:
+    return manifest().get(path, path)
+
+
+@pass_context
+def static_url(context, path: str):
+    return context["request"].url_for("static", path=resolve(path))
+
+
+def register(env):
+    env.globals.update(static_url=static_url)
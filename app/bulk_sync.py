@@ -0,0 +1,173 @@
+# app/bulk_sync.py
+"""
+Set-based seed sync.
+
+The diff between the seed and the database is computed in memory from one
+eager-loaded read; only new or changed projects are written, in a single
+transaction:
+
+- removed projects deleted first, in batches of ``DELETE_BATCH_SIZE`` (a
+  renamed project may reuse the skill row its old name still holds, and
+  ``projects.req_skill_id`` is unique)
+- ``INSERT ... ON CONFLICT`` for ``my_roll``, ``req_skills`` and ``projects``
+  (one multi-row statement each, ``RETURNING`` the ids)
+- image links of the changed projects reconciled by path (see ``image_links``)
+- search documents and skill tag links of the changed projects upserted
+  (see ``search`` / ``skill_tags``)
+
+A run where nothing changed costs just the read.
+"""
+
+import logging
+from typing import Iterable
+
+from sqlalchemy import delete, exists
+from sqlalchemy.orm import Session
+
+from app import image_links, queries, schemas, search, skill_tags, versioning
+from app.models import MyRoll, Projects, ReqSkill, project_image_association
+from app.upsert import insert_for, supports_upsert
+
+logger = logging.getLogger("BulkSync")
+
+DELETE_BATCH_SIZE = 500
+# rows per multi-row INSERT, keeps bind parameters under driver limits
+UPSERT_BATCH_SIZE = 1000
+
+_PROJECT_EXCLUDE = {"my_roll_obj", "req_skill_obj", "images"}
+
+
+def supports_bulk(db: Session) -> bool:
+    return supports_upsert(db)
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _skill_key(skill) -> tuple:
+    return skill.language, skill.frameworks, skill.tools, skill.database
+
+
+def prune_skills(db: Session) -> int:
+    """Delete ``req_skills`` rows no project points at any more (identical stacks share one row)."""
+    return db.execute(
+        delete(ReqSkill).where(~exists().where(Projects.req_skill_id == ReqSkill.req_skill_id))
+    ).rowcount
+
+
+def _snapshot(project: Projects) -> dict:
+    """Comparable view of a stored project, shaped like the seed payload."""
+    row = {field: getattr(project, field) for field in schemas.ProjectBase.model_fields if field not in _PROJECT_EXCLUDE}
+    row["roll"] = (project.my_roll_obj.roll_title, project.my_roll_obj.roll_topic)
+    row["skill"] = _skill_key(project.req_skill_obj)
+    row["images"] = [img.image_path for img in project.images]
+    return row
+
+
+def _desired(project: schemas.ProjectCreate, roll_topics: dict) -> dict:
+    row = project.model_dump(exclude=_PROJECT_EXCLUDE)
+    title = project.my_roll_obj.roll_title
+    row["roll"] = (title, roll_topics[title])
+    row["skill"] = _skill_key(project.req_skill_obj)
+    row["images"] = list(project.images or [])
+    return row
+
+
+def _upsert_changed(db: Session, insert, changed: list[schemas.ProjectCreate], roll_topics: dict):
+    """Upsert roles, skills and projects for ``changed`` and relink their images."""
+    # ---- my_roll ----
+    titles = {p.my_roll_obj.roll_title for p in changed}
+    stmt = insert(MyRoll).values([{"roll_title": t, "roll_topic": roll_topics[t]} for t in titles])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MyRoll.roll_title],
+        set_={"roll_topic": stmt.excluded.roll_topic},
+    ).returning(MyRoll.roll_id, MyRoll.roll_title)
+    roll_ids = {title: roll_id for roll_id, title in db.execute(stmt)}
+
+    # ---- req_skills ----
+    skills = {_skill_key(p.req_skill_obj): p.req_skill_obj.model_dump() for p in changed}
+    skill_ids = {}
+    for batch in _chunks(list(skills.values()), UPSERT_BATCH_SIZE):
+        stmt = insert(ReqSkill).values(batch)
+        # no-op update so RETURNING also yields rows that already existed
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReqSkill.language, ReqSkill.frameworks, ReqSkill.tools, ReqSkill.database],
+            set_={"language": stmt.excluded.language},
+        ).returning(ReqSkill.req_skill_id, ReqSkill.language, ReqSkill.frameworks, ReqSkill.tools, ReqSkill.database)
+        skill_ids.update({tuple(row[1:]): row[0] for row in db.execute(stmt)})
+
+    # ---- projects ----
+    rows = [
+        {
+            **p.model_dump(exclude=_PROJECT_EXCLUDE),
+            "my_roll_id": roll_ids[p.my_roll_obj.roll_title],
+            "req_skill_id": skill_ids[_skill_key(p.req_skill_obj)],
+        }
+        for p in changed
+    ]
+    pro_ids = {}
+    for batch in _chunks(rows, UPSERT_BATCH_SIZE):
+        stmt = insert(Projects).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Projects.project_name],
+            set_={col: stmt.excluded[col] for col in batch[0] if col != "project_name"},
+        ).returning(Projects.pro_id, Projects.project_name)
+        pro_ids.update({name: pro_id for pro_id, name in db.execute(stmt)})
+
+    # ---- images of changed projects (only added/removed links are written) ----
+    image_links.reconcile(db, {pro_ids[p.project_name]: p.images or [] for p in changed})
+
+    # ---- search documents of changed projects ----
+    search.store(db, {pro_ids[p.project_name]: p for p in changed})
+
+    # ---- skill tag links of changed projects ----
+    skill_tags.reconcile(db, {pro_ids[p.project_name]: p.req_skill_obj for p in changed})
+
+
+def sync_projects_bulk(db: Session, seed_projects: list[schemas.ProjectCreate]) -> dict:
+    """
+    Make the projects tables match ``seed_projects``.
+    Returns counts of created / updated / unchanged / deleted projects.
+    """
+    insert = insert_for(db)
+
+    # last entry wins, same as calling create_or_update_project in order
+    seed = {p.project_name: p for p in seed_projects}
+    roll_topics = {p.my_roll_obj.roll_title: p.my_roll_obj.roll_topic for p in seed.values()}
+
+    # ---- diff (one eager-loaded read) ----
+    existing = {p.project_name: p for p in queries.get_projects(db)}
+    changed = [
+        p for name, p in seed.items()
+        if name not in existing or _snapshot(existing[name]) != _desired(p, roll_topics)
+    ]
+    removed_ids = [p.pro_id for name, p in existing.items() if name not in seed]
+    stats = {
+        "created": sum(1 for p in changed if p.project_name not in existing),
+        "updated": sum(1 for p in changed if p.project_name in existing),
+        "unchanged": len(seed) - len(changed),
+        "deleted": len(removed_ids),
+    }
+    if not changed and not removed_ids:
+        return stats
+
+    # ---- removed projects (before the upsert frees their names' skill rows) ----
+    for batch in _chunks(removed_ids, DELETE_BATCH_SIZE):
+        db.execute(delete(project_image_association).where(project_image_association.c.project_id.in_(batch)))
+        search.remove(db, batch)
+        skill_tags.remove(db, batch)
+        db.execute(delete(Projects).where(Projects.pro_id.in_(batch)))
+
+    if changed:
+        _upsert_changed(db, insert, changed, roll_topics)
+
+    # a changed skill stack or a deleted project can leave its old row unused
+    prune_skills(db)
+    skill_tags.prune(db)
+
+    versioning.bump(db)
+    db.commit()
+    logger.info(f"🔁 Bulk seed sync: {stats}")
+    return stats
@@ -0,0 +1,174 @@
+# app/cache.py
+"""
+In-process cache of rendered HTML pages.
+
+Entries are keyed by route + params, expire after a TTL and are evicted
+least-recently-used once the cache is full. Each entry carries tags so the
+crud write paths can drop exactly the pages that show project data
+(``PROJECTS``) and leave static pages such as ``/about`` alone.
+
+A page rendered while an invalidation ran may show the old data, so
+``set`` takes the :meth:`PageCache.generation` read before rendering and
+drops the page if anything was invalidated since.
+"""
+
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, StreamingResponse
+
+# Tag for every page rendered from the projects tables.
+PROJECTS = "projects"
+
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "300"))
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "256"))
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    status_code: int
+    media_type: str
+
+    def to_response(self) -> HTMLResponse:
+        return HTMLResponse(
+            content=self.body,
+            status_code=self.status_code,
+            media_type=self.media_type,
+            headers={"X-Cache": "HIT"},
+        )
+
+
+class _Entry(NamedTuple):
+    page: CachedPage
+    expires_at: float
+    tags: frozenset
+
+
+class PageCache:
+    """Thread-safe TTL + LRU cache with tag-based invalidation."""
+
+    def __init__(self, max_entries: int = PAGE_CACHE_SIZE, ttl: float = PAGE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[CachedPage]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.page
+
+    def generation(self) -> int:
+        """Read before rendering a page; pass it to :meth:`set`."""
+        with self._lock:
+            return self._generation
+
+    def set(self, key: tuple, page: CachedPage, tags=(), *, generation: int) -> bool:
+        """Store ``page`` unless an invalidation ran after ``generation`` was read."""
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._entries[key] = _Entry(page, time.monotonic() + self.ttl, frozenset(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, tag: str) -> int:
+        """Drop every entry carrying ``tag``; returns how many were dropped."""
+        with self._lock:
+            # pages being rendered right now may predate the write
+            self._generation += 1
+            stale = [key for key, entry in self._entries.items() if tag in entry.tags]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+            }
+
+
+page_cache = PageCache()
+
+
+def page_key(request: Request, name: str) -> tuple:
+    """Route name + path params + query, per host (templates emit absolute URLs)."""
+    return (
+        name,
+        tuple(sorted(request.path_params.items())),
+        request.url.query,
+        str(request.base_url),
+    )
+
+
+async def _store_when_sent(chunks, key: tuple, response: StreamingResponse, tags, generation: int):
+    """
+    Pass a streamed body through, caching it once the last chunk has gone
+    out, unless a write invalidated the cache while it was streaming.
+    """
+    body = []
+    async for chunk in chunks:
+        body.append(chunk if isinstance(chunk, bytes) else chunk.encode(response.charset))
+        yield chunk
+    page = CachedPage(b"".join(body), response.status_code, response.media_type)
+    page_cache.set(key, page, tags, generation=generation)
+
+
+def cached_page(*tags: str):
+    """
+    Serve a route from ``page_cache``; on a hit the endpoint body never runs,
+    so no query is issued and no template is rendered. Streamed pages are
+    cached once fully sent.
+    """
+
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(request: Request, **kwargs):
+            key = page_key(request, endpoint.__name__)
+            page = page_cache.get(key)
+            if page is not None:
+                return page.to_response()
+
+            generation = page_cache.generation()
+            response = await endpoint(request=request, **kwargs)
+            if response.status_code == 200:
+                if isinstance(response, StreamingResponse):
+                    response.body_iterator = _store_when_sent(
+                        response.body_iterator, key, response, tags, generation,
+                    )
+                else:
+                    page = CachedPage(response.body, response.status_code, response.media_type)
+                    page_cache.set(key, page, tags, generation=generation)
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
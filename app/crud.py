@@ -1,5 +1,10 @@
+
 from sqlalchemy.orm import Session
-from app import schemas, models
+from app import schemas, models, queries, search, skill_tags, snapshot, versioning, bulk_sync, image_links
+from app.cache import PROJECTS, page_cache
+from app.read_model import read_model
+from app.serialization import project_json
+from app.versioning import data_version
 from app.models import Projects, ProjectImage, ReqSkill, MyRoll
 
 
@@ -7,14 +12,24 @@ from app.models import Projects, ProjectImage, ReqSkill, MyRoll
 #       PROJECTS
 # ---------------------------
 
+def _after_write(db: Session):
+    """Drop cached project pages/JSON/search/read model, pick up the new data version, re-render the snapshot."""
+    page_cache.invalidate(PROJECTS)
+    project_json.invalidate()
+    search.fallback_index.invalidate()
+    read_model.invalidate()
+    data_version.refresh(db)
+    snapshot.regenerator.schedule()
+
+
 def get_projects(db: Session):
-    """Return all projects."""
-    return db.query(Projects).order_by(Projects.pro_id.desc()).all()
+    """Return all projects (graph eagerly loaded)."""
+    return queries.get_projects(db)
 
 
 def get_projects_by_id(db: Session, pro_id: int):
-    """Return by id projects."""
-    return db.query(Projects).filter(Projects.pro_id == pro_id).first()
+    """Return by id projects (graph eagerly loaded)."""
+    return queries.get_project_by_id(db, pro_id)
 
 
 def get_project_by_name(db: Session, name: str):
@@ -39,17 +54,22 @@ def create_or_update_project(db: Session, project: schemas.ProjectCreate):
         ).items():
             setattr(existing, field, value)
 
+        previous_skill_id = existing.req_skill_id
         existing.my_roll_id = my_roll.roll_id
         existing.req_skill_id = req_skill.req_skill_id
 
-        # UPDATE IMAGES
-        existing.images.clear()
-        for img_path in project.images:
-            img = models.ProjectImage(image_path=img_path)
-            existing.images.append(img)
+        # UPDATE IMAGES (only added / removed links are written)
+        image_links.reconcile(db, {existing.pro_id: project.images or []})
+        search.store(db, {existing.pro_id: project})
+        skill_tags.reconcile(db, {existing.pro_id: project.req_skill_obj})
+        if previous_skill_id != req_skill.req_skill_id:
+            db.flush()
+            bulk_sync.prune_skills(db)
 
+        versioning.bump(db)
         db.commit()
         db.refresh(existing)
+        _after_write(db)
         return existing
 
     else:
@@ -62,14 +82,18 @@ def create_or_update_project(db: Session, project: schemas.ProjectCreate):
             req_skill_id=req_skill.req_skill_id,
         )
 
+        db.add(new_proj)
+        db.flush()
+
         # ADD IMAGES
-        for img_path in project.images:
-            img = models.ProjectImage(image_path=img_path)
-            new_proj.images.append(img)
+        image_links.reconcile(db, {new_proj.pro_id: project.images or []})
+        search.store(db, {new_proj.pro_id: project})
+        skill_tags.reconcile(db, {new_proj.pro_id: project.req_skill_obj})
 
-        db.add(new_proj)
+        versioning.bump(db)
         db.commit()
         db.refresh(new_proj)
+        _after_write(db)
         return new_proj
 
 
@@ -79,18 +103,38 @@ def sync_projects_with_seed(db: Session, seed_projects: list[schemas.ProjectCrea
     - Create new projects
     - Update existing ones
     - Delete projects missing in seed
+    Uses the set-based bulk sync where the dialect supports ON CONFLICT.
+    """
+    if bulk_sync.supports_bulk(db):
+        bulk_sync.sync_projects_bulk(db, seed_projects)
+    else:
+        sync_projects_one_by_one(db, seed_projects)
+    _after_write(db)
+
+
+def sync_projects_one_by_one(db: Session, seed_projects: list[schemas.ProjectCreate]):
+    """
+    Row-by-row sync through create_or_update_project
+    (fallback for dialects without ON CONFLICT).
     """
     existing_projects = {p.project_name: p for p in db.query(Projects).all()}
     seed_names = {proj.project_name for proj in seed_projects}
 
+    # Delete removed projects first: a renamed project may reuse its old name's skill row
+    for name, project in existing_projects.items():
+        if name not in seed_names:
+            search.remove(db, [project.pro_id])
+            skill_tags.remove(db, [project.pro_id])
+            db.delete(project)
+    db.flush()
+
     # Create or update
     for proj in seed_projects:
         create_or_update_project(db, proj)
 
-    # Delete removed projects
-    for name, project in existing_projects.items():
-        if name not in seed_names:
-            db.delete(project)
+    bulk_sync.prune_skills(db)
+    skill_tags.prune(db)
+    versioning.bump(db)
     db.commit()
 
 
@@ -102,18 +146,17 @@ def get_or_create_my_roll(db: Session, roll_data: schemas.MyRollBase):
     """
     Get or create a MyRoll entry.
     Updates roll_topic if MyRoll exists.
+    Only flushed: the caller commits it with the project write and its version bump.
     """
     obj = db.query(MyRoll).filter_by(roll_title=roll_data.roll_title).first()
     if obj:
         obj.roll_topic = roll_data.roll_topic
-        db.commit()
-        db.refresh(obj)
+        db.flush()
         return obj
 
     new_obj = MyRoll(**roll_data.model_dump())
     db.add(new_obj)
-    db.commit()
-    db.refresh(new_obj)
+    db.flush()
     return new_obj
 
 
@@ -124,6 +167,7 @@ def get_or_create_my_roll(db: Session, roll_data: schemas.MyRollBase):
 def get_or_create_req_skill(db: Session, skill_data: schemas.ReqSkillBase):
     """
     Get or create a ReqSkill entry.
+    Only flushed: the caller commits it with the project write and its version bump.
     """
     obj = db.query(ReqSkill).filter_by(
         language=skill_data.language,
@@ -136,8 +180,7 @@ def get_or_create_req_skill(db: Session, skill_data: schemas.ReqSkillBase):
 
     new_obj = ReqSkill(**skill_data.model_dump())
     db.add(new_obj)
-    db.commit()
-    db.refresh(new_obj)
+    db.flush()
     return new_obj
 
 
@@ -154,6 +197,13 @@ def delete_project(db: Session, pro_id: int) -> bool:
     if not project:
         return False
 
+    search.remove(db, [pro_id])
+    skill_tags.remove(db, [pro_id])
     db.delete(project)
+    db.flush()
+    bulk_sync.prune_skills(db)
+    skill_tags.prune(db)
+    versioning.bump(db)
     db.commit()
+    _after_write(db)
     return True
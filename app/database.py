@@ -1,51 +1,123 @@
 # app/database.py
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 import os
+import threading
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL is not set")
-
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True
-)
+Base = declarative_base()
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
 
-Base = declarative_base()
+# ---------------------------
+#       ASYNC ENGINE
+# ---------------------------
+
+# sync driver → async driver used by the ``async def`` routes
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str):
+    """Map a sync DATABASE_URL onto its async driver."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    query = dict(parsed.query)
+    if driver == "postgresql+asyncpg" and "sslmode" in query:
+        # asyncpg spells libpq's ``sslmode`` as ``ssl``
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(drivername=driver, query=query)
+
+
+# ---------------------------
+#       LAZY ENGINES
+# ---------------------------
+# ``engine``, ``async_engine``, ``SessionLocal`` and ``AsyncSessionLocal``
+# are built on first access (module ``__getattr__``), so importing the app
+# loads no DB driver and a missing DATABASE_URL fails the first query
+# instead of the import. Import the module (``from app import database``)
+# and read ``database.engine`` at call time to keep it lazy.
+
+LAZY_NAMES = ("engine", "async_engine", "SessionLocal", "AsyncSessionLocal")
+_init_lock = threading.Lock()
+
+
+def _create_engines():
+    # pool sizing and instrumentation load with the first engine, not the import
+    from app import pooling
+    from app.instrumentation import instrument_engine
+
+    with _init_lock:
+        if "engine" in globals():
+            return
+        if not DATABASE_URL:
+            raise RuntimeError("DATABASE_URL is not set")
+
+        # sizes from the connection budget, see app/pooling.py
+        url = make_url(DATABASE_URL)
+        engine = create_engine(url, **pooling.engine_options(url))
+        async_url = to_async_url(DATABASE_URL)
+        async_engine = create_async_engine(async_url, **pooling.engine_options(async_url, is_async=True))
+
+        # per-request query count / DB time (Server-Timing, /metrics) and the slow-query log
+        instrument_engine(engine)
+        instrument_engine(async_engine.sync_engine)
+        # pool occupancy / checkout wait / invalidations on /metrics
+        pooling.instrument_pool(engine, "sync")
+        pooling.instrument_pool(async_engine.sync_engine, "async")
+
+        globals().update(
+            async_engine=async_engine,
+            SessionLocal=sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=engine
+            ),
+            AsyncSessionLocal=async_sessionmaker(
+                bind=async_engine,
+                class_=AsyncSession,
+                autoflush=False,
+                # ORM objects are handed to templates after the session closes
+                expire_on_commit=False,
+            ),
+        )
+        # last: its presence marks the module as initialised
+        globals()["engine"] = engine
+
+
+def __getattr__(name: str):
+    if name in LAZY_NAMES:
+        _create_engines()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db():
-    db = SessionLocal()
+    db = __getattr__("SessionLocal")()
     try:
         yield db
     finally:
         db.close()
 
 
+async def get_async_db():
+    async with __getattr__("AsyncSessionLocal")() as db:
+        yield db
+
+
 def init_db():
     from app import models
-    from app.seed_data import seed_all_data
-
-    Base.metadata.create_all(bind=engine)
+    from app.startup import run_seed
 
-    db = SessionLocal()
-    try:
-        seed_all_data(db)
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        print(f"[ERROR] Seeding data failed: {e}")
-    finally:
-        db.close()
+    Base.metadata.create_all(bind=__getattr__("engine"))
+    run_seed()
 
 
 
@@ -0,0 +1,154 @@
+# app/http_cache.py
+"""
+ETag / Last-Modified for the app's GET routes.
+
+A page is a pure function of the project data, the templates/assets and
+the URL, so its validator can be computed *before* the route runs:
+
+    ETag = hash(data version, template fingerprint, day, host, path, query)
+
+``If-None-Match`` / ``If-Modified-Since`` hits are answered with 304 by
+this middleware — no DB query, no template render. The data version
+comes from the in-memory watcher (``app.versioning``); until it has been
+read (lifespan not run) no validators are emitted.
+
+The ETag is strong for identity bodies only: gzip/br snapshot bodies
+(``app.snapshot``) get ``W/"..."``, since their bytes differ from the
+identity body (RFC 9110 §8.8.3). Revalidation uses the weak comparison,
+so either form still gets a 304.
+"""
+
+import functools
+import hashlib
+import os
+from datetime import date, datetime, time, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.assets import bundle, critical_build, images, static_build
+from app.templating import TEMPLATES_DIR
+from app.versioning import data_version
+
+# static files carry their own validators; counters change on every call
+EXCLUDED_PREFIXES = ("/static", "/api/cache", "/metrics")
+
+
+@functools.lru_cache(maxsize=1)
+def template_fingerprint() -> tuple[str, datetime]:
+    """Hash and newest mtime of every template and asset manifest."""
+    digest = hashlib.sha256()
+    newest = 0.0
+    paths = [
+        os.path.join(root, name)
+        for root, _dirs, files in os.walk(TEMPLATES_DIR)
+        for name in files
+    ] + [images.MANIFEST_PATH, static_build.MANIFEST_PATH, bundle.MANIFEST_PATH, critical_build.MANIFEST_PATH]
+    for path in sorted(paths):
+        try:
+            with open(path, "rb") as fh:
+                digest.update(path.encode() + b"\0" + fh.read())
+            newest = max(newest, os.path.getmtime(path))
+        except FileNotFoundError:
+            continue
+    return digest.hexdigest(), datetime.fromtimestamp(int(newest), tz=timezone.utc)
+
+
+def validators(scope: Scope) -> Optional[tuple[str, datetime]]:
+    """``(etag, last_modified)`` for this request, or None if not known yet."""
+    version = data_version.version
+    if version is None:
+        return None
+    fingerprint, templates_modified = template_fingerprint()
+    today = date.today()
+    headers = Headers(scope=scope)
+    key = "\0".join((
+        str(version),
+        fingerprint,
+        today.isoformat(),  # /about renders the age
+        headers.get("host", ""),
+        scope.get("root_path", "") + scope["path"],
+        scope.get("query_string", b"").decode("latin-1"),
+    ))
+    etag = '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+    # a new day changes the ETag, so it moves Last-Modified too: at least
+    # midnight of ``today`` (server-local, which is UTC on the deploy host)
+    last_modified = max(templates_modified, datetime.combine(today, time.min).astimezone(timezone.utc))
+    if data_version.updated_at is not None:
+        updated_at = data_version.updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        last_modified = max(last_modified, updated_at.replace(microsecond=0))
+    return etag, last_modified
+
+
+def is_not_modified(request_headers: Headers, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since (RFC 9110 §13.2.2)
+        # no "*": it would answer 304 for paths the app may not serve at all
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ConditionalGetMiddleware:
+    """Adds validators to 200 GET responses and answers revalidations with 304."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or scope["path"].startswith(EXCLUDED_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        known = validators(scope)
+        if known is None:
+            await self.app(scope, receive, send)
+            return
+
+        etag, last_modified = known
+        validator_headers = {
+            "etag": etag,
+            "last-modified": format_datetime(last_modified, usegmt=True),
+            # let browsers keep the page but revalidate every time
+            "cache-control": "no-cache",
+        }
+
+        request_headers = Headers(scope=scope)
+        if is_not_modified(request_headers, etag, last_modified):
+            if f"W/{etag}" in request_headers.get("if-none-match", ""):
+                validator_headers["etag"] = f"W/{etag}"
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(k.encode(), v.encode()) for k, v in validator_headers.items()],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                for name, value in validator_headers.items():
+                    if name not in headers:
+                        headers[name] = value
+                if headers.get("content-encoding", "identity") != "identity" and headers["etag"] == etag:
+                    headers["etag"] = f"W/{etag}"
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
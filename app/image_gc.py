@@ -0,0 +1,66 @@
+# app/image_gc.py
+"""
+Garbage-collect ``project_images`` rows no project links to any more.
+
+    python -m app.image_gc [--batch-size 500] [--dry-run]
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.orm import Session
+
+from app.models import ProjectImage, project_image_association as links_table
+
+logger = logging.getLogger("ImageGC")
+
+BATCH_SIZE = 500
+
+
+def _unreferenced():
+    return ~exists().where(links_table.c.image_id == ProjectImage.image_id)
+
+
+def count_orphan_images(db: Session) -> int:
+    return db.scalar(select(func.count()).select_from(ProjectImage).where(_unreferenced()))
+
+
+def collect_orphan_images(db: Session, batch_size: int = BATCH_SIZE) -> int:
+    """Delete unreferenced images, one committed batch at a time. Returns rows deleted."""
+    deleted = 0
+    while True:
+        batch = db.scalars(
+            select(ProjectImage.image_id).where(_unreferenced()).order_by(ProjectImage.image_id).limit(batch_size)
+        ).all()
+        if not batch:
+            return deleted
+        # re-check in the DELETE: a writer may have linked one of them meanwhile
+        deleted += db.execute(
+            delete(ProjectImage).where(ProjectImage.image_id.in_(batch), _unreferenced())
+        ).rowcount
+        db.commit()
+        logger.info(f"🧹 Deleted {deleted} orphan images so far")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delete project images no project links to.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="only count orphans")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            logger.info(f"🔍 {count_orphan_images(db)} orphan images")
+        else:
+            logger.info(f"✅ Deleted {collect_orphan_images(db, args.batch_size)} orphan images")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# app/image_links.py
+"""
+Diff-based reconciliation of project ↔ image links.
+
+``project_images`` holds one row per distinct path (unique index), shared
+by every project that shows it. Reconciling a project's image list only
+writes what changed:
+
+- missing paths are inserted once (``ON CONFLICT DO NOTHING``)
+- links no longer wanted are deleted
+- new links are inserted, and links whose display position moved are updated
+
+Images left without any link are removed later by ``app.image_gc``.
+"""
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.models import ProjectImage, project_image_association as links_table
+from app.upsert import insert_for, supports_upsert
+
+BATCH_SIZE = 1000
+
+
+def _chunks(items: list, size: int = BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def ensure_images(db: Session, paths) -> dict[str, int]:
+    """Return ``{path: image_id}``, inserting rows for paths not stored yet."""
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return {}
+
+    ids = {}
+    for batch in _chunks(paths):
+        ids.update({path: image_id for image_id, path in db.execute(
+            select(ProjectImage.image_id, ProjectImage.image_path).where(ProjectImage.image_path.in_(batch))
+        )})
+    missing = [path for path in paths if path not in ids]
+    if not missing:
+        return ids
+
+    if supports_upsert(db):
+        insert = insert_for(db)
+        for batch in _chunks(missing):
+            stmt = insert(ProjectImage).values([{"image_path": path} for path in batch])
+            # a concurrent writer may have inserted the same path meanwhile
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ProjectImage.image_path],
+                set_={"image_path": stmt.excluded.image_path},
+            ).returning(ProjectImage.image_id, ProjectImage.image_path)
+            ids.update({path: image_id for image_id, path in db.execute(stmt)})
+    else:
+        new_rows = [ProjectImage(image_path=path) for path in missing]
+        db.add_all(new_rows)
+        db.flush()
+        ids.update({row.image_path: row.image_id for row in new_rows})
+    return ids
+
+
+def reconcile(db: Session, wanted: dict[int, list[str]]) -> dict:
+    """
+    Make each project's links match ``wanted`` (``{pro_id: [path, ...]}``,
+    in display order). Returns counts of added / removed / moved links.
+    """
+    if not wanted:
+        return {"added": 0, "removed": 0, "moved": 0}
+
+    image_ids = ensure_images(db, (path for paths in wanted.values() for path in paths))
+    desired = {
+        (pro_id, image_ids[path]): position
+        for pro_id, paths in wanted.items()
+        for position, path in enumerate(dict.fromkeys(paths))
+    }
+
+    current = {}
+    for batch in _chunks(list(wanted)):
+        current.update({
+            (pro_id, image_id): position
+            for pro_id, image_id, position in db.execute(
+                select(links_table.c.project_id, links_table.c.image_id, links_table.c.position)
+                .where(links_table.c.project_id.in_(batch))
+            )
+        })
+
+    removed = [key for key in current if key not in desired]
+    added = [key for key in desired if key not in current]
+    moved = [key for key in desired if key in current and current[key] != desired[key]]
+
+    for batch in _chunks(removed):
+        db.execute(delete(links_table).where(
+            tuple_(links_table.c.project_id, links_table.c.image_id).in_(batch)
+        ))
+    if added:
+        db.execute(links_table.insert(), [
+            {"project_id": pro_id, "image_id": image_id, "position": desired[(pro_id, image_id)]}
+            for pro_id, image_id in added
+        ])
+    for pro_id, image_id in moved:
+        db.execute(
+            update(links_table)
+            .where(links_table.c.project_id == pro_id, links_table.c.image_id == image_id)
+            .values(position=desired[(pro_id, image_id)])
+        )
+    return {"added": len(added), "removed": len(removed), "moved": len(moved)}
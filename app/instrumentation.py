@@ -0,0 +1,312 @@
+# app/instrumentation.py
+"""
+Per-request timing: SQL statements, DB time, template render time.
+
+- SQLAlchemy ``before/after_cursor_execute`` hooks on both engines add each
+  statement's duration to the current request's :class:`RequestStats`
+  (a contextvar, so it follows the request into the threadpool and into
+  the async engine's greenlet).
+- ``Jinja2`` templates are timed by swapping the environment's
+  ``template_class`` (see :func:`instrument_templates`).
+- :class:`InstrumentationMiddleware` emits a ``Server-Timing`` header and
+  feeds the Prometheus histograms served at ``/metrics``. A streamed page
+  sends its headers before rendering, so only ``/metrics`` has its render time.
+
+Statements slower than ``SLOW_QUERY_MS`` are logged with a fingerprint:
+the SQL with literals and parameters replaced, so every execution of the
+same query shape shares one id.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from jinja2 import Environment
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("SlowQuery")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1") == "1"
+
+# not worth a histogram series of their own
+UNINSTRUMENTED_PREFIXES = ("/static", "/metrics")
+
+
+@dataclass
+class RequestStats:
+    db_count: int = 0
+    db_seconds: float = 0.0
+    render_seconds: float = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+# ---------------------------
+#       PROMETHEUS
+# ---------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Minimal thread-safe Prometheus histogram with labels."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, list] = {}  # labels → [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(label_values, [0] * len(self.buckets) + [0.0, 0])
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items())
+            series = [(labels, list(values)) for labels, values in series]
+        for label_values, values in series:
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{base}}} {values[-2]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {values[-1]}")
+        return lines
+
+
+class Counter:
+    """Minimal thread-safe Prometheus counter with labels."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            lines.append(f"{self.name}_total{{{base}}} {value:g}")
+        return lines
+
+
+class Gauge:
+    """Prometheus gauge read at scrape time: ``collect()`` → ``{label values: value}``."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...], collect: Callable[[], dict[tuple, float]]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for label_values, value in sorted(self.collect().items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{base}}} {value:g}")
+        return lines
+
+
+_SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+REQUEST_SECONDS = Histogram(
+    "portfolio_http_request_duration_seconds", "Time to produce the response.",
+    ("route", "method", "status"), _SECONDS,
+)
+DB_QUERIES = Histogram(
+    "portfolio_db_queries_per_request", "SQL statements executed per request.",
+    ("route",), (0, 1, 2, 4, 8, 16, 32, 64),
+)
+DB_SECONDS = Histogram(
+    "portfolio_db_duration_seconds", "Time spent in SQL per request.",
+    ("route",), _SECONDS,
+)
+RENDER_SECONDS = Histogram(
+    "portfolio_template_render_seconds", "Time spent rendering Jinja templates per request.",
+    ("route",), _SECONDS,
+)
+SLOW_QUERIES = Counter(
+    "portfolio_slow_queries", "Statements slower than SLOW_QUERY_MS, by fingerprint.",
+    ("fingerprint",),
+)
+
+METRICS = [REQUEST_SECONDS, DB_QUERIES, DB_SECONDS, RENDER_SECONDS, SLOW_QUERIES]
+
+
+def register(*metrics):
+    """Add metrics defined elsewhere (e.g. :mod:`app.pooling`) to ``/metrics``."""
+    METRICS.extend(m for m in metrics if m not in METRICS)
+
+
+def render_metrics() -> str:
+    """Every metric in Prometheus text exposition format."""
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+# ---------------------------
+#       SQL
+# ---------------------------
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+# ``(?<!:)`` keeps ``::regconfig`` casts intact
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|(?<!:):\w+")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL with literals/params → ``?``, value lists → ``(...)``, whitespace collapsed."""
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    sql = _ROWS.sub(r"\1", sql)  # multi-row VALUES
+    return _SPACE.sub(" ", sql).strip()
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize_sql(statement).encode()).hexdigest()[:12]
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.db_count += 1
+        stats.db_seconds += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        fp = fingerprint(statement)
+        SLOW_QUERIES.inc(fp)
+        logger.warning(f"🐢 {elapsed * 1000:.1f} ms [{fp}] {normalize_sql(statement)[:500]}")
+
+
+def instrument_engine(engine: Engine):
+    """Attach the timing hooks to ``engine`` (a sync ``Engine``; pass ``async_engine.sync_engine``)."""
+    if not event.contains(engine, "before_cursor_execute", _before_execute):
+        event.listen(engine, "before_cursor_execute", _before_execute)
+        event.listen(engine, "after_cursor_execute", _after_execute)
+
+
+# ---------------------------
+#       TEMPLATES
+# ---------------------------
+
+def record_render(seconds: float):
+    """Add render time measured outside ``render()`` (streamed templates) to the current request."""
+    stats = _current.get()
+    if stats is not None:
+        stats.render_seconds += seconds
+
+
+def instrument_templates(env: Environment):
+    """Time every top-level ``render()``. Must run before templates are loaded."""
+    base = env.template_class
+    if getattr(base, "_instrumented", False):
+        return
+
+    class TimedTemplate(base):
+        _instrumented = True
+
+        def render(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return super().render(*args, **kwargs)
+            finally:
+                stats = _current.get()
+                if stats is not None:
+                    stats.render_seconds += time.perf_counter() - started
+
+    env.template_class = TimedTemplate
+    if env.cache is not None:
+        env.cache.clear()
+
+
+# ---------------------------
+#       MIDDLEWARE
+# ---------------------------
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None and "snapshot_route" in scope:
+        # answered by app.snapshot before routing
+        return f"{scope['snapshot_route']} (snapshot)"
+    return getattr(route, "path", None) or "unmatched"
+
+
+class InstrumentationMiddleware:
+    """``Server-Timing`` header plus histograms for every HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(UNINSTRUMENTED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    MutableHeaders(scope=message).append("Server-Timing", ", ".join((
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_count} queries"',
+                        f"render;dur={stats.render_seconds * 1000:.1f}",
+                        f"app;dur={total_ms:.1f}",
+                    )))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = _route_label(scope)
+            REQUEST_SECONDS.observe(time.perf_counter() - started, route, scope["method"], str(status))
+            DB_QUERIES.observe(stats.db_count, route)
+            DB_SECONDS.observe(stats.db_seconds, route)
+            RENDER_SECONDS.observe(stats.render_seconds, route)
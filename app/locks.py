@@ -0,0 +1,112 @@
+# app/locks.py
+"""
+Cross-process named locks.
+
+Postgres uses a session-level advisory lock held on a dedicated
+connection. Other backends (SQLite in local runs), and Postgres behind a
+transaction pooler, fall back to a row in ``app_locks``; rows older
+than ``stale_after`` seconds are treated as left behind by a crashed
+process and taken over.
+"""
+
+import hashlib
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import Connection, delete, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import AppLock
+from app.pooling import EXTERNAL_POOLER
+
+POLL_SECONDS = 0.25
+
+
+def advisory_key(name: str) -> int:
+    """Stable signed 64-bit key for ``pg_advisory_lock``."""
+    return int.from_bytes(hashlib.sha1(name.encode()).digest()[:8], "big", signed=True)
+
+
+class NamedLock:
+    """Non-blocking lock shared by every process using the same database."""
+
+    def __init__(self, name: str, bind: Engine, stale_after: float = 300):
+        self.name = name
+        self.bind = bind
+        self.stale_after = stale_after
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._conn: Optional[Connection] = None
+        self._held = False
+
+    @property
+    def _advisory(self) -> bool:
+        # a transaction pooler may run the unlock on another server session
+        return self.bind.dialect.name == "postgresql" and not EXTERNAL_POOLER
+
+    def acquire(self) -> bool:
+        """Try once; True if this process now holds the lock."""
+        if self._advisory:
+            self._conn = self.bind.connect()
+            self._held = bool(self._conn.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": advisory_key(self.name)}
+            ))
+            self._conn.commit()
+            if not self._held:
+                self._conn.close()
+                self._conn = None
+            return self._held
+
+        with Session(self.bind) as db:
+            for _ in range(2):
+                try:
+                    db.add(AppLock(name=self.name, owner=self.owner, acquired_at=datetime.now(timezone.utc)))
+                    db.commit()
+                    self._held = True
+                    return True
+                except IntegrityError:
+                    db.rollback()
+                cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.stale_after)
+                taken_over = db.execute(
+                    delete(AppLock).where(AppLock.name == self.name, AppLock.acquired_at < cutoff)
+                ).rowcount
+                db.commit()
+                if not taken_over:
+                    break
+        return False
+
+    def release(self):
+        if not self._held:
+            return
+        self._held = False
+        if self._advisory:
+            try:
+                self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": advisory_key(self.name)})
+                self._conn.commit()
+                self._conn.close()
+            except Exception:
+                # never hand a connection that may still hold the lock back to the pool
+                self._conn.invalidate()
+                raise
+            finally:
+                self._conn = None
+            return
+
+        with Session(self.bind) as db:
+            db.execute(delete(AppLock).where(AppLock.name == self.name, AppLock.owner == self.owner))
+            db.commit()
+
+    def wait_released(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for the current holder to finish."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.acquire():
+                self.release()
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(POLL_SECONDS)
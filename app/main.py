@@ -4,27 +4,36 @@ main.py
 FastAPI Portfolio App for Mohammad Sajid Vagh
 """
 
+import asyncio
 import os
 import logging
+import time
 from datetime import date, datetime
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, Depends
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from typing import Optional
+
+from fastapi import FastAPI, Request, Response, Depends, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.database import Base, engine, SessionLocal
-from app import crud, schemas, seed_data
-
-# ==========================================================
-#                DATABASE INIT
-# ==========================================================
-
-Base.metadata.create_all(bind=engine)
+from app.database import Base, get_async_db
+from app import database, queries, schemas
+from app.assets.critical import PreloadLinkMiddleware
+from app.assets.serving import PrecompressedStaticFiles
+from app.templating import templates, precompile, stream_template
+from app.cache import PROJECTS, cached_page, page_cache
+from app.http_cache import ConditionalGetMiddleware
+from app.instrumentation import InstrumentationMiddleware, render_metrics
+from app.models import SKILL_KINDS
+from app.read_model import read_model
+from app.serialization import JsonPayload, encode_projects, encode_rows, project_json
+from app.snapshot import SnapshotMiddleware, regenerator
+from app.versioning import data_version
 
 # ==========================================================
 #                LOGGING SETUP
@@ -36,31 +45,97 @@ logging.basicConfig(
 )
 logger = logging.getLogger("PortfolioApp")
 
-
 # ==========================================================
-#                LIFESPAN HANDLER
+#                STARTUP MODE
 # ==========================================================
+# full: create missing tables, sync the seed data, precompile templates and
+#       start the data-version watcher before accepting requests.
+# fast: the schema comes from ``alembic upgrade head`` (run at deploy time,
+#       see render.yaml); the server accepts requests immediately and does
+#       the rest in the background. Nothing touches the DB at import time.
 
-@asynccontextmanager
-async def lifespan(_app: FastAPI):
-    logger.info("🚀 Running startup seeding...")
-    db = SessionLocal()
-    try:
-        projects = seed_data.get_seed_projects()
-        crud.sync_projects_with_seed(db, projects)
-        logger.info("✅ Database seeded successfully!")
-    except Exception as e:
-        logger.error(f"❌ Seeding failed: {e}")
-    finally:
-        db.close()
+STARTUP_MODE = os.getenv("STARTUP_MODE", "full")
+FAST_STARTUP = STARTUP_MODE == "fast"
 
-    # Log registered routes
-    logger.info("📜 Registered Routes:")
+
+def log_routes(_app: FastAPI):
+    # one line per route is noise on every cold start in fast mode
+    level = logging.DEBUG if FAST_STARTUP else logging.INFO
+    logger.info(f"📜 {len(_app.routes)} routes registered")
     for route in _app.routes:
         if isinstance(route, APIRoute):
             methods = ', '.join(route.methods)
-            logger.info(f"➡️ Route registered: {route.path} | methods=[{methods}] | name={route.name}")
+            logger.log(level, f"➡️ Route registered: {route.path} | methods=[{methods}] | name={route.name}")
+
+
+def run_startup(_app: FastAPI):
+    """Schema, data-version watcher, seed sync, template precompile (blocking)."""
+    # seed data + DB locks: only needed here
+    from app import startup
+
+    if not FAST_STARTUP:
+        Base.metadata.create_all(bind=database.engine)
+
+    # Writes from other workers bump data_version → drop our cached pages/JSON
+    data_version.start(database.engine)
+
+    # Only one worker syncs the seed data; the rest wait briefly or skip
+    startup.run_seed()
+
+    # Load every template now (from the shared bytecode cache when warm)
+    precompile(templates.env)
+
+    # First request shouldn't pay for loading the read model
+    read_model.get()
+
+    log_routes(_app)
+
+
+async def run_startup_in_background(_app: FastAPI):
+    started = time.perf_counter()
+    try:
+        await run_in_threadpool(run_startup, _app)
+    except Exception as e:
+        logger.exception(f"❌ Deferred startup failed: {e}")
+    else:
+        logger.info(f"✅ Deferred startup finished in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+# ==========================================================
+#                LIFESPAN HANDLER
+# ==========================================================
+
+def _invalidate_search_index(_version: int):
+    # search, crud and the seed/startup code are imported where they are used
+    from app import search
+
+    search.fallback_index.invalidate()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    data_version.subscribe(lambda _version: page_cache.invalidate(PROJECTS))
+    data_version.subscribe(lambda _version: project_json.invalidate())
+    data_version.subscribe(_invalidate_search_index)
+    data_version.subscribe(lambda _version: read_model.invalidate())
+
+    # re-render snapshot pages after writes (only while a snapshot exists)
+    regenerator.start(_app)
+
+    if FAST_STARTUP:
+        # start serving now; the first requests may see pre-seed data
+        _app.state.startup_task = asyncio.create_task(run_startup_in_background(_app))
+    else:
+        _app.state.startup_task = None
+        await run_in_threadpool(run_startup, _app)
+    # templates may have changed since the snapshot was taken
+    regenerator.schedule()
     yield
+    await regenerator.stop()
+    if _app.state.startup_task is not None:
+        # can't interrupt the thread; let the seed finish and release its lock
+        await _app.state.startup_task
+    data_version.stop()
     logger.info("🛑 Application shutting down...")
 
 
@@ -80,18 +155,32 @@ app = FastAPI(
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(BASE_DIR, "static")
-TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
 
-app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
-templates = Jinja2Templates(directory=TEMPLATES_DIR)
+# serves build/dist's .br/.gz siblings and marks fingerprinted files immutable;
+# ``templates`` (Jinja env + bytecode cache) lives in app/templating.py
+app.mount("/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static")
+
+# pages from ``python -m app.snapshot`` while they match the data version
+app.add_middleware(SnapshotMiddleware)
+# Link: rel=preload for the stylesheets/scripts, on rendered and snapshot pages
+app.add_middleware(PreloadLinkMiddleware)
+# ETag/Last-Modified from the data version; revalidations get a 304 without
+# touching the DB or the templates
+app.add_middleware(ConditionalGetMiddleware)
+# outermost: Server-Timing (db / render / app) and the /metrics histograms
+app.add_middleware(InstrumentationMiddleware)
 
 
 # ==========================================================
 #            DATABASE DEPENDENCY
 # ==========================================================
+# GET routes read the in-memory ``read_model`` (app/read_model.py); a
+# session is only needed for writes and Postgres full-text ranking.
+# ``async def`` HTML routes use ``get_async_db`` (AsyncSession) so DB waits
+# don't block the event loop; the sync API routes run in the threadpool.
 
 def get_db():
-    db = SessionLocal()
+    db = database.SessionLocal()
     try:
         yield db
     finally:
@@ -115,9 +204,10 @@ def calculate_age(birthdate: date) -> int:
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request, db: Session = Depends(get_db)):
-    projects = crud.get_projects(db)
-    return templates.TemplateResponse("index.html", {
+@cached_page(PROJECTS)
+async def index(request: Request):
+    projects = (await read_model.get_async()).projects
+    return stream_template("index.html", {
         "request": request,
         "details": {
             "name": "Mohammad Sajid Vagh",
@@ -128,6 +218,7 @@ async def index(request: Request, db: Session = Depends(get_db)):
 
 
 @app.get("/about", response_class=HTMLResponse)
+@cached_page()
 async def about(request: Request):
     birthdate = datetime.strptime("2002-04-26", "%Y-%m-%d").date()
     return templates.TemplateResponse("about.html", {
@@ -146,6 +237,7 @@ async def about(request: Request):
 
 
 @app.get("/skills", response_class=HTMLResponse)
+@cached_page()
 async def skills(request: Request):
     return templates.TemplateResponse("skills.html", {
         "request": request,
@@ -157,22 +249,26 @@ async def skills(request: Request):
 
 
 @app.get("/projects-details/{pro_id}", response_class=HTMLResponse)
-async def detailsProjects(request: Request, pro_id: int, db: Session = Depends(get_db)):
-    project_details = crud.get_projects_by_id(db, pro_id)
-    projects = crud.get_projects(db)
-    print("link is a projects details :", project_details.images[0].image_path)
-    return templates.TemplateResponse("details_projects.html", {
+@cached_page(PROJECTS)
+async def detailsProjects(request: Request, pro_id: int):
+    detail = (await read_model.get_async()).detail(pro_id)
+    if detail is None:
+        raise StarletteHTTPException(status_code=404, detail="Project not found")
+    return stream_template("details_projects.html", {
         "request": request,
         "details": {
             "name": "Mohammad Sajid Vagh",
             "intro": "I am an enthusiastic and detail-oriented Python & Django developer with ~1.5 years of hands-on experience building web applications, REST APIs and working with relational databases. I enjoy solving real-world problems, optimizing backend systems, and I'm actively learning AI / ML to expand my skillset.",
         },
-        "project_detail": project_details,
-        "projects": projects
+        "project_detail": detail.project,
+        "projects": detail.related,
+        "prev_id": detail.prev_id,
+        "next_id": detail.next_id,
     })
 
 
 @app.get("/contact", response_class=HTMLResponse)
+@cached_page()
 async def contact(request: Request):
     return templates.TemplateResponse("contact.html", {
         "request": request,
@@ -184,40 +280,150 @@ async def contact(request: Request):
 
 
 @app.get("/projects", response_class=HTMLResponse)
-async def get_projects_page(request: Request, db: Session = Depends(get_db)):
-    projects = crud.get_projects(db)
-    return templates.TemplateResponse("projects.html",
-                                      {"request": request, "details": {
-                                          "name": "Mohammad Sajid Vagh",
-                                          "intro": "I am an enthusiastic and detail-oriented Python & Django developer with ~1.5 years of hands-on experience building web applications, REST APIs and working with relational databases. I enjoy solving real-world problems, optimizing backend systems, and I'm actively learning AI / ML to expand my skillset.",
-                                      },
-                                       "projects": projects})
+@cached_page(PROJECTS)
+async def get_projects_page(request: Request):
+    projects = (await read_model.get_async()).projects
+    return stream_template("projects.html",
+                           {"request": request, "details": {
+                               "name": "Mohammad Sajid Vagh",
+                               "intro": "I am an enthusiastic and detail-oriented Python & Django developer with ~1.5 years of hands-on experience building web applications, REST APIs and working with relational databases. I enjoy solving real-world problems, optimizing backend systems, and I'm actively learning AI / ML to expand my skillset.",
+                           },
+                            "projects": projects})
+
+
+@app.get("/search", response_class=HTMLResponse)
+@cached_page(PROJECTS)
+async def search_page(request: Request, q: str = "", db: AsyncSession = Depends(get_async_db)):
+    from app import search
+
+    results = await search.search_async(db, q, portfolio=await read_model.get_async())
+    return templates.TemplateResponse("search.html", {
+        "request": request,
+        "details": {
+            "name": "Mohammad Sajid Vagh",
+            "intro": "I am an enthusiastic and detail-oriented Python & Django developer with ~1.5 years of hands-on experience building web applications, REST APIs and working with relational databases. I enjoy solving real-world problems, optimizing backend systems, and I'm actively learning AI / ML to expand my skillset.",
+        },
+        "query": q.strip(),
+        "results": results,
+    })
 
 
 # ==========================================================
 #                PROJECT CRUD ROUTES
 # ==========================================================
 
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "20"))
+API_MAX_PAGE_SIZE = 100
+# /api/search bounds; app.search itself is imported by the routes that use it
+API_SEARCH_LIMIT = 20
+API_MAX_QUERY_LENGTH = 200
+
+
+def set_next_cursor(request: Request, response: Response, next_cursor: Optional[int]):
+    """Advertise the next keyset page, if any, in the response headers."""
+    if next_cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = str(next_cursor)
+    response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+
 
 @app.get("/api/projects", response_model=list[schemas.Project])
-def api_get_all_projects(db: Session = Depends(get_db)):
-    return crud.get_projects(db)
+def api_get_all_projects(
+        request: Request,
+        cursor: Optional[int] = Query(None, description="`X-Next-Cursor` of the previous page"),
+        limit: int = Query(API_PAGE_SIZE, ge=1, le=API_MAX_PAGE_SIZE),
+        project_type: Optional[str] = None,
+        date_from: Optional[date] = Query(None, description="projects still active on/after this date"),
+        date_to: Optional[date] = Query(None, description="projects started on/before this date"),
+        fields: Optional[str] = Query(None, description="comma-separated subset of fields, e.g. `project_name,main_image`"),
+):
+    flt = queries.ProjectFilter(project_type=project_type, date_from=date_from, date_to=date_to)
+
+    wanted = None
+    if fields is not None:
+        wanted = frozenset(f.strip() for f in fields.split(",") if f.strip())
+        unknown = wanted - queries.PROJECT_FIELDS
+        if unknown:
+            raise StarletteHTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    def build() -> JsonPayload:
+        portfolio = read_model.get()
+        if wanted is None:
+            projects, next_cursor = portfolio.page(flt, cursor, limit)
+            return JsonPayload(encode_projects(projects), next_cursor)
+        # projections are partial by design, so they bypass schemas.Project
+        rows, next_cursor = portfolio.fields_page(set(wanted), flt, cursor, limit)
+        return JsonPayload(encode_rows(rows), next_cursor)
+
+    # bytes are built once per data version, then served as-is
+    payload, hit = project_json.get_or_build((wanted, flt, cursor, limit), build)
+    response = Response(payload.body, media_type="application/json", headers={"X-Cache": "HIT" if hit else "MISS"})
+    set_next_cursor(request, response, payload.next_cursor)
+    return response
 
 
 @app.post("/api/projects", response_model=schemas.Project)
 def api_create_or_update_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
+    from app import crud
+
     logger.info(f"🛠 Upsert project: {project.project_name}")
     return crud.create_or_update_project(db, project)
 
 
 @app.delete("/api/projects/{pro_id}")
 def api_delete_project(pro_id: int, db: Session = Depends(get_db)):
+    from app import crud
+
     deleted = crud.delete_project(db, pro_id)
     if not deleted:
         raise StarletteHTTPException(status_code=404, detail="Project not found")
     return {"message": "Project deleted successfully"}
 
 
+@app.get("/api/search")
+def api_search(
+        q: str = Query(..., min_length=1, max_length=API_MAX_QUERY_LENGTH),
+        limit: int = Query(API_SEARCH_LIMIT, ge=1, le=API_MAX_PAGE_SIZE),
+        db: Session = Depends(get_db),
+):
+    """Ranked projects matching ``q`` (all terms must match)."""
+    from app import search
+
+    hits = search.search(db, q, limit, portfolio=read_model.get())
+    return {"query": q, "results": [hit._asdict() for hit in hits]}
+
+
+@app.get("/api/skills/facets")
+def api_skill_facets(
+        tag: list[str] = Query([], description="tag slugs the projects must all carry, e.g. `django`"),
+        kind: Optional[str] = Query(None, enum=sorted(set(SKILL_KINDS.values()))),
+        limit: int = Query(API_MAX_PAGE_SIZE, ge=1, le=API_MAX_PAGE_SIZE),
+):
+    """Tag counts per kind plus the matching projects, narrowed by every ``tag`` given."""
+    return read_model.get().facets(tag, kind, limit)
+
+
+# ==========================================================
+#                CACHE STATS
+# ==========================================================
+
+
+@app.get("/api/cache/stats")
+def api_cache_stats():
+    return {**page_cache.stats(), "api_json": project_json.stats(), "read_model": read_model.stats()}
+
+
+# ==========================================================
+#                METRICS
+# ==========================================================
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Prometheus text exposition of the request / SQL / render histograms."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 # ==============================================
 #        CATCH ALL ROUTE (404 FALLBACK)
 # ==============================================
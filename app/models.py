@@ -1,5 +1,8 @@
 # app/models.py
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Table
+from sqlalchemy import (
+    BigInteger, Column, Index, Integer, String, Text, ForeignKey, Date, DateTime, Table, UniqueConstraint, func,
+    text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSON
 from app.database import Base
@@ -9,7 +12,7 @@ class MyRoll(Base):
     __tablename__ = "my_roll"
 
     roll_id = Column(Integer, primary_key=True, index=True)
-    roll_title = Column(String, nullable=False)
+    roll_title = Column(String, nullable=False, unique=True)
     roll_topic = Column(JSON, nullable=True)
 
     # Relationship → Projects
@@ -18,6 +21,10 @@ class MyRoll(Base):
 
 class ReqSkill(Base):
     __tablename__ = "req_skills"
+    __table_args__ = (
+        # conflict target for the bulk seed upsert
+        UniqueConstraint("language", "frameworks", "tools", "database", name="uq_req_skills_stack"),
+    )
 
     req_skill_id = Column(Integer, primary_key=True, index=True)
     language = Column(String, index=True)
@@ -34,14 +41,49 @@ project_image_association = Table(
     Base.metadata,
     Column("project_id", Integer, ForeignKey("projects.pro_id"), primary_key=True),
     Column("image_id", Integer, ForeignKey("project_images.image_id"), primary_key=True),
+    # display order within the project (images are shared, so ids can't order them)
+    Column("position", Integer, nullable=False, server_default="0"),
 )
 
 
+project_skill_tags = Table(
+    "project_skill_tags",
+    Base.metadata,
+    Column("project_id", Integer, ForeignKey("projects.pro_id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("skill_tags.tag_id", ondelete="CASCADE"), primary_key=True),
+    # "projects using <tag>" and facet counts scan by tag first
+    Index("ix_project_skill_tags_tag_project", "tag_id", "project_id"),
+)
+
+
+# ReqSkill column → SkillTag.kind
+SKILL_KINDS = {
+    "language": "language",
+    "frameworks": "framework",
+    "tools": "tool",
+    "database": "database",
+}
+
+
+class SkillTag(Base):
+    """One language / framework / tool / database, split out of ``ReqSkill``'s comma lists."""
+    __tablename__ = "skill_tags"
+    __table_args__ = (
+        UniqueConstraint("kind", "slug", name="uq_skill_tags_kind_slug"),
+    )
+
+    tag_id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    slug = Column(String, nullable=False, index=True)
+    name = Column(String, nullable=False)
+
+
 class ProjectImage(Base):
     __tablename__ = "project_images"
 
     image_id = Column(Integer, primary_key=True, index=True)
-    image_path = Column(String, nullable=False)
+    # one row per path, shared by every project showing it
+    image_path = Column(String, nullable=False, unique=True, index=True)
 
 
 class Projects(Base):
@@ -72,5 +114,57 @@ class Projects(Base):
     images = relationship(
         "ProjectImage",
         secondary=project_image_association,
-        backref="projects"
+        backref="projects",
+        order_by=project_image_association.c.position,
+    )
+
+
+class DataVersion(Base):
+    """Single-row "data generation" stamp, bumped by every project write."""
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class AppLock(Base):
+    """Named cross-process lock for backends without advisory locks."""
+    __tablename__ = "app_locks"
+
+    name = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    acquired_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class ProjectSearch(Base):
+    """
+    Flattened, searchable text of one project, kept in sync by the crud
+    write paths on Postgres (see ``app/search.py``). Fields are split by weight.
+    """
+    __tablename__ = "project_search"
+
+    pro_id = Column(Integer, ForeignKey("projects.pro_id", ondelete="CASCADE"), primary_key=True)
+    # name, nickname, type
+    title = Column(Text, nullable=False, server_default="")
+    # role, languages, frameworks, tools, databases
+    tags = Column(Text, nullable=False, server_default="")
+    # description, achievements, role topics
+    body = Column(Text, nullable=False, server_default="")
+
+
+def search_vector():
+    """Weighted ``tsvector`` of a search document (Postgres only)."""
+    # text(), not bound params: an expression index only matches identical SQL
+    config = text("'english'::regconfig")
+    columns = ProjectSearch.__table__.c
+    return (
+        func.setweight(func.to_tsvector(config, columns.title), text("'A'"))
+        .op("||")(func.setweight(func.to_tsvector(config, columns.tags), text("'B'")))
+        .op("||")(func.setweight(func.to_tsvector(config, columns.body), text("'C'")))
     )
+
+
+# GIN expression index; queries must use the same ``search_vector()`` expression.
+# Other backends search through the in-process index in app/search.py.
+Index("ix_project_search_vector", search_vector(), postgresql_using="gin").ddl_if(dialect="postgresql")
@@ -0,0 +1,237 @@
+# app/pooling.py
+"""
+Connection pool sizing and telemetry.
+
+Each gunicorn worker has two engines (sync: API routes, seeding, the
+data-version watcher; async: HTML routes) and, on Postgres, one sync
+connection held open by the watcher's ``LISTEN``. With SQLAlchemy's
+default pools that is up to ``workers × 2 × (5 + 10)`` connections, more
+than a small Postgres plan accepts. Instead, ``DB_MAX_CONNECTIONS`` (minus
+``DB_RESERVED_CONNECTIONS`` for psql / migrations) is divided by
+``WEB_CONCURRENCY`` and split between the two pools.
+
+Stale connections are retired by ``pool_recycle`` and by SQLAlchemy's
+disconnect handling (an error classified as a disconnect invalidates that
+connection and every older one in the pool) rather than a ``SELECT 1``
+ping on each checkout.
+
+``DB_EXTERNAL_POOLER=1`` is for PgBouncer / Supavisor in transaction mode:
+``NullPool`` on both engines, no asyncpg prepared statements, and nothing
+that relies on session state (the data-version watcher polls instead of
+``LISTEN``, named locks use the ``app_locks`` table).
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from uuid import uuid4
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.instrumentation import Counter, Gauge, Histogram, register
+
+logger = logging.getLogger("Pool")
+
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "20"))
+DB_RESERVED_CONNECTIONS = int(os.getenv("DB_RESERVED_CONNECTIONS", "3"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+EXTERNAL_POOLER = os.getenv("DB_EXTERNAL_POOLER", "0") == "1"
+
+
+# ---------------------------
+#       SIZING
+# ---------------------------
+
+@dataclass(frozen=True)
+class PoolPlan:
+    """Per-worker connection limits. ``sync_*`` includes the ``LISTEN`` connection."""
+    per_worker: int
+    listener: int
+    sync_size: int
+    sync_overflow: int
+    async_size: int
+    async_overflow: int
+
+
+def _split(limit: int) -> tuple[int, int]:
+    """``limit`` → ``(pool_size, max_overflow)``: half kept open, the rest opened on demand."""
+    size = max(1, (limit + 1) // 2)
+    return size, limit - size
+
+
+def plan_pools(listener: bool, budget: int = DB_MAX_CONNECTIONS, reserved: int = DB_RESERVED_CONNECTIONS,
+               workers: int = WEB_CONCURRENCY) -> PoolPlan:
+    """Divide ``budget - reserved`` connections over ``workers`` and the two engines."""
+    listener = int(listener)
+    # seeding holds two sync connections (advisory lock + session), HTML needs one async
+    minimum = 3 + listener
+    per_worker = (budget - reserved) // max(1, workers)
+    if per_worker < minimum:
+        logger.warning(
+            f"⚠️ DB_MAX_CONNECTIONS={budget} leaves {per_worker} connection(s) per worker "
+            f"for {workers} worker(s); using {minimum}"
+        )
+        per_worker = minimum
+    available = per_worker - listener
+    sync_limit = max(2, available // 2)
+    async_limit = max(1, available - sync_limit)
+    return PoolPlan(per_worker, listener, *_split(sync_limit + listener), *_split(async_limit))
+
+
+@lru_cache(maxsize=None)
+def current_plan(listener: bool) -> PoolPlan:
+    plan = plan_pools(listener)
+    logger.info(
+        f"🔌 Pool plan: {plan.per_worker} connection(s)/worker × {WEB_CONCURRENCY} worker(s) — "
+        f"sync {plan.sync_size}+{plan.sync_overflow}"
+        f"{' (incl. LISTEN)' if plan.listener else ''}, async {plan.async_size}+{plan.async_overflow}"
+    )
+    return plan
+
+
+# ---------------------------
+#       ENGINE OPTIONS
+# ---------------------------
+
+def _statement_name() -> str:
+    # unique per statement: a transaction pooler may hand us any server connection
+    return f"__asyncpg_{uuid4()}__"
+
+
+def uses_listener(url: URL) -> bool:
+    """Whether the data-version watcher holds a ``LISTEN`` connection for ``url``."""
+    return url.get_backend_name() == "postgresql" and not EXTERNAL_POOLER
+
+
+def engine_options(url: URL, is_async: bool = False) -> dict:
+    """Keyword arguments for ``create_engine`` / ``create_async_engine``."""
+    label = "async" if is_async else "sync"
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # one shared in-memory connection; SQLAlchemy picks the right pool
+        return {}
+
+    if EXTERNAL_POOLER:
+        options = {"poolclass": TimedNullPool, "pool_logging_name": label}
+        if is_async and url.get_backend_name() == "postgresql":
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _statement_name,
+            }
+        return options
+
+    plan = current_plan(uses_listener(url))
+    size, overflow = (plan.async_size, plan.async_overflow) if is_async else (plan.sync_size, plan.sync_overflow)
+    return {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_logging_name": label,
+        "pool_size": size,
+        "max_overflow": overflow,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        # reuse the most recent connection so idle extras can age out server-side
+        "pool_use_lifo": True,
+    }
+
+
+# ---------------------------
+#       TELEMETRY
+# ---------------------------
+
+CHECKOUT_SECONDS = Histogram(
+    "portfolio_db_pool_checkout_seconds", "Time to get a connection from the pool (wait + connect).",
+    ("pool",), (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10),
+)
+CHECKOUT_TIMEOUTS = Counter(
+    "portfolio_db_pool_timeouts", "Checkouts that gave up after DB_POOL_TIMEOUT.", ("pool",),
+)
+INVALIDATIONS = Counter(
+    "portfolio_db_pool_invalidations", "Connections invalidated (disconnects, failed lock release).", ("pool",),
+)
+DISCONNECTS = Counter(
+    "portfolio_db_disconnects", "DB errors classified as disconnects.", ("pool",),
+)
+
+# label → engine; ``engine.pool`` is read at scrape time (``dispose()`` replaces it)
+_engines: dict[str, Engine] = {}
+
+
+def _queue_pools():
+    for label, engine in _engines.items():
+        if isinstance(engine.pool, QueuePool):
+            yield label, engine.pool
+
+
+def _collect_connections() -> dict[tuple, float]:
+    samples = {}
+    for label, pool in _queue_pools():
+        samples[(label, "checked_out")] = pool.checkedout()
+        samples[(label, "idle")] = pool.checkedin()
+    return samples
+
+
+POOL_CONNECTIONS = Gauge(
+    "portfolio_db_pool_connections", "Open pooled connections by state.", ("pool", "state"),
+    _collect_connections,
+)
+POOL_OVERFLOW = Gauge(
+    "portfolio_db_pool_overflow", "Connections open beyond pool_size.", ("pool",),
+    # ``overflow()`` counts up from -pool_size
+    lambda: {(label,): max(0, pool.overflow()) for label, pool in _queue_pools()},
+)
+POOL_LIMIT = Gauge(
+    "portfolio_db_pool_limit", "pool_size + max_overflow for this worker.", ("pool",),
+    lambda: {(label,): pool.size() + pool._max_overflow for label, pool in _queue_pools()},
+)
+
+register(CHECKOUT_SECONDS, CHECKOUT_TIMEOUTS, POOL_CONNECTIONS, POOL_OVERFLOW, POOL_LIMIT, INVALIDATIONS, DISCONNECTS)
+
+
+class _TimedCheckout:
+    """Observes every checkout in ``CHECKOUT_SECONDS`` (labelled by ``pool_logging_name``)."""
+
+    def connect(self):
+        label = self._orig_logging_name or "default"
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            CHECKOUT_TIMEOUTS.inc(label)
+            raise
+        finally:
+            CHECKOUT_SECONDS.observe(time.perf_counter() - started, label)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def instrument_pool(engine: Engine, label: str):
+    """Register ``engine`` for the pool gauges and count its invalidations / disconnects."""
+    _engines[label] = engine
+
+    def on_invalidate(_dbapi_connection, _record, _exception):
+        INVALIDATIONS.inc(label)
+
+    def on_error(context):
+        if context.is_disconnect:
+            DISCONNECTS.inc(label)
+
+    event.listen(engine, "invalidate", on_invalidate)
+    event.listen(engine, "handle_error", on_error)
@@ -0,0 +1,143 @@
+# app/queries.py
+"""
+Read-path queries for projects.
+
+Statements run through a sync ``Session`` (read model load, seeding).
+
+Every statement here loads the whole project graph (images, role, skills)
+up front, so templates can walk ``project.images``, ``my_roll_obj`` and
+``req_skill_obj`` without triggering one lazy SELECT per project.
+
+Routes are served by ``app.read_model``, which is loaded through
+:func:`get_projects`. The detail view below is the reference definition
+of what its ``detail`` returns; ``tests/test_read_model.py`` checks the
+two agree.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models import MyRoll, Projects, ReqSkill
+
+
+# ---------------------------
+#       LOADER OPTIONS
+# ---------------------------
+
+# many-to-one / one-to-one → joined into the main SELECT
+# many-to-many collection  → one extra "SELECT ... WHERE pro_id IN (...)"
+PROJECT_GRAPH = (
+    joinedload(Projects.my_roll_obj),
+    joinedload(Projects.req_skill_obj),
+    selectinload(Projects.images),
+)
+
+
+# ---------------------------
+#       STATEMENTS
+# ---------------------------
+
+def projects_stmt():
+    """All projects with their full graph, newest first."""
+    return (
+        select(Projects)
+        .options(*PROJECT_GRAPH)
+        .order_by(Projects.pro_id.desc())
+    )
+
+
+def project_by_id_stmt(pro_id: int):
+    """A single project with its full graph."""
+    return (
+        select(Projects)
+        .options(*PROJECT_GRAPH)
+        .where(Projects.pro_id == pro_id)
+    )
+
+
+# ---------------------------
+#       EXECUTION
+# ---------------------------
+
+def get_projects(db: Session):
+    """Return all projects in a fixed number of round trips (2)."""
+    return db.scalars(projects_stmt()).all()
+
+
+def get_project_by_id(db: Session, pro_id: int):
+    """Return one project in a fixed number of round trips (2)."""
+    return db.scalars(project_by_id_stmt(pro_id)).first()
+
+
+# ---------------------------
+#       DETAIL VIEW
+# ---------------------------
+# The detail page needs one full project, a narrow list of the others for
+# the "Similar Posts" block and its neighbours for prev/next links:
+# 4 round trips regardless of portfolio size, 2 for an unknown id.
+
+class ProjectDetail(NamedTuple):
+    project: Projects
+    # rows with pro_id, project_name, logo_img, description only
+    related: list
+    prev_id: Optional[int]
+    next_id: Optional[int]
+
+
+def related_projects_stmt(pro_id: int):
+    """Sidebar projection of every other project, newest first."""
+    return (
+        select(Projects.pro_id, Projects.project_name, Projects.logo_img, Projects.description)
+        .where(Projects.pro_id != pro_id)
+        .order_by(Projects.pro_id.desc())
+    )
+
+
+def neighbours_stmt(pro_id: int):
+    """``(prev_id, next_id)``: two primary-key index probes in one SELECT."""
+    return select(
+        select(func.max(Projects.pro_id)).where(Projects.pro_id < pro_id).scalar_subquery(),
+        select(func.min(Projects.pro_id)).where(Projects.pro_id > pro_id).scalar_subquery(),
+    )
+
+
+def get_project_detail(db: Session, pro_id: int) -> Optional[ProjectDetail]:
+    """Detail read model, or None for an unknown id."""
+    project = get_project_by_id(db, pro_id)
+    if project is None:
+        return None
+    related = db.execute(related_projects_stmt(pro_id)).all()
+    prev_id, next_id = db.execute(neighbours_stmt(pro_id)).one()
+    return ProjectDetail(project, related, prev_id, next_id)
+
+
+# ---------------------------
+#       LIST API FIELDS
+# ---------------------------
+# ``GET /api/projects`` pages come from ``read_model.page`` / ``fields_page``;
+# these define which fields and filters they accept.
+
+# plain columns a ``fields=`` projection may ask for
+PROJECT_COLUMNS = {
+    column.key: column
+    for column in Projects.__table__.columns
+    if column.key not in ("my_roll_id", "req_skill_id")
+}
+# related fields, loaded only when asked for
+PROJECT_RELATED = {
+    "my_roll_obj": (MyRoll.roll_title, MyRoll.roll_topic),
+    "req_skill_obj": (ReqSkill.language, ReqSkill.frameworks, ReqSkill.tools, ReqSkill.database),
+}
+PROJECT_FIELDS = set(PROJECT_COLUMNS) | set(PROJECT_RELATED) | {"images"}
+
+
+@dataclass(frozen=True)
+class ProjectFilter:
+    """``GET /api/projects`` filters; the date range matches projects active in it."""
+    project_type: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
@@ -0,0 +1,358 @@
+# app/read_model.py
+"""
+Immutable in-memory read model of the whole portfolio.
+
+The dataset (projects with their role, skills and images, plus the skill
+tags) is small and read on every request, so each worker keeps one
+:class:`Portfolio`: slotted, frozen view objects with prebuilt indexes by
+``pro_id``, project name, project type and skill tag. GET routes read it
+instead of building ORM objects through a session.
+
+Loading costs 5 statements (version, projects, images, tags, tag links).
+:class:`ReadModel` loads it on first use and drops it on
+:meth:`~ReadModel.invalidate` (crud write paths, and the data version
+watcher for writes made by other workers); the next reader builds the new
+one and swaps the reference. A request that already holds a
+``Portfolio`` keeps reading that one consistently.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Mapping, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import database, queries, versioning
+from app.models import SkillTag, project_skill_tags
+
+if TYPE_CHECKING:
+    # imported on first search / facet lookup, not with the app
+    from app import search
+
+logger = logging.getLogger("ReadModel")
+
+
+# ---------------------------
+#       VIEWS
+# ---------------------------
+# Same attribute names as the ORM models, so templates, ``schemas.Project``
+# and ``search.document`` accept either. JSON lists become tuples.
+
+@dataclass(frozen=True, slots=True)
+class RollView:
+    roll_title: str
+    roll_topic: Optional[tuple]
+
+
+@dataclass(frozen=True, slots=True)
+class SkillView:
+    language: Optional[str]
+    frameworks: Optional[str]
+    tools: Optional[str]
+    database: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class ImageView:
+    image_path: str
+
+
+@dataclass(frozen=True, slots=True)
+class TagView:
+    tag_id: int
+    kind: str
+    slug: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectView:
+    pro_id: int
+    project_name: str
+    project_nickname: Optional[str]
+    description: Optional[tuple]
+    project_type: Optional[str]
+    key_achievement: Optional[tuple]
+    logo_img: Optional[str]
+    project_video: Optional[str]
+    github_link: Optional[str]
+    website_link: Optional[str]
+    start_date: Optional[date]
+    end_date: Optional[date]
+    main_image: Optional[str]
+    my_roll_obj: RollView
+    req_skill_obj: SkillView
+    images: tuple
+
+
+def _frozen(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+# ---------------------------
+#       PORTFOLIO
+# ---------------------------
+
+class Portfolio:
+    """One consistent snapshot of the read side, as of data ``version``."""
+
+    __slots__ = (
+        "version", "loaded_at", "projects", "tags", "by_id", "by_name", "by_type", "by_tag",
+        "tags_by_slug", "_ids", "_search_index",
+    )
+
+    def __init__(self, version: int, projects: tuple, tags: tuple, links: Mapping[int, frozenset]):
+        self.version = version
+        self.loaded_at = datetime.now(timezone.utc)
+        # newest first, like every list route
+        self.projects: tuple[ProjectView, ...] = projects
+        self.tags: tuple[TagView, ...] = tags
+        self.by_id: Mapping[int, ProjectView] = MappingProxyType({p.pro_id: p for p in projects})
+        self.by_name: Mapping[str, ProjectView] = MappingProxyType({p.project_name: p for p in projects})
+        by_type: dict[Optional[str], list] = {}
+        for project in projects:
+            by_type.setdefault(project.project_type, []).append(project)
+        self.by_type: Mapping[Optional[str], tuple] = MappingProxyType({k: tuple(v) for k, v in by_type.items()})
+        # tag_id → pro_ids
+        self.by_tag: Mapping[int, frozenset] = MappingProxyType(dict(links))
+        tags_by_slug: dict[str, list] = {}
+        for tag in tags:
+            tags_by_slug.setdefault(tag.slug, []).append(tag)
+        self.tags_by_slug: Mapping[str, tuple] = MappingProxyType({k: tuple(v) for k, v in tags_by_slug.items()})
+        self._ids = tuple(sorted(self.by_id))
+        self._search_index: Optional["search.InvertedIndex"] = None
+
+    # -- pages --
+
+    def detail(self, pro_id: int) -> Optional[queries.ProjectDetail]:
+        """Detail-page model (project, the other projects, prev/next ids), or None."""
+        project = self.by_id.get(pro_id)
+        if project is None:
+            return None
+        related = [p for p in self.projects if p.pro_id != pro_id]
+        index = bisect_right(self._ids, pro_id)
+        prev_id = self._ids[index - 2] if index >= 2 else None
+        next_id = self._ids[index] if index < len(self._ids) else None
+        return queries.ProjectDetail(project, related, prev_id, next_id)
+
+    def page(self, flt: queries.ProjectFilter, cursor: Optional[int], limit: int) -> tuple[list, Optional[int]]:
+        """
+        ``(projects, next_cursor)``, newest first. The cursor is the last
+        ``pro_id`` the client saw, so page N costs the same as page 1.
+        """
+        projects = self.projects if flt.project_type is None else self.by_type.get(flt.project_type, ())
+        start = 0 if cursor is None else bisect_right(projects, -cursor, key=lambda p: -p.pro_id)
+        page = []
+        for project in projects[start:]:
+            if flt.date_from is not None and project.end_date is not None and project.end_date < flt.date_from:
+                continue
+            if flt.date_to is not None and (project.start_date is None or project.start_date > flt.date_to):
+                continue
+            page.append(project)
+            if len(page) > limit:
+                return page[:limit], page[limit - 1].pro_id
+        return page, None
+
+    def fields_page(self, fields: set[str], flt: queries.ProjectFilter, cursor: Optional[int],
+                    limit: int) -> tuple[list[dict], Optional[int]]:
+        """``(rows, next_cursor)``, each row a dict of just ``fields`` (and ``pro_id``)."""
+        projects, next_cursor = self.page(flt, cursor, limit)
+        columns = [f for f in sorted(fields & set(queries.PROJECT_COLUMNS)) if f != "pro_id"]
+        related = [(name, [c.key for c in cols]) for name, cols in queries.PROJECT_RELATED.items() if name in fields]
+        rows = []
+        for project in projects:
+            row = {"pro_id": project.pro_id}
+            for field in columns:
+                row[field] = getattr(project, field)
+            for name, keys in related:
+                obj = getattr(project, name)
+                row[name] = {key: getattr(obj, key) for key in keys}
+            if "images" in fields:
+                row["images"] = [image.image_path for image in project.images]
+            rows.append(row)
+        return rows, next_cursor
+
+    # -- search --
+
+    @property
+    def search_index(self) -> "search.InvertedIndex":
+        """Fallback full-text index over these projects, built on first search."""
+        from app import search
+
+        if self._search_index is None:
+            self._search_index = search.InvertedIndex(
+                search.Document(p.pro_id, **search.document(p)) for p in self.projects
+            )
+        return self._search_index
+
+    # -- skill tags --
+
+    def facets(self, slugs: list[str], kind: Optional[str] = None, limit: int = 100) -> dict:
+        """Same result as ``skill_tags.facets``, from memory."""
+        from app import skill_tags
+
+        slugs = list(dict.fromkeys(skill_tags.slugify(s) for s in slugs if skill_tags.slugify(s)))
+        selected = [
+            {"tag_id": t.tag_id, "kind": t.kind, "slug": t.slug, "name": t.name}
+            for t in sorted((t for slug in slugs for t in self.tags_by_slug.get(slug, ())),
+                            key=lambda t: (t.slug, t.tag_id))
+        ]
+        unknown = [slug for slug in slugs if slug not in self.tags_by_slug]
+        if unknown:
+            # a tag nobody uses matches no project
+            return {"selected": selected, "unknown": unknown, "facets": {}, "projects": []}
+
+        matching: Optional[frozenset] = None
+        for slug in slugs:
+            # one slug can exist under several kinds ("sql" language + database): match any of them
+            ids = frozenset().union(*(self.by_tag.get(t.tag_id, ()) for t in self.tags_by_slug[slug]))
+            matching = ids if matching is None else matching & ids
+
+        counts = []
+        for tag in self.tags:
+            if kind is not None and tag.kind != kind:
+                continue
+            ids = self.by_tag.get(tag.tag_id, frozenset())
+            count = len(ids) if matching is None else len(ids & matching)
+            if count:
+                counts.append((tag, count))
+        counts.sort(key=lambda item: (-item[1], item[0].name))
+
+        grouped: dict[str, list[dict]] = {}
+        for tag, count in counts:
+            grouped.setdefault(tag.kind, []).append({"slug": tag.slug, "name": tag.name, "count": count})
+        projects = [p for p in self.projects if matching is None or p.pro_id in matching][:limit]
+        return {
+            "selected": selected,
+            "unknown": [],
+            "facets": grouped,
+            "projects": [
+                {"pro_id": p.pro_id, "project_name": p.project_name, "project_type": p.project_type,
+                 "logo_img": p.logo_img}
+                for p in projects
+            ],
+        }
+
+
+# ---------------------------
+#       LOADING
+# ---------------------------
+
+def load(db: Session) -> Portfolio:
+    """Build a :class:`Portfolio`; the version is read before the data it covers."""
+    version, _updated_at = versioning.read(db)
+    rolls: dict[int, RollView] = {}
+    skills: dict[int, SkillView] = {}
+    images: dict[str, ImageView] = {}
+
+    projects = []
+    for p in queries.get_projects(db):
+        # shared rows stay shared
+        roll = rolls.get(p.my_roll_id)
+        if roll is None:
+            roll = rolls[p.my_roll_id] = RollView(p.my_roll_obj.roll_title, _frozen(p.my_roll_obj.roll_topic))
+        skill = skills.get(p.req_skill_id)
+        if skill is None:
+            s = p.req_skill_obj
+            skill = skills[p.req_skill_id] = SkillView(s.language, s.frameworks, s.tools, s.database)
+        projects.append(ProjectView(
+            pro_id=p.pro_id,
+            project_name=p.project_name,
+            project_nickname=p.project_nickname,
+            description=_frozen(p.description),
+            project_type=p.project_type,
+            key_achievement=_frozen(p.key_achievement),
+            logo_img=p.logo_img,
+            project_video=p.project_video,
+            github_link=p.github_link,
+            website_link=p.website_link,
+            start_date=p.start_date,
+            end_date=p.end_date,
+            main_image=p.main_image,
+            my_roll_obj=roll,
+            req_skill_obj=skill,
+            images=tuple(images.setdefault(i.image_path, ImageView(i.image_path)) for i in p.images),
+        ))
+
+    tags = tuple(
+        TagView(*row) for row in db.execute(
+            select(SkillTag.tag_id, SkillTag.kind, SkillTag.slug, SkillTag.name).order_by(SkillTag.tag_id)
+        )
+    )
+    links: dict[int, set] = {}
+    for project_id, tag_id in db.execute(select(project_skill_tags.c.project_id, project_skill_tags.c.tag_id)):
+        links.setdefault(tag_id, set()).add(project_id)
+    return Portfolio(version, tuple(projects), tags, {k: frozenset(v) for k, v in links.items()})
+
+
+class ReadModel:
+    """This worker's current :class:`Portfolio`, rebuilt after :meth:`invalidate`."""
+
+    def __init__(self):
+        self.loads = 0
+        self.last_load_ms: Optional[float] = None
+        self._portfolio: Optional[Portfolio] = None
+        self._built_generation = -1
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def _current(self) -> Optional[Portfolio]:
+        portfolio = self._portfolio
+        if portfolio is not None and self._built_generation == self._generation:
+            return portfolio
+        return None
+
+    def get(self) -> Portfolio:
+        """The current portfolio; the first caller after a change loads it, the others wait."""
+        portfolio = self._current()
+        if portfolio is not None:
+            return portfolio
+        with self._build_lock:
+            portfolio = self._current()
+            if portfolio is not None:
+                return portfolio
+            generation = self._generation
+            started = time.perf_counter()
+            db = database.SessionLocal()
+            try:
+                portfolio = load(db)
+            finally:
+                db.close()
+            self.loads += 1
+            self.last_load_ms = (time.perf_counter() - started) * 1000
+            # a write landing mid-load leaves the generation behind → next reader reloads
+            self._portfolio, self._built_generation = portfolio, generation
+        logger.info(
+            f"📚 Read model v{portfolio.version}: {len(portfolio.projects)} projects, "
+            f"{len(portfolio.tags)} tags in {self.last_load_ms:.1f} ms"
+        )
+        return portfolio
+
+    async def get_async(self) -> Portfolio:
+        """:meth:`get` for ``async def`` routes; loading runs in the threadpool."""
+        return self._current() or await run_in_threadpool(self.get)
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+
+    def stats(self) -> dict:
+        portfolio = self._portfolio
+        return {
+            "version": portfolio.version if portfolio else None,
+            "projects": len(portfolio.projects) if portfolio else 0,
+            "current": self._current() is not None,
+            "loads": self.loads,
+            "last_load_ms": round(self.last_load_ms, 2) if self.last_load_ms is not None else None,
+        }
+
+
+read_model = ReadModel()
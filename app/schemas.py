@@ -1,5 +1,5 @@
 # app/schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import List, Optional
 from datetime import date
 
@@ -53,3 +53,11 @@ class Project(ProjectBase):
 
     class Config:
         from_attributes = True
+
+    @field_validator("images", mode="before")
+    @classmethod
+    def image_paths(cls, images):
+        # ORM objects carry ProjectImage rows; the API exposes their paths
+        if images is None:
+            return None
+        return [getattr(img, "image_path", img) for img in images]
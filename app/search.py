@@ -0,0 +1,293 @@
+# app/search.py
+"""
+Full-text search over projects.
+
+Each project's searchable text is split by weight (title > tags > body),
+see :func:`document`.
+
+- Postgres: one ``project_search`` row per project, kept in sync by the
+  crud write paths via :func:`store` / :func:`remove`, searched with
+  ``websearch_to_tsquery`` against the GIN expression index on
+  ``models.search_vector()`` and ranked with ``ts_rank``.
+- Anything else: an in-process inverted index over the same documents,
+  built from the projects on first use and dropped whenever the data
+  changes (or, for the routes, the one kept by ``app.read_model``).
+  Nothing reads ``project_search`` there, so it is not written either.
+
+Both match every query term (the last one as a prefix in the fallback)
+and return ``(pro_id, rank)`` best first.
+"""
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import delete, desc, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import queries
+from app.models import Projects, ProjectSearch, search_vector
+from app.upsert import insert_for, supports_upsert
+
+SEARCH_LIMIT = 20
+# rows per multi-row upsert
+BATCH_SIZE = 1000
+MAX_QUERY_LENGTH = 200
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = frozenset("a an and are as at be by for from in into is it of on or the to with".split())
+# fallback field weights, mirroring setweight A/B/C on Postgres
+_WEIGHTS = {"title": 3.0, "tags": 2.0, "body": 1.0}
+
+
+class Document(NamedTuple):
+    pro_id: int
+    title: str
+    tags: str
+    body: str
+
+
+class SearchHit(NamedTuple):
+    pro_id: int
+    project_name: str
+    project_type: Optional[str]
+    logo_img: Optional[str]
+    description: Optional[list]
+    rank: float
+
+
+# ---------------------------
+#       DOCUMENTS
+# ---------------------------
+
+def uses_table(db) -> bool:
+    """Whether searches on ``db`` read ``project_search`` (only Postgres does)."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _join(*parts) -> str:
+    out = []
+    for part in parts:
+        if isinstance(part, (list, tuple)):
+            out.extend(str(p) for p in part if p)
+        elif part:
+            out.append(str(part))
+    return " ".join(out)
+
+
+def document(project) -> dict:
+    """
+    Search text for ``project`` — a ``schemas.ProjectCreate`` or an ORM
+    ``Projects`` with its role/skills loaded (same attribute names).
+    """
+    roll, skill = project.my_roll_obj, project.req_skill_obj
+    return {
+        "title": _join(project.project_name, project.project_nickname, project.project_type),
+        "tags": _join(roll.roll_title, skill.language, skill.frameworks, skill.tools, skill.database),
+        "body": _join(project.description, project.key_achievement, roll.roll_topic),
+    }
+
+
+def store(db: Session, projects: dict):
+    """Upsert the documents of ``{pro_id: project}``. Call before ``db.commit()``."""
+    if not projects or not uses_table(db):
+        return
+    rows = [{"pro_id": pro_id, **document(project)} for pro_id, project in projects.items()]
+    if supports_upsert(db):
+        for start in range(0, len(rows), BATCH_SIZE):
+            stmt = insert_for(db)(ProjectSearch).values(rows[start:start + BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ProjectSearch.pro_id],
+                set_={col: stmt.excluded[col] for col in ("title", "tags", "body")},
+            )
+            db.execute(stmt)
+    else:
+        for row in rows:
+            db.merge(ProjectSearch(**row))
+
+
+def remove(db: Session, pro_ids: Iterable[int]):
+    """Drop the documents of deleted projects (before deleting the projects)."""
+    pro_ids = list(pro_ids)
+    if pro_ids and uses_table(db):
+        db.execute(delete(ProjectSearch).where(ProjectSearch.pro_id.in_(pro_ids)))
+
+
+def ensure_documents(db: Session) -> int:
+    """Index projects that have no document yet (first run, pre-search data). Returns how many."""
+    if not uses_table(db):
+        return 0
+    missing = db.scalars(
+        queries.projects_stmt().where(~select(ProjectSearch.pro_id).where(ProjectSearch.pro_id == Projects.pro_id).exists())
+    ).all()
+    store(db, {p.pro_id: p for p in missing})
+    return len(missing)
+
+
+# ---------------------------
+#       FALLBACK INDEX
+# ---------------------------
+
+def tokenize(value: str) -> list[str]:
+    return [t.rstrip(".") for t in _TOKEN.findall(value.lower()) if t not in _STOPWORDS]
+
+
+class InvertedIndex:
+    """``term → {pro_id: weighted tf}`` over :class:`Document` rows."""
+
+    def __init__(self, rows):
+        self.postings: dict[str, dict[int, float]] = defaultdict(lambda: defaultdict(float))
+        doc_ids = set()
+        for row in rows:
+            doc_ids.add(row.pro_id)
+            for field, weight in _WEIGHTS.items():
+                for term in tokenize(getattr(row, field)):
+                    self.postings[term][row.pro_id] += weight
+        self.size = len(doc_ids)
+        self.terms = sorted(self.postings)
+
+    def _expand(self, term: str, prefix: bool) -> list[str]:
+        if not prefix:
+            return [term] if term in self.postings else []
+        start = bisect_left(self.terms, term)
+        out = []
+        for candidate in self.terms[start:]:
+            if not candidate.startswith(term):
+                break
+            out.append(candidate)
+        return out
+
+    def search(self, query: str, limit: int) -> list[tuple[int, float]]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        scores: Optional[dict[int, float]] = None
+        for i, term in enumerate(terms):
+            term_scores: dict[int, float] = defaultdict(float)
+            for match in self._expand(term, prefix=i == len(terms) - 1):
+                postings = self.postings[match]
+                idf = math.log(1 + self.size / len(postings))
+                for pro_id, tf in postings.items():
+                    term_scores[pro_id] += (1 + math.log(tf)) * idf
+            # every term must match
+            scores = term_scores if scores is None else {
+                pro_id: score + term_scores[pro_id] for pro_id, score in scores.items() if pro_id in term_scores
+            }
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return ranked[:limit]
+
+
+class FallbackIndex:
+    """Lazily built :class:`InvertedIndex`, rebuilt after :meth:`invalidate`."""
+
+    def __init__(self):
+        self._index: Optional[InvertedIndex] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> InvertedIndex:
+        with self._lock:
+            if self._index is not None:
+                return self._index
+            generation = self._generation
+        index = InvertedIndex(Document(p.pro_id, **document(p)) for p in queries.get_projects(db))
+        with self._lock:
+            if generation == self._generation:
+                self._index = index
+        return index
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._index = None
+
+
+fallback_index = FallbackIndex()
+
+
+# ---------------------------
+#       QUERIES
+# ---------------------------
+
+def _ranked_stmt(query: str, limit: int):
+    """Postgres: ``(pro_id, rank)`` through the GIN index."""
+    vector = search_vector()
+    tsquery = func.websearch_to_tsquery(text("'english'::regconfig"), query)
+    rank = func.ts_rank(vector, tsquery).label("rank")
+    return (
+        select(ProjectSearch.pro_id, rank)
+        .where(vector.op("@@")(tsquery))
+        .order_by(desc("rank"), ProjectSearch.pro_id.desc())
+        .limit(limit)
+    )
+
+
+def _hits_stmt(pro_ids: list[int]):
+    return select(
+        Projects.pro_id, Projects.project_name, Projects.project_type, Projects.logo_img, Projects.description,
+    ).where(Projects.pro_id.in_(pro_ids))
+
+
+def _hits(rows, ranked: list[tuple[int, float]]) -> list[SearchHit]:
+    by_id = {row.pro_id: row for row in rows}
+    return [SearchHit(*by_id[pro_id], rank=round(rank, 4)) for pro_id, rank in ranked if pro_id in by_id]
+
+
+def _portfolio_hits(portfolio, ranked: list[tuple[int, float]]) -> list[SearchHit]:
+    hits = []
+    for pro_id, rank in ranked:
+        p = portfolio.by_id.get(pro_id)
+        if p is not None:
+            hits.append(SearchHit(p.pro_id, p.project_name, p.project_type, p.logo_img, p.description, round(rank, 4)))
+    return hits
+
+
+def _clean(query: str) -> str:
+    return (query or "").strip()[:MAX_QUERY_LENGTH]
+
+
+def search(db: Session, query: str, limit: int = SEARCH_LIMIT, portfolio=None) -> list[SearchHit]:
+    """
+    Ranked projects matching ``query``: the ranked ids, then one query for
+    their rows. With a ``read_model.Portfolio`` the rows (and, off
+    Postgres, the index) come from it instead.
+    """
+    query = _clean(query)
+    if not query:
+        return []
+    if uses_table(db):
+        ranked = [tuple(row) for row in db.execute(_ranked_stmt(query, limit))]
+    elif portfolio is not None:
+        ranked = portfolio.search_index.search(query, limit)
+    else:
+        ranked = fallback_index.get(db).search(query, limit)
+    if not ranked:
+        return []
+    if portfolio is not None:
+        return _portfolio_hits(portfolio, ranked)
+    return _hits(db.execute(_hits_stmt([pro_id for pro_id, _ in ranked])), ranked)
+
+
+async def search_async(db: AsyncSession, query: str, limit: int = SEARCH_LIMIT, portfolio=None) -> list[SearchHit]:
+    """Async variant of :func:`search`."""
+    query = _clean(query)
+    if not query:
+        return []
+    if uses_table(db):
+        ranked = [tuple(row) for row in await db.execute(_ranked_stmt(query, limit))]
+    elif portfolio is not None:
+        ranked = portfolio.search_index.search(query, limit)
+    else:
+        index = await db.run_sync(fallback_index.get)
+        ranked = index.search(query, limit)
+    if not ranked:
+        return []
+    if portfolio is not None:
+        return _portfolio_hits(portfolio, ranked)
+    return _hits(await db.execute(_hits_stmt([pro_id for pro_id, _ in ranked])), ranked)
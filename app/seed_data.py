@@ -1,6 +1,5 @@
 # app/seed_data.py
 from app import schemas, crud
-from app.models import Projects
 
 
 def get_seed_projects():
@@ -175,33 +174,20 @@ def get_seed_projects():
 
 # app/seed_data.py
 
-def seed_all_data(db):
+def seed_all_data(db) -> bool:
     """
-    Sync database with seed data.
+    Sync database with seed data under the same ``seed`` lock as
+    ``app.startup.run_seed``. Returns False (nothing synced) while another
+    process holds it.
     """
-    seed_projects = get_seed_projects()
+    from app.locks import NamedLock
+    from app.startup import SEED_LOCK_NAME  # app.startup imports this module
 
-    existing_projects = {
-        p.project_name: p for p in db.query(Projects).all()
-    }
-
-    seed_project_names = [p.project_name for p in seed_projects]
-
-    # Create or update
-    for project in seed_projects:
-        crud.create_or_update_project(db, project)  # ✅ updated line
-        print("------------------------------------------------------------")
-        print("✅ Created or Updated!")
-        print("✅ Created or Updated:", project.project_name)
-        print("------------------------------------------------------------")
-
-    # Delete projects not in seed data
-    for name, project in existing_projects.items():
-        if name not in seed_project_names:
-            db.delete(project)
-            print("------------------------------------------------------------")
-            print("✅ Deleted!")
-            print("------------------------------------------------------------")
-
-    db.commit()
-    print("✅ Database synced with seed_data successfully!")
+    lock = NamedLock(SEED_LOCK_NAME, db.get_bind())
+    if not lock.acquire():
+        return False
+    try:
+        crud.sync_projects_with_seed(db, get_seed_projects())
+    finally:
+        lock.release()
+    return True
@@ -0,0 +1,91 @@
+# app/serialization.py
+"""
+Pre-serialized JSON for the project list API.
+
+``GET /api/projects`` pages are encoded to bytes once per data version and
+served straight from memory afterwards: no query, no Pydantic validation,
+no JSON encoding on a hit. The crud write paths (and, for other workers,
+the data version watcher) call :meth:`JsonCache.invalidate`.
+
+Encoding goes through Pydantic's core serializer (``TypeAdapter.dump_json``)
+rather than ``jsonable_encoder`` + ``json.dumps``.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Optional
+
+from pydantic import TypeAdapter
+
+from app import schemas
+
+API_JSON_CACHE_SIZE = int(os.getenv("API_JSON_CACHE_SIZE", "128"))
+
+_projects_adapter = TypeAdapter(list[schemas.Project])
+_rows_adapter = TypeAdapter(list[dict[str, Any]])
+
+
+def encode_projects(projects) -> bytes:
+    """ORM projects → JSON bytes, shaped by ``schemas.Project``."""
+    return _projects_adapter.dump_json(_projects_adapter.validate_python(projects, from_attributes=True))
+
+
+def encode_rows(rows: list[dict]) -> bytes:
+    """Projection rows (plain dicts) → JSON bytes."""
+    return _rows_adapter.dump_json(rows)
+
+
+class JsonPayload(NamedTuple):
+    body: bytes
+    next_cursor: Optional[int]
+
+
+class JsonCache:
+    """Thread-safe LRU of encoded payloads, emptied whenever the data changes."""
+
+    def __init__(self, max_entries: int = API_JSON_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._entries: "OrderedDict[tuple, JsonPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: tuple, build: Callable[[], JsonPayload]) -> tuple[JsonPayload, bool]:
+        """Return ``(payload, hit)``; ``build()`` runs outside the lock on a miss."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload, True
+            self.misses += 1
+            generation = self._generation
+
+        payload = build()
+
+        with self._lock:
+            # a write landed while we were building → don't keep stale bytes
+            if generation == self._generation:
+                self._entries[key] = payload
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return payload, False
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+project_json = JsonCache()
@@ -0,0 +1,187 @@
+# app/skill_tags.py
+"""
+Normalized skill tags.
+
+``ReqSkill`` keeps the stack as comma-separated text ("Django, Django
+Oscar, DRF"). Each entry is also stored once in ``skill_tags`` (per kind,
+keyed by slug) and linked to its projects through ``project_skill_tags``,
+so "projects using Django" and facet counts are index lookups instead of
+``LIKE`` scans. The crud write paths keep the links in sync via
+:func:`reconcile` / :func:`remove`.
+"""
+
+import re
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, exists, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import SKILL_KINDS, Projects, ReqSkill, SkillTag, project_skill_tags as links_table
+from app.upsert import insert_for, supports_upsert
+
+BATCH_SIZE = 1000
+
+# ReqSkill column → tag kind
+KINDS = SKILL_KINDS
+
+
+def _chunks(items: list, size: int = BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def slugify(name: str) -> str:
+    """``"Django Oscar"`` → ``"django-oscar"``; keeps ``+``/``#``/``.`` (C++, C#, Node.js)."""
+    return re.sub(r"[^a-z0-9+#.]+", "-", name.lower()).strip("-")
+
+
+def tags_for(skill) -> dict[tuple[str, str], str]:
+    """``{(kind, slug): display name}`` for a ``ReqSkill`` row or ``ReqSkillBase``."""
+    tags = {}
+    for column, kind in KINDS.items():
+        for name in (getattr(skill, column) or "").split(","):
+            name = name.strip()
+            if name and slugify(name):
+                tags.setdefault((kind, slugify(name)), name)
+    return tags
+
+
+# ---------------------------
+#       WRITE SIDE
+# ---------------------------
+
+def ensure_tags(db: Session, tags: dict[tuple[str, str], str]) -> dict[tuple[str, str], int]:
+    """Return ``{(kind, slug): tag_id}``, inserting tags not stored yet."""
+    if not tags:
+        return {}
+    keys = list(tags)
+    ids = {}
+    for batch in _chunks(keys):
+        ids.update({(kind, slug): tag_id for tag_id, kind, slug in db.execute(
+            select(SkillTag.tag_id, SkillTag.kind, SkillTag.slug).where(tuple_(SkillTag.kind, SkillTag.slug).in_(batch))
+        )})
+    missing = [key for key in keys if key not in ids]
+    if not missing:
+        return ids
+
+    if supports_upsert(db):
+        insert = insert_for(db)
+        for batch in _chunks(missing):
+            stmt = insert(SkillTag).values([{"kind": k, "slug": s, "name": tags[(k, s)]} for k, s in batch])
+            # a concurrent writer may have inserted the same tag meanwhile
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[SkillTag.kind, SkillTag.slug],
+                set_={"name": stmt.excluded.name},
+            ).returning(SkillTag.tag_id, SkillTag.kind, SkillTag.slug)
+            ids.update({(kind, slug): tag_id for tag_id, kind, slug in db.execute(stmt)})
+    else:
+        new_rows = [SkillTag(kind=k, slug=s, name=tags[(k, s)]) for k, s in missing]
+        db.add_all(new_rows)
+        db.flush()
+        ids.update({(row.kind, row.slug): row.tag_id for row in new_rows})
+    return ids
+
+
+def reconcile(db: Session, skills: dict[int, object]):
+    """
+    Make each project's tag links match its skills (``{pro_id: skill}``).
+    Only added / removed links are written. Call before ``db.commit()``.
+    """
+    if not skills:
+        return
+    wanted = {pro_id: tags_for(skill) for pro_id, skill in skills.items()}
+    tag_ids = ensure_tags(db, {key: name for tags in wanted.values() for key, name in tags.items()})
+    desired = {(pro_id, tag_ids[key]) for pro_id, tags in wanted.items() for key in tags}
+
+    current = set()
+    for batch in _chunks(list(wanted)):
+        current.update(db.execute(
+            select(links_table.c.project_id, links_table.c.tag_id).where(links_table.c.project_id.in_(batch))
+        ).tuples())
+
+    removed = list(current - desired)
+    added = desired - current
+    for batch in _chunks(removed):
+        db.execute(delete(links_table).where(tuple_(links_table.c.project_id, links_table.c.tag_id).in_(batch)))
+    if added:
+        db.execute(links_table.insert(), [{"project_id": p, "tag_id": t} for p, t in added])
+
+
+def remove(db: Session, pro_ids: Iterable[int]):
+    """Drop the links of deleted projects (before deleting the projects)."""
+    pro_ids = list(pro_ids)
+    if pro_ids:
+        db.execute(delete(links_table).where(links_table.c.project_id.in_(pro_ids)))
+
+
+def prune(db: Session) -> int:
+    """Delete tags no project links to any more."""
+    return db.execute(
+        delete(SkillTag).where(~exists().where(links_table.c.tag_id == SkillTag.tag_id))
+    ).rowcount
+
+
+def ensure_links(db: Session) -> int:
+    """Link projects that have no tags yet (first run, pre-tag data). Returns how many."""
+    rows = db.execute(
+        select(Projects.pro_id, ReqSkill)
+        .join(ReqSkill, Projects.req_skill_id == ReqSkill.req_skill_id)
+        .where(~exists().where(links_table.c.project_id == Projects.pro_id))
+    ).all()
+    reconcile(db, {pro_id: skill for pro_id, skill in rows})
+    return sum(1 for _pro_id, skill in rows if tags_for(skill))
+
+
+# ---------------------------
+#       FACETS
+# ---------------------------
+
+def facets(db: Session, slugs: list[str], kind: Optional[str] = None, limit: int = 100) -> dict:
+    """
+    Tag counts and project list for the projects carrying every tag in
+    ``slugs`` (all projects when empty). ``kind`` restricts the counts.
+    3 queries: resolve slugs, count tags, list projects. The reference
+    for ``read_model.Portfolio.facets``, which serves the route.
+    """
+    slugs = list(dict.fromkeys(slugify(s) for s in slugs if slugify(s)))
+    selected = db.execute(
+        select(SkillTag.tag_id, SkillTag.kind, SkillTag.slug, SkillTag.name).where(SkillTag.slug.in_(slugs))
+    ).all() if slugs else []
+    found = {row.slug for row in selected}
+    unknown = [slug for slug in slugs if slug not in found]
+
+    counts = (
+        select(SkillTag.kind, SkillTag.slug, SkillTag.name, func.count().label("count"))
+        .join(links_table, links_table.c.tag_id == SkillTag.tag_id)
+        .group_by(SkillTag.tag_id, SkillTag.kind, SkillTag.slug, SkillTag.name)
+        .order_by(func.count().desc(), SkillTag.name)
+    )
+    projects = (
+        select(Projects.pro_id, Projects.project_name, Projects.project_type, Projects.logo_img)
+        .order_by(Projects.pro_id.desc())
+        .limit(limit)
+    )
+    if unknown:
+        # a tag nobody uses matches no project
+        return {"selected": [dict(r._mapping) for r in selected], "unknown": unknown, "facets": {}, "projects": []}
+    if selected:
+        # one slug can exist under several kinds ("sql" language + database): match any of them
+        groups: dict[str, list[int]] = {}
+        for row in selected:
+            groups.setdefault(row.slug, []).append(row.tag_id)
+        for tag_ids in groups.values():
+            matching = select(links_table.c.project_id).where(links_table.c.tag_id.in_(tag_ids))
+            counts = counts.where(links_table.c.project_id.in_(matching))
+            projects = projects.where(Projects.pro_id.in_(matching))
+    if kind is not None:
+        counts = counts.where(SkillTag.kind == kind)
+
+    grouped: dict[str, list[dict]] = {}
+    for row in db.execute(counts):
+        grouped.setdefault(row.kind, []).append({"slug": row.slug, "name": row.name, "count": row.count})
+    return {
+        "selected": [dict(r._mapping) for r in selected],
+        "unknown": [],
+        "facets": grouped,
+        "projects": [dict(r._mapping) for r in db.execute(projects)],
+    }
@@ -0,0 +1,477 @@
+# app/snapshot.py
+"""
+Static snapshot of the HTML pages.
+
+``python -m app.snapshot`` renders every HTML route (``/``, ``/about``,
+``/skills``, ``/projects``, ``/contact`` and one ``/projects-details/{id}``
+per project) through the app itself into ``SNAPSHOT_DIR``, with ``.gz`` /
+``.br`` siblings and a manifest. While a snapshot is present,
+:class:`SnapshotMiddleware` answers those GETs from it: no session, no
+query, no template.
+
+A page is only served while it is current:
+
+- data pages carry the data version they were rendered at; once this
+  worker sees a newer one (``app.versioning``) the live route answers;
+- ``/about`` renders the age, so it is only valid on the day it was rendered;
+- a template/asset change (``template_fingerprint``) or a request for
+  another host bypasses the whole snapshot. Behind a proxy that
+  terminates TLS the scheme comes from ``X-Forwarded-Proto``.
+
+After a crud write (and whenever a stale page is requested) the snapshot
+is re-planned: every page has a digest of the data it shows — the project
+itself plus the related cards of all projects, or the whole list — and
+only pages whose digest moved are re-rendered; the others are re-stamped
+with the new version. Workers take turns through a lock file and the
+manifest is replaced atomically.
+
+    python -m app.snapshot --base-url https://example.onrender.com
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from datetime import date
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.assets import static_build
+from app.assets.serving import ENCODINGS, accepted_encodings
+from app.http_cache import template_fingerprint
+from app.read_model import Portfolio, read_model
+from app.serialization import encode_projects
+from app.versioning import data_version
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single process, no lock needed
+    fcntl = None
+
+logger = logging.getLogger("Snapshot")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(BASE_DIR, ".snapshot"))
+MANIFEST_PATH = os.path.join(SNAPSHOT_DIR, "manifest.json")
+LOCK_PATH = os.path.join(SNAPSHOT_DIR, ".lock")
+# templates emit absolute URLs, so a snapshot belongs to one host
+SNAPSHOT_BASE_URL = os.getenv("SNAPSHOT_BASE_URL", "http://127.0.0.1:8000")
+
+# pages that show no project data (``/about``: the age changes daily)
+STATIC_PAGES = ("/about", "/skills", "/contact")
+DATED_PAGES = ("/about",)
+LIST_PAGES = ("/", "/projects")
+DETAIL_ROUTE = "/projects-details/{pro_id}"
+
+# set while the snapshot itself renders pages through the app
+_rendering: ContextVar[bool] = ContextVar("snapshot_rendering", default=False)
+
+
+def file_for(path: str) -> str:
+    """``/`` → ``index.html``, ``/projects-details/3`` → ``projects-details/3.html``."""
+    return (path.strip("/") or "index") + ".html"
+
+
+def _digest(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part + b"\0")
+    return digest.hexdigest()[:20]
+
+
+# ---------------------------
+#       PLANNING
+# ---------------------------
+
+class PagePlan(NamedTuple):
+    route: str
+    deps: str  # digest of everything the page shows
+    versioned: bool  # shows project data
+    dated: bool
+
+
+def plan_pages(portfolio: Portfolio) -> tuple[int, dict[str, PagePlan]]:
+    """``(data version, {path: PagePlan})`` of the pages rendered from ``portfolio``."""
+    version = portfolio.version
+    today = date.today().isoformat()
+    projects = portfolio.projects
+
+    project_digests = {p.pro_id: _digest(encode_projects([p])) for p in projects}
+    # the detail page's sidebar + prev/next: every project's card fields and id
+    cards = _digest(json.dumps(
+        [[p.pro_id, p.project_name, p.logo_img, p.description] for p in projects], default=str
+    ).encode())
+    everything = _digest(*(d.encode() for d in project_digests.values()))
+
+    pages = {}
+    for path in STATIC_PAGES:
+        dated = path in DATED_PAGES
+        pages[path] = PagePlan(path, today if dated else "static", False, dated)
+    for path in LIST_PAGES:
+        pages[path] = PagePlan(path, everything, True, False)
+    for pro_id, project_digest in project_digests.items():
+        pages[f"/projects-details/{pro_id}"] = PagePlan(
+            DETAIL_ROUTE, _digest(project_digest.encode(), cards.encode()), True, False
+        )
+    return version, pages
+
+
+# ---------------------------
+#       FILES
+# ---------------------------
+
+def load_manifest() -> Optional[dict]:
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp_path, path)
+
+
+def _remove(path: str):
+    for suffix in ("", *(s for _e, s in ENCODINGS)):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def write_page(path: str, body: bytes) -> list[str]:
+    """Write the page and its precompressed siblings; returns the encodings written."""
+    full_path = os.path.join(SNAPSHOT_DIR, file_for(path))
+    encoded = static_build.compress(body)
+    for encoding, suffix in ENCODINGS:
+        if encoding in encoded:
+            _write_atomic(full_path + suffix, encoded[encoding])
+        elif os.path.exists(full_path + suffix):
+            os.remove(full_path + suffix)
+    _write_atomic(full_path, body)
+    return [encoding for encoding, _suffix in ENCODINGS if encoding in encoded]
+
+
+class _FileLock:
+    """Serialises snapshot writers across gunicorn workers (no-op without ``fcntl``)."""
+
+    def __enter__(self):
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        self._fh = open(LOCK_PATH, "a")
+        if fcntl is not None:
+            fcntl.flock(self._fh, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._fh, fcntl.LOCK_UN)
+        self._fh.close()
+        return False
+
+
+# ---------------------------
+#       RENDERING
+# ---------------------------
+
+async def render_page(app: ASGIApp, base_url: str, path: str) -> tuple[int, bytes]:
+    """GET ``path`` from ``app`` in-process (as the host in ``base_url``); ``(status, body)``."""
+    url = urlsplit(base_url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": url.scheme,
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", url.netloc.encode())],
+        "server": (url.hostname, url.port or (443 if url.scheme == "https" else 80)),
+        "client": ("127.0.0.1", 0),
+    }
+    status, chunks = 500, []
+    request_sent, response_done = False, asyncio.Event()
+
+    async def receive():
+        # streamed responses keep listening for a disconnect until they finish
+        nonlocal request_sent
+        if request_sent:
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_done.set()
+
+    token = _rendering.set(True)
+    try:
+        await app(scope, receive, send)
+    finally:
+        _rendering.reset(token)
+    return status, b"".join(chunks)
+
+
+async def regenerate(app: ASGIApp, base_url: Optional[str] = None, full: bool = False) -> dict:
+    """
+    Bring the snapshot up to date with the database; ``full`` re-renders
+    every page. Returns ``{"rendered", "restamped", "removed", "version"}``.
+    """
+    started = time.perf_counter()
+    lock = _FileLock()
+    await run_in_threadpool(lock.__enter__)
+    try:
+        manifest = await run_in_threadpool(load_manifest) or {}
+        base_url = (base_url or manifest.get("base_url") or SNAPSHOT_BASE_URL).rstrip("/") + "/"
+        fingerprint = template_fingerprint()[0]
+        if manifest.get("fingerprint") != fingerprint or manifest.get("base_url") != base_url:
+            full = True
+        old_pages = manifest.get("pages", {})
+
+        version, plan = plan_pages(await read_model.get_async())
+        today = date.today().isoformat()
+
+        pages, rendered, restamped = {}, 0, 0
+        for path, page in plan.items():
+            old = old_pages.get(path)
+            entry = {
+                "file": file_for(path),
+                "route": page.route,
+                "deps": page.deps,
+                "version": version if page.versioned else None,
+                "date": today if page.dated else None,
+            }
+            unchanged = (
+                not full
+                and old is not None
+                and old["deps"] == page.deps
+                and os.path.exists(os.path.join(SNAPSHOT_DIR, old["file"]))
+            )
+            if unchanged:
+                entry["encodings"] = old["encodings"]
+                restamped += 1
+            else:
+                status, body = await render_page(app, base_url, path)
+                if status != 200:
+                    logger.warning(f"⚠️ {path} answered {status}, left out of the snapshot")
+                    continue
+                entry["encodings"] = await run_in_threadpool(write_page, path, body)
+                rendered += 1
+            pages[path] = entry
+
+        new_manifest = {"base_url": base_url, "fingerprint": fingerprint, "version": version, "pages": pages}
+        await run_in_threadpool(
+            _write_atomic, MANIFEST_PATH, json.dumps(new_manifest, indent=2, sort_keys=True).encode()
+        )
+        removed = [path for path in old_pages if path not in pages]
+        for path in removed:
+            await run_in_threadpool(_remove, os.path.join(SNAPSHOT_DIR, old_pages[path]["file"]))
+    finally:
+        await run_in_threadpool(lock.__exit__, None, None, None)
+
+    logger.info(
+        f"📸 Snapshot v{version}: {rendered} rendered, {restamped} unchanged, {len(removed)} removed "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return {"rendered": rendered, "restamped": restamped, "removed": len(removed), "version": version}
+
+
+class Regenerator:
+    """Runs :func:`regenerate` on the app's event loop, coalescing requests."""
+
+    def __init__(self):
+        self._app: Optional[ASGIApp] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending = False
+        self._stale_key = None
+
+    def start(self, app: ASGIApp):
+        self._app = app
+        self._loop = asyncio.get_running_loop()
+
+    def schedule(self):
+        """Thread-safe; no-op unless the app is running and a snapshot exists."""
+        if self._loop is None or not os.path.exists(MANIFEST_PATH):
+            return
+        self._loop.call_soon_threadsafe(self._kick)
+
+    def schedule_stale(self, key):
+        """Once per ``key`` (data version, day): a stale page was requested."""
+        if key != self._stale_key:
+            self._stale_key = key
+            self.schedule()
+
+    def _kick(self):
+        self._pending = True
+        if self._task is None or self._task.done():
+            self._task = self._loop.create_task(self._run())
+
+    async def _run(self):
+        while self._pending:
+            self._pending = False
+            try:
+                await regenerate(self._app)
+            except Exception as e:
+                logger.exception(f"❌ Snapshot regeneration failed: {e}")
+
+    async def stop(self):
+        self._pending = False
+        if self._task is not None:
+            await self._task
+        self._loop = None
+
+
+regenerator = Regenerator()
+
+
+# ---------------------------
+#       SERVING
+# ---------------------------
+
+def public_base_url(scope: Scope) -> str:
+    """The base URL the client used; a TLS-terminating proxy reports its scheme in ``X-Forwarded-Proto``."""
+    request = Request(scope)
+    base = urlsplit(str(request.base_url))
+    proto = request.headers.get("x-forwarded-proto", "").split(",")[0].strip().lower()
+    if proto in ("http", "https"):
+        base = base._replace(scheme=proto)
+    return base.geturl()
+
+
+class SnapshotMiddleware:
+    """Answers snapshotted GETs from the snapshot while they are current."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._mtime = None
+        self._manifest: Optional[dict] = None
+        self._bodies: dict[tuple[str, str], bytes] = {}
+
+    def _current_manifest(self) -> Optional[dict]:
+        try:
+            mtime = os.stat(MANIFEST_PATH).st_mtime_ns
+        except FileNotFoundError:
+            self._mtime, self._manifest = None, None
+            return None
+        if mtime != self._mtime:
+            self._mtime, self._manifest, self._bodies = mtime, load_manifest(), {}
+        return self._manifest
+
+    def _body(self, entry: dict, encoding: str) -> Optional[bytes]:
+        key = (entry["file"], encoding)
+        if key not in self._bodies:
+            suffix = dict(ENCODINGS).get(encoding, "")
+            try:
+                with open(os.path.join(SNAPSHOT_DIR, entry["file"]) + suffix, "rb") as fh:
+                    self._bodies[key] = fh.read()
+            except FileNotFoundError:
+                return None
+        return self._bodies[key]
+
+    def _lookup(self, scope: Scope) -> Optional[dict]:
+        manifest = self._current_manifest()
+        if manifest is None:
+            return None
+        entry = manifest["pages"].get(scope["path"])
+        if entry is None:
+            return None
+        if manifest["fingerprint"] != template_fingerprint()[0]:
+            return None
+        if public_base_url(scope) != manifest["base_url"]:
+            return None
+
+        if entry["version"] is not None and data_version.version is None:
+            # watcher not started yet: can't tell whether the page is current
+            return None
+        today = date.today().isoformat()
+        stale = (
+            (entry["date"] is not None and entry["date"] != today)
+            or (entry["version"] is not None and entry["version"] < data_version.version)
+        )
+        if stale:
+            regenerator.schedule_stale((data_version.version, today))
+            return None
+        return entry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or scope.get("query_string")
+            or _rendering.get()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        entry = self._lookup(scope)
+        if entry is None:
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        encoding = next(
+            (e for e, _suffix in ENCODINGS if e in entry["encodings"] and (e in accepted or "*" in accepted)),
+            "identity",
+        )
+        body = self._body(entry, encoding)
+        if body is None:
+            await self.app(scope, receive, send)
+            return
+
+        # labels the /metrics series (no router match happens)
+        scope["snapshot_route"] = entry["route"]
+        headers = [
+            (b"content-type", b"text/html; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+            (b"vary", b"Accept-Encoding"),
+            (b"x-snapshot", b"HIT"),
+        ]
+        if encoding != "identity":
+            headers.append((b"content-encoding", encoding.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+
+# ---------------------------
+#       CLI
+# ---------------------------
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(name)s | %(message)s")
+    parser = argparse.ArgumentParser(description="Render every HTML page into SNAPSHOT_DIR.")
+    parser.add_argument("--base-url", default=None,
+                        help=f"public URL the pages are served from (default: SNAPSHOT_BASE_URL, {SNAPSHOT_BASE_URL})")
+    parser.add_argument("--incremental", action="store_true", help="only re-render pages whose data changed")
+    args = parser.parse_args(argv)
+
+    from app.main import app
+
+    base_url = args.base_url or SNAPSHOT_BASE_URL
+    stats = asyncio.run(regenerate(app, base_url, full=not args.incremental))
+    print(f"📸 {stats['rendered']} pages rendered into {SNAPSHOT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,75 @@
 # app/startup.py
+"""
+The one seeding entry point.
+
+Every gunicorn worker runs the lifespan handler, but only the worker that
+wins the ``seed`` lock syncs the seed data. The others wait up to
+``SEED_LOCK_WAIT_SECONDS`` for it to finish (so they start serving fresh
+data) and then skip.
+"""
 
-from app.database import SessionLocal
-from app import crud, seed_data
 import logging
+import os
+import time
+from contextlib import contextmanager
+
+from app.locks import NamedLock
+from app import crud, database, search, seed_data, skill_tags
+from app.read_model import read_model
 
 logger = logging.getLogger("Startup")
 
+SEED_LOCK_NAME = "seed"
+SEED_LOCK_WAIT_SECONDS = float(os.getenv("SEED_LOCK_WAIT_SECONDS", "10"))
+
+
+@contextmanager
+def _phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.info(f"⏱ seed phase '{name}' took {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+def run_seed(wait_seconds: float = SEED_LOCK_WAIT_SECONDS) -> bool:
+    """
+    Sync the database with ``seed_data``.
+    Returns True if this process ran the sync, False if another one did.
+    """
+    lock = NamedLock(SEED_LOCK_NAME, database.engine)
+
+    with _phase("lock"):
+        acquired = lock.acquire()
+
+    if not acquired:
+        logger.info("⏭ Seed sync running in another process, waiting for it...")
+        with _phase("wait"):
+            finished = lock.wait_released(wait_seconds)
+        if not finished:
+            logger.warning(f"⚠️ Seed sync still running after {wait_seconds:.0f}s, skipping")
+        return False
 
-def run_migrations_and_seed():
-    db = SessionLocal()
     try:
         logger.info("🚀 Starting database seed process...")
-        # Use the correct function from seed_data.py
-        seed_projects = seed_data.get_seed_projects()
-        crud.sync_projects_with_seed(db, seed_projects)
-        logger.info("✅ Database synced successfully with seed data!")
-    except Exception as e:
-        logger.exception(f"❌ Error during database seeding: {e}")
+        with _phase("load"):
+            seed_projects = seed_data.get_seed_projects()
+        db = database.SessionLocal()
+        try:
+            with _phase("sync"):
+                crud.sync_projects_with_seed(db, seed_projects)
+            with _phase("backfill"):
+                # projects written before search / skill tags existed (or outside the crud paths)
+                if search.ensure_documents(db) + skill_tags.ensure_links(db):
+                    db.commit()
+                    search.fallback_index.invalidate()
+                    read_model.invalidate()
+            logger.info("✅ Database synced successfully with seed data!")
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"❌ Error during database seeding: {e}")
+        finally:
+            db.close()
     finally:
-        db.close()
+        lock.release()
+    return True
@@ -0,0 +1,165 @@
+# app/templating.py
+"""
+Jinja environment shared by every route.
+
+Compiled templates are persisted in a ``FileSystemBytecodeCache`` that all
+workers on the host share, and can be compiled ahead of time so the first
+request after a deploy doesn't pay for parsing ``index.html`` and its
+includes:
+
+    python -m app.templating          # build step: fill the bytecode cache
+
+At startup ``precompile()`` loads every template into the in-memory cache
+(straight from bytecode when the build step ran).
+
+Pages with ``{% flush %}`` tags can be streamed (:func:`stream_template`):
+everything up to a tag — the ``<head>`` with its stylesheets, the navbar —
+is sent while the rest is still rendering, so the browser starts fetching
+CSS and fonts before the project sections are done.
+"""
+
+import logging
+import os
+import time
+from typing import AsyncIterator, Iterator
+
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, nodes, select_autoescape
+from jinja2.ext import Extension
+from starlette.responses import Response
+
+from app.assets import bundle, critical, responsive, static_manifest
+from app.instrumentation import instrument_templates, record_render
+
+logger = logging.getLogger("Templating")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR", os.path.join(BASE_DIR, ".jinja_cache"))
+
+# "0" in production: skip the per-render stat() of every template file
+JINJA_AUTO_RELOAD = os.getenv("JINJA_AUTO_RELOAD", "1") == "1"
+# "0": stream_template() renders the whole page before sending it
+STREAM_TEMPLATES = os.getenv("STREAM_TEMPLATES", "1") == "1"
+
+FLUSH_MARKER = "<!--flush-->"
+
+
+# ---------------------------
+#       STREAMING
+# ---------------------------
+
+class FlushExtension(Extension):
+    """``{% flush %}``: end of one streamed chunk. Emits nothing in the page."""
+    tags = {"flush"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        return nodes.Output([nodes.TemplateData(FLUSH_MARKER)], lineno=lineno)
+
+
+class StreamingTemplate(Template):
+    """``render()`` drops the flush markers; :meth:`chunks` splits on them."""
+
+    def new_context(self, vars=None, shared=False, locals=None):
+        # top-level renders only: includes share their parent's context
+        if not shared:
+            vars = {**(vars or {}), "page_template": self.name}
+        return super().new_context(vars, shared, locals)
+
+    def render(self, *args, **kwargs) -> str:
+        return super().render(*args, **kwargs).replace(FLUSH_MARKER, "")
+
+    def chunks(self, context: dict) -> Iterator[str]:
+        """``generate()`` output joined into one string per ``{% flush %}`` section."""
+        buffer = []
+        started = time.perf_counter()
+        for piece in self.generate(context):
+            if FLUSH_MARKER not in piece:
+                buffer.append(piece)
+                continue
+            *finished, rest = piece.split(FLUSH_MARKER)
+            for part in finished:
+                buffer.append(part)
+                chunk = "".join(buffer)
+                buffer = []
+                if chunk:
+                    # render time only, not the time spent waiting to send
+                    record_render(time.perf_counter() - started)
+                    yield chunk
+                    started = time.perf_counter()
+            buffer.append(rest)
+        chunk = "".join(buffer)
+        record_render(time.perf_counter() - started)
+        if chunk:
+            yield chunk
+
+
+def create_environment() -> Environment:
+    os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=select_autoescape(),
+        bytecode_cache=FileSystemBytecodeCache(BYTECODE_CACHE_DIR),
+        auto_reload=JINJA_AUTO_RELOAD,
+        extensions=[FlushExtension],
+    )
+    env.template_class = StreamingTemplate
+    # static_url() resolves through the fingerprint manifest;
+    # picture_sources() / srcset() for the responsive image variants;
+    # critical_css() for the page's above-the-fold CSS; bundle_url() for the
+    # self-hosted CSS/JS bundles
+    static_manifest.register(env)
+    responsive.register(env)
+    critical.register(env)
+    bundle.register(env)
+    # render time per request (Server-Timing, /metrics)
+    instrument_templates(env)
+    return env
+
+
+def template_names(env: Environment) -> list[str]:
+    return [name for name in env.list_templates(extensions=["html"])]
+
+
+def precompile(env: Environment) -> dict[str, float]:
+    """Compile (or load from bytecode) every template; returns ms per template."""
+    timings = {}
+    for name in template_names(env):
+        started = time.perf_counter()
+        env.get_template(name)
+        timings[name] = (time.perf_counter() - started) * 1000
+    logger.info(f"🧩 {len(timings)} templates ready in {sum(timings.values()):.1f} ms")
+    return timings
+
+
+templates = Jinja2Templates(env=create_environment())
+
+
+async def _sections(template: StreamingTemplate, context: dict) -> AsyncIterator[str]:
+    # rendered on the event loop like TemplateResponse; each section is
+    # handed to the server before the next one starts
+    for chunk in template.chunks(context):
+        yield chunk
+
+
+def stream_template(name: str, context: dict, status_code: int = 200) -> Response:
+    """
+    Like ``templates.TemplateResponse``, but each ``{% flush %}`` section is
+    sent as soon as it has rendered. The status goes out first, so decide
+    404s before calling this.
+    """
+    if not STREAM_TEMPLATES:
+        return templates.TemplateResponse(name, context, status_code=status_code)
+    template = templates.get_template(name)
+    return StreamingResponse(_sections(template, context), status_code=status_code, media_type="text/html")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    precompile(templates.env)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# app/upsert.py
+"""Dialect-specific ``insert()`` for statements that need ON CONFLICT."""
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# dialects whose ``insert()`` supports ON CONFLICT ... RETURNING
+INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def supports_upsert(db: Session) -> bool:
+    return db.get_bind().dialect.name in INSERTS
+
+
+def insert_for(db: Session):
+    """The ``insert`` construct for ``db``'s dialect."""
+    return INSERTS[db.get_bind().dialect.name]
@@ -0,0 +1,170 @@
+# app/versioning.py
+"""
+Cross-worker "data generation" stamp.
+
+Every project write bumps the single ``data_version`` row inside its own
+transaction. Each worker runs a :class:`DataVersionWatcher` thread that
+learns about bumps from other workers:
+
+- Postgres: ``LISTEN portfolio_data_version`` (the bump issues
+  ``pg_notify``, delivered at commit), with a periodic re-read as safety net.
+- Anything else (SQLite stand-in, or Postgres behind a transaction
+  pooler — ``DB_EXTERNAL_POOLER``): plain polling every
+  ``DATA_VERSION_POLL_SECONDS``.
+
+Request handlers read ``data_version.version`` from memory, so staleness
+checks never cost a query per request. A worker that performs a write
+calls ``refresh()`` itself and sees its own bump immediately.
+"""
+
+import logging
+import os
+import select
+import threading
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.models import DataVersion
+
+logger = logging.getLogger("DataVersion")
+
+CHANNEL = "portfolio_data_version"
+ROW_ID = 1
+
+DATA_VERSION_POLL_SECONDS = float(os.getenv("DATA_VERSION_POLL_SECONDS", "5"))
+
+
+# ---------------------------
+#       WRITE SIDE
+# ---------------------------
+
+def bump(db: Session):
+    """
+    Increment the data generation. Call before ``db.commit()`` so the bump
+    lands in the same transaction as the write it describes.
+    """
+    result = db.execute(
+        update(DataVersion)
+        .where(DataVersion.id == ROW_ID)
+        .values(version=DataVersion.version + 1, updated_at=func.now())
+    )
+    if result.rowcount == 0:
+        db.add(DataVersion(id=ROW_ID, version=1))
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(func.pg_notify(CHANNEL, "").select())
+
+
+def read(db: Session) -> tuple[int, Optional[datetime]]:
+    """Return ``(version, updated_at)``; ``(0, None)`` before the first write."""
+    row = db.get(DataVersion, ROW_ID, populate_existing=True)
+    if row is None:
+        return 0, None
+    return row.version, row.updated_at
+
+
+# ---------------------------
+#       WATCHER
+# ---------------------------
+
+class DataVersionWatcher:
+    """Keeps this worker's view of the data generation current."""
+
+    def __init__(self, poll_interval: float = DATA_VERSION_POLL_SECONDS):
+        self.poll_interval = poll_interval
+        self.version: Optional[int] = None
+        self.updated_at: Optional[datetime] = None
+        self._callbacks: list[Callable[[int], None]] = []
+        self._engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[int], None]):
+        """``callback(new_version)`` runs (in the watcher thread) on every change."""
+        self._callbacks.append(callback)
+
+    def refresh(self, db: Optional[Session] = None) -> bool:
+        """
+        Re-read the stamp; fire callbacks if it moved. Returns True on change.
+        Writers pass their own session: checking out a second connection
+        while holding one can deadlock a small pool.
+        """
+        if self._engine is None:
+            return False
+        with self._lock:
+            if db is not None:
+                version, updated_at = read(db)
+            else:
+                with Session(self._engine) as own:
+                    version, updated_at = read(own)
+            if version == self.version:
+                return False
+            previous, self.version, self.updated_at = self.version, version, updated_at
+        if previous is not None:
+            logger.info(f"🔄 Data version {previous} → {version}")
+            for callback in self._callbacks:
+                try:
+                    callback(version)
+                except Exception:
+                    logger.exception("Data version callback failed")
+        return True
+
+    def start(self, engine: Engine):
+        if self._thread is not None:
+            return
+        self._engine = engine
+        self._stop.clear()
+        self.refresh()
+        self._thread = threading.Thread(target=self._run, name="data-version-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    # -- loops --
+
+    def _run(self):
+        from app.pooling import EXTERNAL_POOLER
+
+        while not self._stop.is_set():
+            try:
+                if self._engine.dialect.name == "postgresql" and not EXTERNAL_POOLER:
+                    self._listen()
+                else:
+                    self._poll()
+            except Exception:
+                logger.exception("Data version watcher error, falling back to polling")
+                self._poll()
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            self.refresh()
+
+    def _listen(self):
+        raw = self._engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            # re-read once: a bump may have landed before LISTEN took effect
+            self.refresh()
+            while not self._stop.is_set():
+                ready, _, _ = select.select([conn], [], [], self.poll_interval)
+                if ready:
+                    conn.poll()
+                    conn.notifies.clear()
+                # notification or timeout → re-read (timeout covers lost notifies)
+                self.refresh()
+        finally:
+            raw.invalidate()
+
+
+data_version = DataVersionWatcher()
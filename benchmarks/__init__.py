@@ -0,0 +1,11 @@
+# benchmarks/__init__.py
+"""
+Performance checks for the portfolio app.
+
+Every script boots the app against a throw-away SQLite database
+(``DATABASE_URL`` is set by :mod:`benchmarks.common` before ``app`` is
+imported), so they can be run locally with::
+
+    pip install -r requirements.txt -r benchmarks/requirements.txt
+    python -m benchmarks.query_count
+"""
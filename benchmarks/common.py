@@ -0,0 +1,68 @@
+# benchmarks/common.py
+"""Shared helpers: throw-away database, statement counter."""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+# Must happen before ``app.database`` is imported anywhere.
+_DB_DIR = tempfile.mkdtemp(prefix="portfolio-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_DB_DIR, 'bench.db')}")
+os.environ.setdefault("SNAPSHOT_DIR", os.path.join(_DB_DIR, "snapshot"))
+
+from sqlalchemy import event  # noqa: E402
+
+from app.database import Base, engine, async_engine, SessionLocal  # noqa: E402
+from app import models  # noqa: E402,F401
+from app.cache import page_cache  # noqa: E402
+from app.read_model import read_model  # noqa: E402
+from app.search import fallback_index  # noqa: E402
+from app.serialization import project_json  # noqa: E402
+from app.snapshot import SNAPSHOT_DIR  # noqa: E402
+
+
+def reset_db():
+    """Drop and recreate every table (and forget any cached pages/JSON/search index/read model/snapshot)."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    page_cache.clear()
+    project_json.invalidate()
+    fallback_index.invalidate()
+    read_model.invalidate()
+    shutil.rmtree(SNAPSHOT_DIR, ignore_errors=True)
+
+
+class QueryCounter:
+    """Counts SQL statements executed on the sync and async engines while active."""
+
+    def __init__(self, binds=(engine, async_engine.sync_engine)):
+        self.binds = binds
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self.statements = []
+        for bind in self.binds:
+            event.listen(bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        for bind in self.binds:
+            event.remove(bind, "before_cursor_execute", self._on_execute)
+        return False
+
+
+@contextmanager
+def session():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
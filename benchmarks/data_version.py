@@ -0,0 +1,48 @@
+# benchmarks/data_version.py
+"""
+Cross-worker staleness propagation.
+
+Two watchers stand in for two gunicorn workers sharing one database. A
+write through ``crud`` on "worker A" must be seen by "worker B"'s watcher
+within one poll interval (or immediately via LISTEN/NOTIFY on Postgres).
+Point ``DATABASE_URL`` at a local Postgres to exercise the LISTEN path.
+
+    python -m benchmarks.data_version
+"""
+
+import sys
+import threading
+import time
+
+from benchmarks.common import engine, reset_db, session
+from benchmarks.factories import make_project
+
+from app import crud
+from app.versioning import DataVersionWatcher
+
+POLL_INTERVAL = 0.2
+
+
+def main() -> int:
+    reset_db()
+    worker_b = DataVersionWatcher(poll_interval=POLL_INTERVAL)
+    seen = threading.Event()
+    worker_b.subscribe(lambda _version: seen.set())
+    worker_b.start(engine)
+    try:
+        started = time.perf_counter()
+        with session() as db:  # "worker A"
+            crud.create_or_update_project(db, make_project(0))
+        ok = seen.wait(timeout=POLL_INTERVAL * 10)
+        elapsed = (time.perf_counter() - started) * 1000
+    finally:
+        worker_b.stop()
+
+    mode = "LISTEN/NOTIFY" if engine.dialect.name == "postgresql" else "polling"
+    print(f"dialect={engine.dialect.name} mode={mode} poll_interval={POLL_INTERVAL}s")
+    print(f"version seen by other worker: {worker_b.version}  after {elapsed:.1f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# benchmarks/factories.py
+"""Synthetic projects shaped like the entries in ``app/seed_data.py``."""
+
+from datetime import date
+
+from app import schemas
+
+_TYPES = ["Web Site", "Mobile App", "REST API", "Desktop App"]
+_IMAGES = [
+    "images/project/oneup/dashboard.png",
+    "images/project/oneup/orders.png",
+    "images/project/teens/main.png",
+    "images/project/rosevalley/homepage.png",
+]
+
+
+def make_project(i: int) -> schemas.ProjectCreate:
+    """Return the ``i``-th synthetic project (deterministic)."""
+    return schemas.ProjectCreate(
+        project_name=f"Synthetic Project {i:05d}",
+        project_nickname=f"Synthetic{i}",
+        project_type=_TYPES[i % len(_TYPES)],
+        description=[f"Synthetic project number {i} used for benchmarking."],
+        my_roll_obj=schemas.MyRollBase(
+            roll_title=f"Role {i % 5}",
+            roll_topic=["Built REST APIs", "Wrote templates"],
+        ),
+        req_skill_obj=schemas.ReqSkillBase(
+            language="Python",
+            frameworks=f"Django, FastAPI, Framework{i}",
+            tools="Git, Docker",
+            database="PostgreSQL",
+        ),
+        key_achievement=["Shipped on time"],
+        images=[_IMAGES[(i + k) % len(_IMAGES)] for k in range(3)],
+        logo_img="images/project/oneup/oneup.svg",
+        main_image="images/project/oneup/oneup.svg",
+        github_link="https://github.com/example/project",
+        website_link="",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 6, 1),
+    )
+
+
+def make_projects(n: int) -> list[schemas.ProjectCreate]:
+    return [make_project(i) for i in range(n)]
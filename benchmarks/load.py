@@ -0,0 +1,347 @@
+# benchmarks/load.py
+"""
+In-process load test of every route.
+
+Boots ``app.main:app`` on an httpx ASGI transport (no sockets, no server)
+against a freshly seeded database — the temporary SQLite from
+``benchmarks.common``, or a local Postgres via ``DATABASE_URL`` — and
+drives each scenario with ``--concurrency`` concurrent clients.
+
+Per scenario: throughput, p50/p95/p99 latency, time to first byte (when
+the first body chunk left the app; the transport itself buffers) and SQL
+statements per request. Results are written as JSON (git commit,
+database, settings, numbers) so runs can be compared across commits with
+``--compare``.
+
+    python -m benchmarks.load
+    python -m benchmarks.load --scale 100 1000 5000 --requests 300
+    python -m benchmarks.load --cold            # page/JSON caches disabled
+    python -m benchmarks.load --snapshot        # HTML from app.snapshot
+    STREAM_TEMPLATES=0 python -m benchmarks.load  # pages rendered in one piece
+    python -m benchmarks.load --compare benchmarks/results/<older>.json
+
+Each client times a request from when it sends it, so a page rendered in
+one blocking piece hides the wait of the requests queued behind it, while
+a streamed page hands the event loop over between sections. Compare TTFB
+at ``--concurrency 1``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from benchmarks.common import QueryCounter, engine, reset_db, session
+from benchmarks.factories import make_project, make_projects
+
+import httpx
+
+from app import crud
+from app.cache import page_cache
+from app.main import app
+from app.serialization import project_json
+from app.snapshot import regenerate, regenerator
+from app.templating import STREAM_TEMPLATES
+from app.versioning import data_version
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# name → (method, url template); {pro_id} / {delete_id} are filled per request
+SCENARIOS = {
+    "index": ("GET", "/"),
+    "projects": ("GET", "/projects"),
+    "project_detail": ("GET", "/projects-details/{pro_id}"),
+    "about": ("GET", "/about"),
+    "search_page": ("GET", "/search?q=django"),
+    "not_found": ("GET", "/no-such-page"),
+    "api_list": ("GET", "/api/projects"),
+    "api_list_fields": ("GET", "/api/projects?fields=project_name,logo_img"),
+    "api_search": ("GET", "/api/search?q=django"),
+    "api_facets": ("GET", "/api/skills/facets?tag=django"),
+    "api_upsert": ("POST", "/api/projects"),
+    "api_delete": ("DELETE", "/api/projects/{delete_id}"),
+}
+# expected status per scenario (anything else counts as an error)
+EXPECTED_STATUS = {"not_found": 404}
+
+
+@dataclass
+class Result:
+    scenario: str
+    projects: int
+    requests: int
+    concurrency: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    ttfb_p50_ms: float
+    ttfb_p95_ms: float
+    sql_per_request: float
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted ``samples``."""
+    if not samples:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(RESULTS_DIR),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ---------------------------
+#       SEEDING
+# ---------------------------
+
+def seed(n: int, deletable: int) -> tuple[list[int], list[int]]:
+    """Seed ``n`` synthetic projects plus ``deletable`` throw-away ones for the DELETE scenario."""
+    reset_db()
+    with session() as db:
+        crud.sync_projects_with_seed(db, make_projects(n + deletable))
+        ids = [p.pro_id for p in crud.get_projects(db)]
+    # make_projects numbers from 0, ids come back newest first
+    ids.sort()
+    return ids[:n], ids[n:]
+
+
+# ---------------------------
+#       DRIVER
+# ---------------------------
+
+class FirstByteTimer:
+    """ASGI wrapper noting when each request's first body byte leaves the app."""
+
+    HEADER = "x-bench-request"
+
+    def __init__(self, app):
+        self.app = app
+        self.first_byte: dict[bytes, float] = {}
+        self._ids = itertools.count()
+
+    def next_id(self) -> str:
+        return str(next(self._ids))
+
+    async def __call__(self, scope, receive, send):
+        request_id = dict(scope.get("headers", ())).get(self.HEADER.encode()) if scope["type"] == "http" else None
+        if request_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def timed_send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                self.first_byte.setdefault(request_id, time.perf_counter())
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+
+async def run_scenario(
+        client: httpx.AsyncClient,
+        timer: FirstByteTimer,
+        name: str,
+        make_request: Callable[[int], tuple[str, str, Optional[dict]]],
+        total: int,
+        concurrency: int,
+        n_projects: int,
+) -> Result:
+    latencies: list[float] = []
+    ttfbs: list[float] = []
+    errors = 0
+    next_index = 0
+    expected = EXPECTED_STATUS.get(name, 200)
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            method, url, body = make_request(i)
+            request_id = timer.next_id()
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body, headers={timer.HEADER: request_id})
+            finished = time.perf_counter()
+            latencies.append((finished - started) * 1000)
+            # empty bodies (204) count as complete responses
+            ttfbs.append((timer.first_byte.pop(request_id.encode(), finished) - started) * 1000)
+            if response.status_code != expected:
+                errors += 1
+
+    with QueryCounter() as counter:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ttfbs.sort()
+    return Result(
+        scenario=name,
+        projects=n_projects,
+        requests=total,
+        concurrency=concurrency,
+        errors=errors,
+        throughput_rps=round(total / elapsed, 1),
+        p50_ms=round(percentile(latencies, 50), 2),
+        p95_ms=round(percentile(latencies, 95), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+        mean_ms=round(statistics.mean(latencies), 2),
+        ttfb_p50_ms=round(percentile(ttfbs, 50), 2),
+        ttfb_p95_ms=round(percentile(ttfbs, 95), 2),
+        sql_per_request=round(counter.count / total, 2),
+    )
+
+
+async def run_suite(n_projects: int, args) -> list[Result]:
+    selected = [s for s in SCENARIOS if not args.only or s in args.only]
+    deletable = args.requests if "api_delete" in selected else 0
+    pro_ids, delete_ids = seed(n_projects, deletable)
+    if args.snapshot:
+        # snapshot pages are served only while they match the watched data version
+        data_version.start(engine)
+        data_version.refresh()
+        await regenerate(app, "http://testserver", full=True)
+    upsert_body = make_project(0).model_dump(mode="json")
+
+    def make_request(name: str) -> Callable[[int], tuple[str, str, Optional[dict]]]:
+        method, template = SCENARIOS[name]
+
+        def build(i: int):
+            ids = {"pro_id": pro_ids[i % len(pro_ids)]}
+            if delete_ids:
+                ids["delete_id"] = delete_ids[i % len(delete_ids)]
+            return method, template.format(**ids), upsert_body if method == "POST" else None
+
+        return build
+
+    results = []
+    timer = FirstByteTimer(app)
+    transport = httpx.ASGITransport(app=timer)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for name in selected:
+            if args.warmup and SCENARIOS[name][0] == "GET":
+                await run_scenario(client, timer, name, make_request(name), args.warmup, 1, n_projects)
+            results.append(await run_scenario(
+                client, timer, name, make_request(name), args.requests, args.concurrency, n_projects,
+            ))
+    return results
+
+
+# ---------------------------
+#       REPORTING
+# ---------------------------
+
+COLUMNS = (
+    "projects", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "ttfb_p50_ms", "ttfb_p95_ms",
+    "sql_per_request",
+)
+
+
+def print_table(results: list[Result], baseline: Optional[dict] = None):
+    print(f"{'scenario':<18}" + "".join(f"{c:>16}" for c in COLUMNS))
+    for result in results:
+        row = asdict(result)
+        line = f"{result.scenario:<18}" + "".join(f"{row[c]:>16}" for c in COLUMNS)
+        old = (baseline or {}).get((result.scenario, result.projects))
+        if old and old["p95_ms"]:
+            change = (result.p95_ms - old["p95_ms"]) / old["p95_ms"] * 100
+            line += f"   p95 {change:+.0f}% vs baseline"
+        if old and old.get("ttfb_p95_ms"):
+            change = (result.ttfb_p95_ms - old["ttfb_p95_ms"]) / old["ttfb_p95_ms"] * 100
+            line += f", TTFB p95 {change:+.0f}%"
+        print(line)
+
+
+def load_baseline(path: str) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    return {(r["scenario"], r["projects"]): r for r in data["results"]}
+
+
+def write_results(results: list[Result], args) -> str:
+    commit = git_commit()
+    meta = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "cold": args.cold,
+        "snapshot": args.snapshot,
+        "stream_templates": STREAM_TEMPLATES,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+    }
+    path = args.output
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(RESULTS_DIR, f"load-{stamp}-{commit or 'nogit'}.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"meta": meta, "results": [asdict(r) for r in results]}, fh, indent=2)
+    return path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="In-process load test of every route.")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--projects", type=int, default=50, help="synthetic projects to seed")
+    parser.add_argument("--scale", type=int, nargs="+", metavar="N",
+                        help="run the suite once per project count (overrides --projects)")
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), help="run just these scenarios")
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests before each GET scenario")
+    parser.add_argument("--cold", action="store_true", help="disable the page and JSON caches")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="export a static snapshot after seeding and serve HTML from it")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/load-<time>-<commit>.json)")
+    parser.add_argument("--compare", metavar="RESULTS_JSON", help="print p95 change against an earlier run")
+    args = parser.parse_args(argv)
+
+    if args.cold:
+        page_cache.ttl = 0
+        project_json.max_entries = 0
+
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    async def run_all() -> list[Result]:
+        # one event loop for every suite: the async engine's pool is bound to it
+        results = []
+        if args.snapshot:
+            # re-render after the write scenarios
+            regenerator.start(app)
+        try:
+            for n in args.scale or [args.projects]:
+                suite = await run_suite(n, args)
+                print_table(suite, baseline)
+                results += suite
+        finally:
+            if args.snapshot:
+                await regenerator.stop()
+                data_version.stop()
+        return results
+
+    results = asyncio.run(run_all())
+    print(f"📄 {write_results(results, args)}")
+    return 1 if any(r.errors for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
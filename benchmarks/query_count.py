@@ -0,0 +1,78 @@
+# benchmarks/query_count.py
+"""
+Per-route SQL statement count at growing portfolio sizes.
+
+The project pages must load in a fixed number of round trips no matter
+how many projects exist. Exits non-zero if any route's count grows with
+the number of projects (i.e. an N+1 lazy load crept back in).
+
+Routes read the in-memory read model, so they issue no SQL once it is
+loaded; loading it after each seed is counted as its own row.
+
+    python -m benchmarks.query_count
+"""
+
+import sys
+
+from benchmarks.common import QueryCounter, reset_db, session
+from benchmarks.factories import make_projects
+
+from fastapi.testclient import TestClient
+
+from app import crud
+from app.main import app
+from app.read_model import read_model
+
+SIZES = (3, 30, 150)
+ROUTES = (
+    "/",
+    "/projects",
+    "/projects-details/{pro_id}",
+    "/api/projects",
+    "/api/projects?cursor={pro_id}",
+    "/api/projects?fields=project_name,main_image",
+    "/api/projects?fields=project_name,images,my_roll_obj",
+    "/api/skills/facets",
+)
+LOAD = "(read model load)"
+
+
+def seed(n: int) -> int:
+    """Seed ``n`` synthetic projects, return the id of one of them."""
+    reset_db()
+    with session() as db:
+        crud.sync_projects_with_seed(db, make_projects(n))
+        return crud.get_projects(db)[0].pro_id
+
+
+def measure() -> dict[str, list[int]]:
+    # no ``with`` block → lifespan (and its seed sync) is not run
+    client = TestClient(app)
+    counts = {route: [] for route in (LOAD,) + ROUTES}
+    for n in SIZES:
+        pro_id = seed(n)
+        with QueryCounter() as counter:
+            read_model.get()
+        counts[LOAD].append(counter.count)
+        for route in ROUTES:
+            with QueryCounter() as counter:
+                response = client.get(route.format(pro_id=pro_id))
+            response.raise_for_status()
+            counts[route].append(counter.count)
+    return counts
+
+
+def main() -> int:
+    counts = measure()
+    failed = False
+    print(f"{'route':<56}" + "".join(f"{n:>8}" for n in SIZES))
+    for route, values in counts.items():
+        constant = len(set(values)) == 1
+        failed |= not constant
+        flag = "" if constant else "   <-- grows with project count"
+        print(f"{route:<56}" + "".join(f"{v:>8}" for v in values) + flag)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# benchmarks/read_model.py
+"""
+In-memory read model vs the ORM path: memory per worker and lookup latency.
+
+- memory: bytes still allocated (``tracemalloc``) after loading every
+  project — the ORM graph held by a session vs a ``read_model.Portfolio``
+  (session closed)
+- latency: median µs per lookup. The ORM column opens a session and runs
+  the queries, like a request did before; the read model column reads
+  the loaded ``Portfolio``.
+
+Both paths must return the same data.
+
+    python -m benchmarks.read_model
+    python -m benchmarks.read_model --sizes 50 1000 --rounds 500
+"""
+
+import argparse
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import reset_db, session
+from benchmarks.factories import make_projects
+
+from app import bulk_sync, crud, queries, skill_tags
+from app.read_model import load, read_model
+from app.serialization import encode_projects
+
+FILTER = queries.ProjectFilter()
+
+
+def retained(build) -> tuple[int, object]:
+    """``(bytes, result)``: memory still allocated once ``build()`` returns."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return size, result
+
+
+def orm_graph():
+    db = session().__enter__()
+    # the session (identity map) keeps the graph alive, as during a request
+    return db, queries.get_projects(db)
+
+
+def read_model_only():
+    with session() as db:
+        return load(db)
+
+
+def median_us(fn, rounds: int) -> float:
+    fn()  # warm-up
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1_000_000
+
+
+def orm(query):
+    def run():
+        with session() as db:
+            return query(db)
+    return run
+
+
+def lookups(pro_id: int, name: str) -> list[tuple[str, object, object, object]]:
+    """``(label, orm lookup, read-model lookup, comparable form)``."""
+    return [
+        ("all projects",
+         orm(queries.get_projects), lambda: read_model.get().projects,
+         encode_projects),
+        ("by pro_id (detail page)",
+         orm(lambda db: queries.get_project_detail(db, pro_id)), lambda: read_model.get().detail(pro_id),
+         lambda d: (encode_projects([d.project]), [r.pro_id for r in d.related], d.prev_id, d.next_id)),
+        ("by name",
+         orm(lambda db: crud.get_project_by_name(db, name)), lambda: read_model.get().by_name[name],
+         lambda p: p.pro_id),
+        ("API page (20)",
+         orm(lambda db: db.scalars(queries.projects_stmt().limit(20)).all()),
+         lambda: read_model.get().page(FILTER, None, 20)[0],
+         encode_projects),
+        ("by skill (facets)",
+         orm(lambda db: skill_tags.facets(db, ["django"])), lambda: read_model.get().facets(["django"]),
+         lambda facets: facets),
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Read model vs ORM: memory and lookup latency.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 1000])
+    parser.add_argument("--rounds", type=int, default=200, help="timed calls per lookup (median reported)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for n in args.sizes:
+        reset_db()
+        with session() as db:
+            bulk_sync.sync_projects_bulk(db, make_projects(n))
+
+        orm_bytes, (db, _projects) = retained(orm_graph)
+        db.close()
+        model_bytes, _portfolio = retained(read_model_only)
+        del _projects, _portfolio
+        started = time.perf_counter()
+        portfolio = read_model.get()
+        load_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\n{n} projects — load {load_ms:.1f} ms")
+        print(f"  {'memory':<26}{'ORM graph':>14}{'read model':>14}")
+        print(f"  {'KiB':<26}{orm_bytes / 1024:>14.1f}{model_bytes / 1024:>14.1f}")
+        print(f"  {'lookup (median µs)':<26}{'ORM':>14}{'read model':>14}{'speed-up':>10}")
+        middle = portfolio.projects[len(portfolio.projects) // 2]
+        for label, slow, fast, comparable in lookups(middle.pro_id, middle.project_name):
+            if comparable(slow()) != comparable(fast()):
+                print(f"  ❌ {label}: read model differs from the ORM result")
+                failed = True
+            orm_us, model_us = median_us(slow, args.rounds), median_us(fast, args.rounds)
+            print(f"  {label:<26}{orm_us:>14.1f}{model_us:>14.2f}{orm_us / model_us:>9.0f}×")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
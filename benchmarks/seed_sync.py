@@ -0,0 +1,59 @@
+# benchmarks/seed_sync.py
+"""
+Round trips per seed run: row-by-row sync vs set-based bulk sync.
+
+For each portfolio size three runs are measured on both paths:
+``initial`` (empty database), ``rerun`` (nothing changed) and ``churn``
+(10% of projects edited, 10% removed).
+
+    python -m benchmarks.seed_sync
+"""
+
+import sys
+import time
+
+from benchmarks.common import QueryCounter, reset_db, session
+from benchmarks.factories import make_projects
+
+from app import bulk_sync, crud
+
+SIZES = (5, 50, 200)
+PATHS = {
+    "one-by-one": crud.sync_projects_one_by_one,
+    "bulk": bulk_sync.sync_projects_bulk,
+}
+
+
+def churn(projects):
+    step = 10
+    kept = [p for i, p in enumerate(projects) if i % step != 1]
+    return [
+        p.model_copy(update={"project_type": "Edited"}) if i % step == 0 else p
+        for i, p in enumerate(kept)
+    ]
+
+
+def measure(sync, projects) -> list[tuple[str, int, float]]:
+    reset_db()
+    results = []
+    for label, payload in (("initial", projects), ("rerun", projects), ("churn", churn(projects))):
+        with session() as db, QueryCounter() as counter:
+            started = time.perf_counter()
+            sync(db, payload)
+            elapsed = (time.perf_counter() - started) * 1000
+        results.append((label, counter.count, elapsed))
+    return results
+
+
+def main() -> int:
+    print(f"{'projects':>8} {'path':<11} {'run':<8} {'statements':>10} {'ms':>9}")
+    for n in SIZES:
+        projects = make_projects(n)
+        for name, sync in PATHS.items():
+            for label, count, elapsed in measure(sync, projects):
+                print(f"{n:>8} {name:<11} {label:<8} {count:>10} {elapsed:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
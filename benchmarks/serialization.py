@@ -0,0 +1,82 @@
+# benchmarks/serialization.py
+"""
+``GET /api/projects`` throughput: ``response_model`` vs pre-serialized bytes.
+
+- ``response_model``: the previous path, Pydantic validation of every
+  ORM row plus FastAPI's JSON encoding on each request
+- ``pre-serialized (cold)``: the cache is emptied before every request,
+  so each one pays the read-model page + ``TypeAdapter.dump_json``
+- ``pre-serialized (warm)``: bytes served from ``project_json``
+
+Both paths must return the same document.
+
+    python -m benchmarks.serialization
+"""
+
+import sys
+import time
+
+from benchmarks.common import reset_db, session
+from benchmarks.factories import make_projects
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import bulk_sync, queries, schemas
+from app.main import app, get_db, API_MAX_PAGE_SIZE
+from app.serialization import project_json
+
+PROJECT_COUNTS = (20, 100)
+ROUNDS = 200
+URL = f"/api/projects?limit={API_MAX_PAGE_SIZE}"
+
+# the pre-change route, kept here only for comparison
+baseline = FastAPI()
+
+
+@baseline.get("/api/projects", response_model=list[schemas.Project])
+def response_model_projects(limit: int, db: Session = Depends(get_db)):
+    return db.scalars(queries.projects_stmt().limit(limit)).all()
+
+
+def throughput(client: TestClient, before=None) -> tuple[float, float]:
+    """(requests/s, mean ms) over ``ROUNDS`` sequential requests."""
+    client.get(URL).raise_for_status()  # warm-up
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        if before is not None:
+            before()
+        client.get(URL).raise_for_status()
+    elapsed = time.perf_counter() - started
+    return ROUNDS / elapsed, elapsed / ROUNDS * 1000
+
+
+def main() -> int:
+    # no ``with`` block → lifespan (and its seed sync) is not run
+    api, old = TestClient(app), TestClient(baseline)
+    failed = False
+    print(f"{'projects':<10}{'path':<26}{'req/s':>10}{'mean ms':>10}{'KiB':>8}")
+    for n in PROJECT_COUNTS:
+        reset_db()
+        with session() as db:
+            bulk_sync.sync_projects_bulk(db, make_projects(n))
+
+        body = api.get(URL)
+        if body.json() != old.get(URL).json():
+            print(f"  ❌ {n} projects: pre-serialized body differs from response_model body")
+            failed = True
+        size = len(body.content) / 1024
+
+        for label, client, before in (
+            ("response_model", old, None),
+            ("pre-serialized (cold)", api, project_json.invalidate),
+            ("pre-serialized (warm)", api, None),
+        ):
+            rps, mean = throughput(client, before)
+            print(f"{n:<10}{label:<26}{rps:>10.0f}{mean:>10.2f}{size:>8.1f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
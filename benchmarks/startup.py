@@ -0,0 +1,153 @@
+# benchmarks/startup.py
+"""
+Cold-start timeline: ``STARTUP_MODE=full`` vs ``STARTUP_MODE=fast``.
+
+Each run is a fresh interpreter (``python -m benchmarks.startup --child``)
+against an already migrated and seeded database, like a free-plan
+instance waking up after a deploy. Times are ms since the process was
+spawned:
+
+- ``python``          interpreter and benchmark harness loaded
+- ``import``          ``app.main`` imported
+- ``accepting``       lifespan startup done, the server would accept now
+- ``engine_ready``    first DB connection opened (any pool)
+- ``first_response``  first ``GET`` answered
+- ``background``      deferred startup work finished (fast mode)
+
+A last row imports the write/background modules the app now loads on
+first use (``DEFERRED_MODULES``) up front, as ``app.main`` used to, so
+the ``import`` column shows what deferring them saves.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --path /projects
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODES = ("full", "fast")
+MARKS = ("python", "import", "accepting", "engine_ready", "first_response", "background")
+# imported by the handlers / lifespan that use them, not with app.main
+DEFERRED_MODULES = (
+    "app.crud", "app.bulk_sync", "app.search", "app.skill_tags", "app.image_links",
+    "app.upsert", "app.startup", "app.locks", "app.seed_data", "app.pooling",
+)
+
+
+# ---------------------------
+#       CHILD
+# ---------------------------
+
+def child(spawned_at: float, path: str, eager_imports: bool = False) -> dict:
+    """One cold start, timed from inside the new process."""
+    marks = {}
+
+    def mark(name: str):
+        marks.setdefault(name, round((time.time() - spawned_at) * 1000, 1))
+
+    import httpx
+    from sqlalchemy import event
+    from sqlalchemy.pool import Pool
+    mark("python")
+
+    if eager_imports:
+        for name in DEFERRED_MODULES:
+            importlib.import_module(name)
+    from app.main import app
+    mark("import")
+    deferred = [name for name in DEFERRED_MODULES if name in sys.modules]
+
+    # class-level: catches whichever engine connects first without creating one
+    event.listen(Pool, "connect", lambda *_args: mark("engine_ready"))
+
+    async def serve():
+        async with app.router.lifespan_context(app):
+            mark("accepting")
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                response = await client.get(path)
+            mark("first_response")
+            if app.state.startup_task is not None:
+                await app.state.startup_task
+            mark("background")
+        return response.status_code
+
+    status = asyncio.run(serve())
+    return {"status": status, "loaded_at_import": deferred, **marks}
+
+
+# ---------------------------
+#       PARENT
+# ---------------------------
+
+def prepare_database():
+    """Schema + seed data, as left behind by ``alembic upgrade head`` and a previous boot."""
+    from benchmarks.common import engine, reset_db
+    from app import startup
+
+    reset_db()
+    startup.run_seed()
+    engine.dispose()
+
+
+def run_child(mode: str, path: str, verbose: bool, eager_imports: bool = False) -> dict:
+    env = {**os.environ, "STARTUP_MODE": mode}
+    spawned_at = time.time()
+    command = [sys.executable, "-m", "benchmarks.startup", "--child", "--spawned-at", repr(spawned_at), "--path", path]
+    if eager_imports:
+        command.append("--eager-imports")
+    proc = subprocess.run(command, env=env, capture_output=True, text=True)
+    if verbose or proc.returncode:
+        sys.stderr.write(proc.stderr)
+    proc.check_returncode()
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start timeline per startup mode.")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per mode (median reported)")
+    parser.add_argument("--path", default="/", help="route requested first")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--verbose", action="store_true", help="show the app's startup logs")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--spawned-at", type=float, help=argparse.SUPPRESS)
+    parser.add_argument("--eager-imports", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(child(args.spawned_at, args.path, args.eager_imports)))
+        return 0
+
+    prepare_database()
+
+    print(f"cold start → GET {args.path}, median of {args.runs} runs (ms since spawn)")
+    print(f"{'mode':<8}" + "".join(f"{m:>15}" for m in MARKS))
+    failed = False
+    imports = {}
+    for mode in args.modes + ["eager"]:
+        eager = mode == "eager"
+        runs = [
+            run_child("fast" if eager else mode, args.path, args.verbose, eager_imports=eager)
+            for _ in range(args.runs)
+        ]
+        failed |= any(r["status"] != 200 for r in runs)
+        medians = {m: statistics.median(r[m] for r in runs if m in r) for m in MARKS}
+        imports[mode] = medians["import"] - medians["python"]
+        print(f"{mode:<8}" + "".join(f"{medians[m]:>15.1f}" for m in MARKS))
+        if not eager and runs[0]["loaded_at_import"]:
+            print(f"  ⚠️ imported with app.main: {', '.join(runs[0]['loaded_at_import'])}")
+    lazy = imports.get("fast", imports[args.modes[0]])
+    print(f"\nimport app.main: {lazy:.1f} ms, {imports['eager']:.1f} ms with {len(DEFERRED_MODULES)} "
+          f"write/background modules imported up front ({imports['eager'] - lazy:+.1f} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
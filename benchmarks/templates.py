@@ -0,0 +1,110 @@
+# benchmarks/templates.py
+"""
+Template compile and render times.
+
+For every page template: cold compile without a bytecode cache, cold load
+from the bytecode cache (what a fresh worker pays after
+``python -m app.templating``), and warm render mean/p95 at realistic
+project counts.
+
+    python -m benchmarks.templates
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.common import reset_db, session
+from benchmarks.factories import make_projects
+
+from jinja2 import FileSystemBytecodeCache
+from starlette.requests import Request
+
+from app import bulk_sync, crud
+from app.main import app
+from app.templating import create_environment, template_names
+
+PROJECT_COUNTS = (5, 50, 500)
+ROUNDS = 30
+PAGES = {
+    "index.html": "/",
+    "projects.html": "/projects",
+    "details_projects.html": "/projects-details/1",
+    "about.html": "/about",
+    "skills.html": "/skills",
+    "contact.html": "/contact",
+    "404.html": "/missing",
+}
+DETAILS = {
+    "name": "Mohammad Sajid Vagh",
+    "intro": "Python & Django developer.",
+    "birth_date": "April 26, 2002",
+    "age": 24,
+}
+
+
+def make_request(path: str) -> Request:
+    return Request({
+        "type": "http", "app": app, "router": app.router, "method": "GET", "path": path,
+        "root_path": "", "scheme": "http", "server": ("testserver", 80),
+        "query_string": b"", "headers": [(b"host", b"testserver")],
+    })
+
+
+def compile_times() -> dict[str, tuple[float, float]]:
+    """ms per template: (no bytecode cache, from bytecode cache)."""
+    cache_dir = tempfile.mkdtemp(prefix="jinja-bench-")
+    results = {}
+    for name in PAGES:
+        timings = []
+        for _ in range(2):  # 1st run fills the bytecode cache, 2nd reads it
+            env = create_environment()
+            env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+            started = time.perf_counter()
+            env.get_template(name)
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = tuple(timings)
+    return results
+
+
+def render_times(projects) -> dict[str, tuple[float, float]]:
+    """ms per template: (mean, p95) of warm renders."""
+    env = create_environment()
+    results = {}
+    for name, path in PAGES.items():
+        template = env.get_template(name)
+        context = {
+            "request": make_request(path),
+            "details": DETAILS,
+            "projects": projects,
+            "project_detail": projects[0],
+        }
+        samples = []
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            template.render(context)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        results[name] = (statistics.mean(samples), samples[int(len(samples) * 0.95) - 1])
+    return results
+
+
+def main() -> int:
+    print("compile (ms)            no-cache  bytecode")
+    for name, (cold, cached) in compile_times().items():
+        print(f"  {name:<22}{cold:>9.2f}{cached:>10.2f}")
+
+    for n in PROJECT_COUNTS:
+        reset_db()
+        with session() as db:
+            bulk_sync.sync_projects_bulk(db, make_projects(n))
+            projects = crud.get_projects(db)
+            print(f"render @ {n} projects (ms)   mean       p95")
+            for name, (mean, p95) in render_times(projects).items():
+                print(f"  {name:<22}{mean:>9.2f}{p95:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+# tests/conftest.py
+"""Tests run against the same throw-away SQLite database as the benchmarks."""
+
+import pytest
+
+from benchmarks.common import reset_db, session
+from benchmarks.factories import make_projects
+
+from app import bulk_sync
+
+
+@pytest.fixture(scope="session")
+def seed():
+    """``seed(n)``: empty database holding ``n`` synthetic projects."""
+    def _seed(n: int):
+        reset_db()
+        with session() as db:
+            bulk_sync.sync_projects_bulk(db, make_projects(n))
+    return _seed
+
+
+@pytest.fixture(scope="module")
+def client():
+    """The full app (lifespan, middleware stack) on a freshly seeded database."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    reset_db()
+    with TestClient(app) as test_client:
+        yield test_client
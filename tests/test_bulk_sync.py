@@ -0,0 +1,118 @@
+# tests/test_bulk_sync.py
+"""Seed sync: the bulk path and the row-by-row fallback."""
+
+import pytest
+from sqlalchemy import select
+
+from benchmarks.common import reset_db, session
+from benchmarks.factories import make_project, make_projects
+
+from app import bulk_sync, crud, queries, schemas, search
+from app.models import MyRoll, ProjectImage, Projects, ProjectSearch, ReqSkill, SkillTag, project_skill_tags
+
+SYNCS = {
+    "bulk": bulk_sync.sync_projects_bulk,
+    "one_by_one": crud.sync_projects_one_by_one,
+}
+
+
+def with_skill(project: schemas.ProjectCreate, language: str) -> schemas.ProjectCreate:
+    skill = project.req_skill_obj.model_copy(update={"language": language})
+    return project.model_copy(update={"req_skill_obj": skill})
+
+
+def skill_languages() -> set[str]:
+    with session() as db:
+        return {row.language for row in db.query(ReqSkill)}
+
+
+@pytest.mark.parametrize("path", SYNCS)
+def test_changed_skill_stack_drops_the_unused_row(path):
+    sync = SYNCS[path]
+    reset_db()
+    with session() as db:
+        sync(db, [with_skill(make_project(0), "Go"), make_project(1)])
+    assert skill_languages() == {"Go", "Python"}
+
+    # only a skill stack changes, nothing is deleted
+    with session() as db:
+        sync(db, [with_skill(make_project(0), "Rust"), make_project(1)])
+    assert skill_languages() == {"Rust", "Python"}
+
+
+@pytest.mark.parametrize("path", SYNCS)
+def test_removed_project_drops_its_skill_row(path):
+    sync = SYNCS[path]
+    reset_db()
+    with session() as db:
+        sync(db, [with_skill(make_project(0), "Go"), make_project(1)])
+    with session() as db:
+        sync(db, [make_project(1)])
+    assert skill_languages() == {"Python"}
+
+
+def renamed(project: schemas.ProjectCreate, name: str) -> schemas.ProjectCreate:
+    return project.model_copy(update={"project_name": name})
+
+
+def edited(project: schemas.ProjectCreate) -> schemas.ProjectCreate:
+    roll = project.my_roll_obj.model_copy(update={"roll_topic": ["Rewrote the API"]})
+    return project.model_copy(update={
+        "description": ["Edited."],
+        "images": list(reversed(project.images))[:2] + ["images/project/new/screen.png"],
+        "my_roll_obj": roll,
+    })
+
+
+SEEDS = [
+    # create
+    make_projects(6),
+    # update: edited text, role topics, reordered/replaced images, a new skill stack
+    [edited(make_project(0)), with_skill(make_project(1), "Go")] + make_projects(6)[2:],
+    # rename project 2, delete projects 4 and 5
+    [edited(make_project(0)), with_skill(make_project(1), "Go"), renamed(make_project(2), "Renamed"),
+     make_project(3)],
+    # delete everything but one
+    [make_project(3)],
+]
+
+
+def dump() -> dict:
+    """Every table a seed sync writes, keyed by names rather than generated ids."""
+    with session() as db:
+        names = dict(db.execute(select(Projects.pro_id, Projects.project_name)).all())
+        tags = {}
+        for project_id, kind, slug in db.execute(
+            select(project_skill_tags.c.project_id, SkillTag.kind, SkillTag.slug)
+            .join(SkillTag, SkillTag.tag_id == project_skill_tags.c.tag_id)
+        ):
+            tags.setdefault(names[project_id], set()).add((kind, slug))
+        return {
+            "projects": {
+                p.project_name: schemas.Project.model_validate(p).model_dump(exclude={"pro_id"})
+                for p in queries.get_projects(db)
+            },
+            "my_roll": sorted((r.roll_title, tuple(r.roll_topic or ())) for r in db.query(MyRoll)),
+            "req_skills": sorted((s.language, s.frameworks, s.tools, s.database) for s in db.query(ReqSkill)),
+            "project_images": sorted(db.scalars(select(ProjectImage.image_path))),
+            "skill_tags": sorted((t.kind, t.slug, t.name) for t in db.query(SkillTag)),
+            "project_skill_tags": tags,
+            "project_search": {names[d.pro_id]: (d.title, d.tags, d.body) for d in db.query(ProjectSearch)},
+        }
+
+
+def test_bulk_and_one_by_one_write_the_same_rows(monkeypatch):
+    # keep project_search documents on SQLite too, so both paths' upkeep of them is compared
+    monkeypatch.setattr(search, "uses_table", lambda _db: True)
+    states = {}
+    for path, sync in SYNCS.items():
+        reset_db()
+        states[path] = []
+        for seed_projects in SEEDS:
+            with session() as db:
+                sync(db, seed_projects)
+            states[path].append(dump())
+
+    for step, (bulk, one_by_one) in enumerate(zip(states["bulk"], states["one_by_one"])):
+        assert bulk == one_by_one, f"seed {step}"
+    assert set(states["bulk"][-1]["projects"]) == set(states["bulk"][-1]["project_search"]) == {make_project(3).project_name}
@@ -0,0 +1,66 @@
+# tests/test_cache.py
+"""A project write drops the cached pages and JSON, end to end through the middleware stack."""
+
+from benchmarks.common import session
+from benchmarks.factories import make_project
+
+from app import crud
+from app.read_model import read_model
+
+
+def new_project(i: int, name: str) -> dict:
+    return make_project(i).model_copy(update={"project_name": name}).model_dump(mode="json")
+
+
+def test_write_drops_the_cached_page_and_its_etag(client):
+    first = client.get("/projects")
+    cached = client.get("/projects")
+    assert (first.headers["x-cache"], cached.headers["x-cache"]) == ("MISS", "HIT")
+    etag = cached.headers["etag"]
+    assert client.get("/projects", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/api/projects", json=new_project(900, "Cache Probe Page")).raise_for_status()
+
+    # the old validator no longer matches: a full, freshly rendered page
+    after = client.get("/projects", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["x-cache"] == "MISS"
+    assert after.headers["etag"] != etag
+    assert "Cache Probe Page" in after.text
+    assert client.get("/projects").headers["x-cache"] == "HIT"
+
+
+def test_write_drops_the_cached_json(client):
+    client.get("/api/projects")
+    assert client.get("/api/projects").headers["x-cache"] == "HIT"
+
+    created = client.post("/api/projects", json=new_project(901, "Cache Probe Json"))
+    after = client.get("/api/projects")
+    assert after.headers["x-cache"] == "MISS"
+    assert created.json()["pro_id"] in [p["pro_id"] for p in after.json()]
+
+    client.delete(f"/api/projects/{created.json()['pro_id']}").raise_for_status()
+    after_delete = client.get("/api/projects")
+    assert after_delete.headers["x-cache"] == "MISS"
+    assert "Cache Probe Json" not in after_delete.text
+
+
+def test_page_rendered_across_a_write_is_not_cached(client, monkeypatch):
+    load = read_model.get_async
+
+    async def load_then_write():
+        # the page renders from the portfolio read before this write
+        portfolio = await load()
+        with session() as db:
+            crud.create_or_update_project(db, make_project(902).model_copy(update={"project_name": "Cache Probe Race"}))
+        return portfolio
+
+    monkeypatch.setattr(read_model, "get_async", load_then_write)
+    stale = client.get("/?race")
+    assert stale.headers["x-cache"] == "MISS"
+    assert "Cache Probe Race" not in stale.text
+    monkeypatch.undo()
+
+    fresh = client.get("/?race")
+    assert fresh.headers["x-cache"] == "MISS"
+    assert "Cache Probe Race" in fresh.text
@@ -0,0 +1,49 @@
+# tests/test_crud.py
+"""A project write and its role/skill rows commit together with the version bump."""
+
+import pytest
+
+from benchmarks.common import session
+from benchmarks.factories import make_project
+
+from app import crud, schemas, versioning
+from app.models import MyRoll, ReqSkill
+
+
+def changed_project() -> schemas.ProjectCreate:
+    """Project 0 with a new role topic list and a skill stack no other project has."""
+    project = make_project(0)
+    return project.model_copy(update={
+        "my_roll_obj": schemas.MyRollBase(roll_title="Role 0", roll_topic=["Rewritten"]),
+        "req_skill_obj": schemas.ReqSkillBase(language="Rust", frameworks="Axum", tools="Cargo", database="SQLite"),
+    })
+
+
+def test_failed_write_leaves_role_and_skill_untouched(seed, monkeypatch):
+    seed(3)
+    with session() as db:
+        version, _updated_at = versioning.read(db)
+
+    def fail(*_args, **_kwargs):
+        raise RuntimeError("write failed")
+
+    monkeypatch.setattr(crud.search, "store", fail)
+    with session() as db, pytest.raises(RuntimeError):
+        crud.create_or_update_project(db, changed_project())
+
+    with session() as db:
+        assert db.query(MyRoll).filter_by(roll_title="Role 0").one().roll_topic == ["Built REST APIs", "Wrote templates"]
+        assert db.query(ReqSkill).filter_by(language="Rust").first() is None
+        assert versioning.read(db)[0] == version
+
+
+def test_write_commits_role_and_skill_with_the_bump(seed):
+    seed(3)
+    with session() as db:
+        version, _updated_at = versioning.read(db)
+        crud.create_or_update_project(db, changed_project())
+
+    with session() as db:
+        assert db.query(MyRoll).filter_by(roll_title="Role 0").one().roll_topic == ["Rewritten"]
+        assert db.query(ReqSkill).filter_by(language="Rust").one() is not None
+        assert versioning.read(db)[0] == version + 1
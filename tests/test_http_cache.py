@@ -0,0 +1,65 @@
+# tests/test_http_cache.py
+"""ETag and Last-Modified move together."""
+
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from app import http_cache
+from app.versioning import data_version
+
+SCOPE = {"type": "http", "path": "/about", "root_path": "", "query_string": b"", "headers": []}
+
+
+@pytest.fixture
+def old_data(monkeypatch):
+    """Data and templates last changed long before today."""
+    long_ago = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(data_version, "version", 1)
+    monkeypatch.setattr(data_version, "updated_at", long_ago)
+    monkeypatch.setattr(http_cache, "template_fingerprint", lambda: ("fingerprint", long_ago))
+
+
+def test_last_modified_is_not_before_today(old_data):
+    _etag, last_modified = http_cache.validators(SCOPE)
+    assert last_modified == datetime.combine(date.today(), time.min).astimezone(timezone.utc)
+
+
+def test_new_day_changes_both_validators(old_data, monkeypatch):
+    etag, last_modified = http_cache.validators(SCOPE)
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    monkeypatch.setattr(http_cache, "date", Tomorrow)
+    next_etag, next_last_modified = http_cache.validators(SCOPE)
+    assert next_etag != etag
+    assert next_last_modified > last_modified
+    # a client that cached yesterday's page revalidates it by date as well
+    headers = http_cache.Headers(headers={"if-modified-since": http_cache.format_datetime(last_modified, usegmt=True)})
+    assert not http_cache.is_not_modified(headers, '"other"', next_last_modified)
+
+
+def test_if_none_match_star_is_not_a_shortcut(client):
+    assert client.get("/no-such-page", headers={"If-None-Match": "*"}).status_code == 404
+    assert client.get("/about", headers={"If-None-Match": "*"}).status_code == 200
+
+
+def test_encoded_snapshot_bodies_get_weak_etags(client):
+    from app.snapshot import regenerate
+
+    client.portal.call(regenerate, client.app, "http://testserver", True)
+    plain = client.get("/about", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/about", headers={"Accept-Encoding": "gzip"})
+    assert plain.headers["x-snapshot"] == gzipped.headers["x-snapshot"] == "HIT"
+    assert gzipped.headers["content-encoding"] == "gzip"
+
+    etag = plain.headers["etag"]
+    assert etag.startswith('"')
+    assert gzipped.headers["etag"] == f"W/{etag}"
+
+    revalidated = client.get("/about", headers={"Accept-Encoding": "gzip", "If-None-Match": f"W/{etag}"})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == f"W/{etag}"
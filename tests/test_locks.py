@@ -0,0 +1,88 @@
+# tests/test_locks.py
+"""The ``app_locks`` row lock (SQLite) and the seed run it guards."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.common import reset_db, session
+from benchmarks.factories import make_projects
+
+from app import database, seed_data, startup
+from app.locks import NamedLock
+from app.models import AppLock
+
+
+@pytest.fixture(autouse=True)
+def empty_db():
+    reset_db()
+
+
+@pytest.fixture
+def seed_runs(monkeypatch):
+    """Counts seed syncs instead of loading the real seed data."""
+    runs = []
+
+    def get_seed_projects():
+        runs.append(time.monotonic())
+        return make_projects(2)
+
+    monkeypatch.setattr(seed_data, "get_seed_projects", get_seed_projects)
+    return runs
+
+
+def test_lock_is_exclusive_until_released():
+    holder, other = NamedLock("test", database.engine), NamedLock("test", database.engine)
+    assert holder.acquire()
+    assert not other.acquire()
+    holder.release()
+    assert other.acquire()
+    other.release()
+
+
+def test_stale_row_is_taken_over():
+    with session() as db:
+        db.add(AppLock(name="test", owner="crashed:1", acquired_at=datetime.now(timezone.utc) - timedelta(hours=1)))
+        db.commit()
+    assert not NamedLock("test", database.engine, stale_after=7200).acquire()
+
+    lock = NamedLock("test", database.engine, stale_after=60)
+    assert lock.acquire()
+    with session() as db:
+        assert db.query(AppLock).one().owner == lock.owner
+    lock.release()
+
+
+def test_run_seed_skips_while_the_lock_is_held(seed_runs):
+    holder = NamedLock(startup.SEED_LOCK_NAME, database.engine)
+    assert holder.acquire()
+    try:
+        started = time.monotonic()
+        assert startup.run_seed(wait_seconds=0.3) is False
+        assert time.monotonic() - started >= 0.3
+    finally:
+        holder.release()
+    assert seed_runs == []
+
+
+def test_run_seed_waits_for_the_holder(seed_runs):
+    holder = NamedLock(startup.SEED_LOCK_NAME, database.engine)
+    assert holder.acquire()
+    released = threading.Timer(0.3, holder.release)
+    released.start()
+    started = time.monotonic()
+    # the holder did the sync: this process waits for it, then does not sync again
+    assert startup.run_seed(wait_seconds=10) is False
+    waited = time.monotonic() - started
+    released.join()
+    assert 0.3 <= waited < 10
+    assert seed_runs == []
+
+
+def test_run_seed_syncs_and_releases(seed_runs):
+    assert startup.run_seed(wait_seconds=0) is True
+    assert len(seed_runs) == 1
+    with session() as db:
+        assert db.query(AppLock).count() == 0
@@ -0,0 +1,26 @@
+# tests/test_query_count.py
+"""Loading the project graph takes the same number of statements for any portfolio size."""
+
+import pytest
+
+from benchmarks.common import QueryCounter, session
+
+from app import queries
+from app.read_model import load
+
+PROJECT_COUNTS = (1, 10, 50)
+
+
+def statements(fn) -> int:
+    with session() as db, QueryCounter() as counter:
+        fn(db)
+    return counter.count
+
+
+@pytest.mark.parametrize("fn", [queries.get_projects, load], ids=["queries.get_projects", "read_model.load"])
+def test_statement_count_is_constant(seed, fn):
+    counts = {}
+    for n in PROJECT_COUNTS:
+        seed(n)
+        counts[n] = statements(fn)
+    assert len(set(counts.values())) == 1, f"statements per portfolio size: {counts}"
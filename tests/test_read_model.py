@@ -0,0 +1,163 @@
+# tests/test_read_model.py
+"""The read model returns what the reference SQL (here, in ``queries`` and ``skill_tags``) returns."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import or_, select
+
+from benchmarks.common import session
+
+from app import queries, skill_tags
+from app.models import MyRoll, ProjectImage, Projects, ReqSkill, project_image_association
+from app.read_model import read_model
+from app.serialization import encode_projects, encode_rows
+
+PROJECT_COUNT = 25
+
+FILTERS = [
+    queries.ProjectFilter(),
+    queries.ProjectFilter(project_type="REST API"),
+    queries.ProjectFilter(project_type="Unknown"),
+    queries.ProjectFilter(date_from=date(2024, 3, 1), date_to=date(2024, 4, 1)),
+    queries.ProjectFilter(date_from=date(2025, 1, 1)),
+]
+
+
+# ---------------------------
+#       REFERENCE SQL
+# ---------------------------
+
+def sql_page(stmt, flt: queries.ProjectFilter, cursor, limit: int):
+    """Keyset page over ``pro_id`` descending, one extra row to tell whether there is a next one."""
+    if flt.project_type is not None:
+        stmt = stmt.where(Projects.project_type == flt.project_type)
+    if flt.date_from is not None:
+        stmt = stmt.where(or_(Projects.end_date.is_(None), Projects.end_date >= flt.date_from))
+    if flt.date_to is not None:
+        stmt = stmt.where(Projects.start_date <= flt.date_to)
+    if cursor is not None:
+        stmt = stmt.where(Projects.pro_id < cursor)
+    return stmt.order_by(Projects.pro_id.desc()).limit(limit + 1)
+
+
+def split_page(rows: list, limit: int, pro_id):
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, pro_id(rows[-1])
+
+
+def get_project_page(db, flt, cursor, limit):
+    stmt = sql_page(select(Projects).options(*queries.PROJECT_GRAPH), flt, cursor, limit)
+    return split_page(db.scalars(stmt).all(), limit, lambda p: p.pro_id)
+
+
+def get_project_fields_page(db, fields, flt, cursor, limit):
+    columns = [Projects.pro_id] + [queries.PROJECT_COLUMNS[f] for f in sorted(fields & set(queries.PROJECT_COLUMNS))
+                                   if f != "pro_id"]
+    for name, related in queries.PROJECT_RELATED.items():
+        if name in fields:
+            columns += [c.label(f"{name}.{c.key}") for c in related]
+    stmt = select(*columns)
+    if "my_roll_obj" in fields:
+        stmt = stmt.join(MyRoll, Projects.my_roll_id == MyRoll.roll_id)
+    if "req_skill_obj" in fields:
+        stmt = stmt.join(ReqSkill, Projects.req_skill_id == ReqSkill.req_skill_id)
+    rows, next_cursor = split_page(
+        db.execute(sql_page(stmt, flt, cursor, limit)).mappings().all(), limit, lambda row: row["pro_id"],
+    )
+    items = []
+    for row in rows:
+        item = {}
+        for key, value in row.items():
+            if "." in key:
+                relation, attr = key.split(".", 1)
+                item.setdefault(relation, {})[attr] = value
+            else:
+                item[key] = value
+        items.append(item)
+
+    if "images" in fields and items:
+        paths = {item["pro_id"]: [] for item in items}
+        image_paths = (
+            select(project_image_association.c.project_id, ProjectImage.image_path)
+            .join(ProjectImage, ProjectImage.image_id == project_image_association.c.image_id)
+            .where(project_image_association.c.project_id.in_(list(paths)))
+            .order_by(project_image_association.c.project_id, project_image_association.c.position)
+        )
+        for pro_id, image_path in db.execute(image_paths):
+            paths[pro_id].append(image_path)
+        for item in items:
+            item["images"] = paths[item["pro_id"]]
+    return items, next_cursor
+
+
+# ---------------------------
+#       AGREEMENT
+# ---------------------------
+
+@pytest.fixture(scope="module", autouse=True)
+def portfolio(seed):
+    seed(PROJECT_COUNT)
+    return read_model.get()
+
+
+def pages(get_page):
+    """Every page of a keyset walk with page size 7."""
+    result, cursor = [], None
+    while True:
+        rows, cursor = get_page(cursor)
+        result.append(rows)
+        if cursor is None:
+            return result
+
+
+@pytest.mark.parametrize("flt", FILTERS)
+def test_page(flt):
+    with session() as db:
+        expected = pages(lambda cursor: get_project_page(db, flt, cursor, 7))
+        actual = pages(lambda cursor: read_model.get().page(flt, cursor, 7))
+        assert [encode_projects(page) for page in actual] == [encode_projects(page) for page in expected]
+
+
+@pytest.mark.parametrize("fields", [
+    {"project_name"},
+    {"project_name", "main_image", "start_date"},
+    {"project_type", "images", "my_roll_obj", "req_skill_obj"},
+])
+def test_fields_page(fields):
+    flt = queries.ProjectFilter()
+    with session() as db:
+        expected = pages(lambda cursor: get_project_fields_page(db, fields, flt, cursor, 7))
+    actual = pages(lambda cursor: read_model.get().fields_page(fields, flt, cursor, 7))
+    # compared as the JSON the route sends (the read model holds tuples where SQL returns lists)
+    assert [encode_rows(page) for page in actual] == [encode_rows(page) for page in expected]
+
+
+def test_detail(portfolio):
+    ids = [p.pro_id for p in portfolio.projects]
+    with session() as db:
+        for pro_id in (ids[0], ids[len(ids) // 2], ids[-1], max(ids) + 1):
+            expected = queries.get_project_detail(db, pro_id)
+            actual = portfolio.detail(pro_id)
+            if expected is None:
+                assert actual is None
+                continue
+            assert encode_projects([actual.project]) == encode_projects([expected.project])
+            assert [(r.pro_id, r.project_name, r.logo_img, list(r.description)) for r in actual.related] == \
+                [(r.pro_id, r.project_name, r.logo_img, r.description) for r in expected.related]
+            assert (actual.prev_id, actual.next_id) == (expected.prev_id, expected.next_id)
+
+
+@pytest.mark.parametrize("slugs, kind", [
+    ([], None),
+    (["django"], None),
+    (["Django", "postgresql"], None),
+    (["django"], "tool"),
+    (["no-such-tag"], None),
+])
+def test_facets(slugs, kind):
+    with session() as db:
+        expected = skill_tags.facets(db, slugs, kind, limit=10)
+    assert read_model.get().facets(slugs, kind, limit=10) == expected
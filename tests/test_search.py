@@ -0,0 +1,26 @@
+# tests/test_search.py
+"""Off Postgres, search never reads ``project_search``, so writes skip it."""
+
+from sqlalchemy import func, select
+
+from benchmarks.common import session
+from benchmarks.factories import make_project
+
+from app import crud, search
+from app.models import ProjectSearch
+from app.read_model import read_model
+
+
+def test_sqlite_searches_without_the_table(seed):
+    seed(10)
+    with session() as db:
+        crud.create_or_update_project(db, make_project(10).model_copy(update={"project_nickname": "Zeppelin"}))
+        assert db.scalar(select(func.count()).select_from(ProjectSearch)) == 0
+
+        hits = search.search(db, "zeppelin")
+        assert [hit.project_name for hit in hits] == [make_project(10).project_name]
+        # the standalone index and the routes' read model rank the same documents
+        standalone = search.search(db, "rest api")
+        routes = search.search(db, "rest api", portfolio=read_model.get())
+        assert [(hit.pro_id, hit.rank) for hit in standalone] == [(hit.pro_id, hit.rank) for hit in routes]
+        assert standalone
@@ -0,0 +1,18 @@
+# tests/test_snapshot.py
+"""Snapshot pages are served for the base URL they were rendered for."""
+
+from app.snapshot import regenerate
+
+
+def test_served_behind_a_tls_terminating_proxy(client):
+    client.portal.call(regenerate, client.app, "https://testserver", True)
+
+    # the proxy speaks http to the app and reports the client's scheme
+    proxied = client.get("/about", headers={"X-Forwarded-Proto": "https"})
+    assert proxied.headers.get("x-snapshot") == "HIT"
+    assert "https://testserver/static/" in proxied.text
+
+    # a plain http request would get https links from the snapshot: the live route answers
+    direct = client.get("/about")
+    assert direct.status_code == 200
+    assert "x-snapshot" not in direct.headers
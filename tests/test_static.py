@@ -0,0 +1,30 @@
+# tests/test_static.py
+"""Only fingerprinted files under build/dist/ are cached as immutable."""
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.assets.serving import IMMUTABLE, PrecompressedStaticFiles
+
+
+def test_cache_control(tmp_path):
+    files = {
+        "build/dist/manifest.json": "{}",
+        "build/dist/css/main.0123456789.css": "body{}",
+        "build/dist/bundle/files/abcdef0123.woff2": "font",
+        "css/main.css": "body{}",
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    client = TestClient(Starlette(routes=[Mount("/static", PrecompressedStaticFiles(directory=tmp_path))]))
+
+    def cache_control(name):
+        return client.get(f"/static/{name}").headers.get("cache-control")
+
+    assert cache_control("build/dist/manifest.json") == "no-cache"
+    assert cache_control("build/dist/css/main.0123456789.css") == IMMUTABLE
+    assert cache_control("build/dist/bundle/files/abcdef0123.woff2") == IMMUTABLE
+    assert cache_control("css/main.css") is None